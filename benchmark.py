@@ -0,0 +1,1127 @@
+"""
+プレゼンテーション作成処理のベンチマーク
+
+DeepResearch 形式の合成テキスト（サイズ、見出し密度、引用密度、日本語/英語の比率を
+指定して生成）を入力に、各ビルダーのレイテンシ、スループット（スライド/秒、入力 MB/秒）、
+ピークメモリ（RSS）を計測します。計測結果をベースラインとして保存しておくと、
+以降の実行でしきい値を超える性能低下があった場合に終了コード 1 を返します。
+
+使用例:
+    python benchmark.py --save-baseline
+    python benchmark.py --corpus medium large --builders deep_research --threshold 0.2
+    python benchmark.py --write-corpus corpora/
+    python benchmark.py --parity --corpus seed medium tables
+    python benchmark.py --save-scaling --save-workers 1 2 4 8
+    python benchmark.py --queue 3 --corpus seed small
+    python benchmark.py --schedule 4 --corpus small medium large
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SEED_FILE = os.path.join(BASE_DIR, "research.txt")
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "benchmark_baseline.json")
+
+# 合成コーパスのプリセット
+# size: 目標サイズ（バイト）、heading_density: 段落が新しい見出しで始まる確率、
+# citation_density: 文に引用が付く確率、cjk_ratio: 日本語の文の比率、
+# table_density: 段落の後に Markdown の表が続く確率
+CORPORA = {
+    "seed": None,  # research.txt をそのまま使用
+    "small": {"size": 10_000, "heading_density": 0.3, "citation_density": 0.2, "cjk_ratio": 0.9},
+    "medium": {"size": 200_000, "heading_density": 0.3, "citation_density": 0.2, "cjk_ratio": 0.9},
+    "large": {"size": 2_000_000, "heading_density": 0.3, "citation_density": 0.2, "cjk_ratio": 0.9},
+    "dense_headings": {"size": 200_000, "heading_density": 0.9, "citation_density": 0.2, "cjk_ratio": 0.9},
+    "citation_heavy": {"size": 200_000, "heading_density": 0.3, "citation_density": 0.8, "cjk_ratio": 0.9},
+    "ascii": {"size": 200_000, "heading_density": 0.3, "citation_density": 0.2, "cjk_ratio": 0.0},
+    "tables": {"size": 200_000, "heading_density": 0.3, "citation_density": 0.2, "cjk_ratio": 0.9,
+               "table_density": 0.2},
+}
+
+DEFAULT_CORPORA = ["seed", "small", "medium"]
+# 末尾が _fast のビルダーは fastwriter（XML を直接書き出す出力）を使う
+BUILDERS = ["deep_research", "research", "board_game", "styled", "deep_research_fast", "board_game_fast"]
+
+# 起動時間を計測するスクリプトと、起動時に読み込まれてはならない重い依存
+SCRIPTS = [
+    "deep_research_slide.cli",
+    "create_deep_research_presentation",
+    "create_presentation",
+    "create_arnak_presentation",
+    "create_styled_presentation",
+]
+HEAVY_MODULES = ("pptx", "lxml", "PIL", "requests")
+DEFAULT_IMPORT_BUDGET_MS = 40
+
+# 英語の文を組み立てるための語彙
+ASCII_WORDS = (
+    "market waste recycling treatment industrial volume share growth revenue policy "
+    "subsidy regulation landfill incineration operator capacity demand supply region "
+    "analysis trend forecast company segment cost emission circular economy"
+).split()
+
+
+def _seed_sentences():
+    """research.txt から URL と記号を除いた日本語の文を取り出す"""
+    with open(SEED_FILE, 'r', encoding='utf-8') as f:
+        text = f.read()
+    text = re.sub(r'\(\[[^\]]*\]\([^)]*\)\)|https?://\S+|[#*]', '', text)
+    sentences = []
+    for line in text.split('\n'):
+        for sentence in re.split(r'(?<=。)', line.strip()):
+            sentence = sentence.strip(' -')
+            if len(sentence) > 10:
+                sentences.append(sentence)
+    return sentences
+
+
+def generate_corpus(size, heading_density=0.3, citation_density=0.2, cjk_ratio=0.9, table_density=0.0, seed=0):
+    """
+    DeepResearch 形式の合成テキストを生成する
+
+    Args:
+        size (int): 目標サイズ（UTF-8 のバイト数）
+        heading_density (float): 段落が新しい見出しで始まる確率（0〜1）
+        citation_density (float): 文の末尾に引用（URL 付き）が付く確率（0〜1）
+        cjk_ratio (float): 日本語の文の比率（0〜1）
+        table_density (float): 段落の後に Markdown の表（3〜40 行）が続く確率（0〜1）
+        seed (int): 乱数のシード
+
+    Returns:
+        str: 生成したテキスト
+    """
+    rng = random.Random(seed)
+    cjk_sentences = _seed_sentences()
+
+    def sentence():
+        if rng.random() < cjk_ratio:
+            text = rng.choice(cjk_sentences)
+        else:
+            words = rng.choices(ASCII_WORDS, k=rng.randint(8, 20))
+            text = " ".join(words).capitalize() + "."
+        if rng.random() < citation_density:
+            text += f" ([source {rng.randint(1, 999)}](https://example.com/{rng.randint(1, 10**6)}))"
+        return text
+
+    parts = [
+        "ご依頼のテーマについて詳細なデータを調査します。",
+        "# 合成ベンチマーク用レポート",
+    ]
+    length = sum(len(p.encode('utf-8')) for p in parts)
+    section = 0
+    while length < size:
+        lines = []
+        if section == 0 or rng.random() < heading_density:
+            section += 1
+            if rng.random() < cjk_ratio:
+                lines.append(f"## セクション{section} 市場の動向と分析")
+            else:
+                lines.append(f"## Section {section}: " + " ".join(rng.choices(ASCII_WORDS, k=3)).title())
+        for _ in range(rng.randint(2, 6)):
+            if rng.random() < 0.3:
+                lines.append("- " + sentence())
+            else:
+                lines.append(sentence())
+        # 表を作らない場合は乱数を使わず、ほかのプリセットのテキストを変えない
+        if table_density and rng.random() < table_density:
+            lines += ["", "| 事業者 | 売上高（億円） | 主な事業 |", "|---|---:|---|"]
+            for row in range(rng.randint(3, 40)):
+                lines.append(f"| 事業者{row + 1} | {rng.randint(10, 900):,} | {rng.choice(ASCII_WORDS)} |")
+        paragraph = "\n".join(lines)
+        parts.append(paragraph)
+        length += len(paragraph.encode('utf-8')) + 2
+    parts.append("参考文献\n" + "\n".join(f"[{i}] https://example.com/ref/{i}" for i in range(1, 6)))
+    return "\n\n".join(parts)
+
+
+def load_corpus(name):
+    """プリセット名からコーパスのテキストを返す"""
+    spec = CORPORA[name]
+    if spec is None:
+        with open(SEED_FILE, 'r', encoding='utf-8') as f:
+            return f.read()
+    return generate_corpus(**spec)
+
+
+def _run_builder(builder, input_path, output_path):
+    """ビルダーを 1 回実行する"""
+    with open(input_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    writer = "pptx"
+    if builder.endswith("_fast"):
+        builder, writer = builder[:-len("_fast")], "fast"
+    if builder == "deep_research":
+        from deep_research_slide.research import create_deep_research_presentation
+        create_deep_research_presentation(text, output_file=output_path, title="ベンチマーク", writer=writer)
+    elif builder == "research":
+        from deep_research_slide.research import create_research_presentation
+        create_research_presentation(text, output_file=output_path, title="ベンチマーク", writer=writer)
+    elif builder == "board_game":
+        from deep_research_slide.boardgame import create_board_game_presentation
+        create_board_game_presentation(text, output_file=output_path, writer=writer)
+    elif builder == "styled":
+        # スタイル付きデッキは入力を取らない
+        from deep_research_slide.styled import create_styled_presentation
+        create_styled_presentation(output_file=output_path)
+    else:
+        raise ValueError(f"未知のビルダーです: {builder}")
+
+
+def _measure_worker(builder, input_path, output_path, repeat, conn):
+    """子プロセスでビルダーを計測し、結果をパイプで返す"""
+    sys.path.insert(0, BASE_DIR)
+    try:
+        # 初回はインポートのコストを含めないよう、計測前に 1 回実行しておく
+        with redirect_stdout(io.StringIO()):
+            _run_builder(builder, input_path, output_path)
+        from pptx import Presentation
+        slides = len(Presentation(output_path).slides)
+
+        latencies = []
+        for _ in range(repeat):
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                _run_builder(builder, input_path, output_path)
+                latencies.append(time.perf_counter() - start)
+        rss = None
+        if resource is not None:
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform == "darwin":
+                rss /= 1024
+        conn.send({"latencies": latencies, "slides": slides, "peak_rss_kb": rss,
+                   "output_bytes": os.path.getsize(output_path)})
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def measure(builder, corpus_name, text, repeat=3, workdir=None):
+    """
+    ビルダーを独立した子プロセスで実行し、性能を計測する
+
+    Args:
+        builder (str): ビルダー名（BUILDERS のいずれか）
+        corpus_name (str): コーパス名（結果の識別用）
+        text (str): 入力テキスト
+        repeat (int): 計測の繰り返し回数
+        workdir (str): 入出力ファイルの作業ディレクトリ
+
+    Returns:
+        dict: レイテンシ、スループット、ピーク RSS などの計測結果
+    """
+    workdir = workdir or tempfile.mkdtemp(prefix="slide_bench_")
+    input_path = os.path.join(workdir, f"{corpus_name}.txt")
+    output_path = os.path.join(workdir, f"{builder}_{corpus_name}.pptx")
+    with open(input_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+    # 計測ごとにプロセスを分けて、ピーク RSS が他の計測の影響を受けないようにする
+    ctx = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_measure_worker,
+                          args=(builder, input_path, output_path, repeat, child_conn))
+    process.start()
+    child_conn.close()
+    result = parent_conn.recv()
+    process.join()
+    if "error" in result:
+        raise RuntimeError(f"{builder}/{corpus_name}: {result['error']}")
+
+    input_bytes = len(text.encode('utf-8'))
+    median = statistics.median(result["latencies"])
+    return {
+        "builder": builder,
+        "corpus": corpus_name,
+        "input_bytes": input_bytes,
+        "slides": result["slides"],
+        "output_bytes": result["output_bytes"],
+        "latency_min": min(result["latencies"]),
+        "latency_median": median,
+        "slides_per_sec": result["slides"] / median if median else None,
+        "mb_per_sec": input_bytes / 1e6 / median if median else None,
+        "peak_rss_kb": result["peak_rss_kb"],
+    }
+
+
+def _slide_parts(data):
+    """
+    .pptx のスライドを表示順に取り出す
+
+    Args:
+        data (bytes): .pptx の内容
+
+    Returns:
+        list: (正規化したスライドの XML, リレーションシップ（レイアウト、ノート、リンク先のスライド）,
+            正規化したノートの XML（ノートがない場合は None）) のリスト
+    """
+    import posixpath
+    import zipfile
+    from lxml import etree
+
+    def canonical(xml):
+        return etree.tostring(etree.fromstring(xml), method="c14n")
+
+    def targets(zf, rels_name):
+        rels = etree.fromstring(zf.read(rels_name))
+        return {rel.get("Id"): rel.get("Target") for rel in rels}
+
+    r_id = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        presentation = etree.fromstring(zf.read("ppt/presentation.xml"))
+        slide_targets = targets(zf, "ppt/_rels/presentation.xml.rels")
+        slides = []
+        for slide_id in presentation.iter("{http://schemas.openxmlformats.org/presentationml/2006/main}sldId"):
+            name = "ppt/" + slide_targets[slide_id.get(r_id)]
+            folder, base = name.rsplit("/", 1)
+            rels = etree.fromstring(zf.read(f"{folder}/_rels/{base}.rels"))
+            relationships = sorted((rel.get("Id"), rel.get("Type"), rel.get("Target")) for rel in rels)
+            notes = [posixpath.normpath(posixpath.join(folder, rel.get("Target"))) for rel in rels
+                     if rel.get("Type").endswith("/notesSlide")]
+            notes_xml = canonical(zf.read(notes[0])) if notes else None
+            slides.append((canonical(zf.read(name)), relationships, notes_xml))
+    return slides
+
+
+def check_parity(corpus_names):
+    """
+    python-pptx による出力と fastwriter による出力が同じ内容になることを確認する
+
+    スライドとスピーカーノートの XML を正規化（C14N）して、表示順・リレーションシップ
+    （レイアウト、ノート、目次のリンク先）とあわせて比較します。あわせて validate で両方の出力を
+    検証し、見つからないパーツやリレーションシップ、背景に隠れたテキストがないことを確認します。
+
+    Args:
+        corpus_names (list): 確認に使うコーパス名のリスト
+
+    Returns:
+        list: 違いの説明のリスト（空なら同じ内容）
+    """
+    sys.path.insert(0, BASE_DIR)
+    from pptx import Presentation
+    from deep_research_slide.boardgame import plan_board_game_deck
+    from deep_research_slide.render import build_presentation
+    from deep_research_slide.research import plan_research_deck
+    from deep_research_slide.themes import PLAIN, THEMES
+    from deep_research_slide.validate import HIDDEN_TEXT, MISSING_PART, MISSING_RELATIONSHIP, validate_presentation
+
+    cases = []
+    for name in corpus_names:
+        text = load_corpus(name)
+        deck = plan_research_deck(text, "ベンチマーク", "2000年01月01日")
+        cases.extend((f"deep_research/{name}/{theme}", deck, THEMES[theme]) for theme in THEMES)
+        cases.append((f"board_game/{name}", plan_board_game_deck(text), PLAIN))
+
+    problems = []
+    for label, deck, theme in cases:
+        outputs = {}
+        for writer in ("pptx", "fast"):
+            buffer = io.BytesIO()
+            build_presentation(deck, theme, buffer, writer)
+            outputs[writer] = buffer.getvalue()
+        # python-pptx で読み込めることも確認する
+        slide_count = len(Presentation(io.BytesIO(outputs["fast"])).slides)
+        expected, actual = _slide_parts(outputs["pptx"]), _slide_parts(outputs["fast"])
+        if slide_count != len(expected) or len(actual) != len(expected):
+            problems.append(f"{label}: スライド数が異なります（{len(expected)} / {len(actual)}）")
+            continue
+        for index, (want, got) in enumerate(zip(expected, actual), 1):
+            if want != got:
+                problems.append(f"{label}: スライド {index} の内容が異なります")
+        for writer, data in outputs.items():
+            for issue in validate_presentation(io.BytesIO(data)):
+                if issue.kind in (HIDDEN_TEXT, MISSING_PART, MISSING_RELATIONSHIP):
+                    problems.append(f"{label}: {writer} の出力の {issue.part}: {issue.message}")
+        print(f"{label:<40}{len(expected):>6} スライド  {len(outputs['pptx']):>10} / {len(outputs['fast']):>10} bytes")
+    return problems
+
+
+def measure_save_scaling(slide_counts, workers_list, repeat=3):
+    """
+    保存時間をパーツ数と圧縮のスレッド数ごとに計測する
+
+    python-pptx でデッキを作成しておき、zipwriter.save_package による保存だけを計測します。
+
+    Args:
+        slide_counts (list): デッキのスライド数のリスト
+        workers_list (list): 圧縮に使うスレッド数のリスト
+        repeat (int): 計測の繰り返し回数（中央値を使う）
+
+    Returns:
+        list: スライド数、パーツ数、出力サイズ、スレッド数ごとの保存時間（ミリ秒）の辞書のリスト
+    """
+    sys.path.insert(0, BASE_DIR)
+    from deep_research_slide.render import Slide, new_presentation, render_slides
+    from deep_research_slide.themes import THEMES
+    from deep_research_slide.zipwriter import save_package
+
+    text = load_corpus("seed")
+    lines = [line for line in text.split('\n') if line.strip()][:12]
+    results = []
+    for count in slide_counts:
+        prs = new_presentation()
+        render_slides(prs, [Slide("section", f"セクション {i}", lines) for i in range(count)], THEMES["blue"])
+        parts = sum(1 for _ in prs.part.package.iter_parts())
+        row = {"slides": count, "parts": parts, "save_ms": {}}
+        for workers in workers_list:
+            timings = []
+            for _ in range(repeat):
+                buffer = io.BytesIO()
+                start = time.perf_counter()
+                save_package(prs, buffer, workers)
+                timings.append((time.perf_counter() - start) * 1000)
+            row["save_ms"][workers] = statistics.median(timings)
+            row["output_bytes"] = len(buffer.getvalue())
+        results.append(row)
+    return results
+
+
+def print_save_scaling(results, workers_list):
+    """保存時間の計測結果を表形式で表示する"""
+    header = f"{'slides':>8}{'parts':>8}{'MB':>8}" + ''.join(f"{f'{w} thr ms':>12}" for w in workers_list)
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        line = f"{row['slides']:>8}{row['parts']:>8}{row['output_bytes'] / 1e6:>8.2f}"
+        line += ''.join(f"{row['save_ms'][w]:>12.1f}" for w in workers_list)
+        print(line)
+
+
+def measure_theme_fanout(corpus_names, repeat=3):
+    """
+    すべてのテーマを 1 回の実行（--themes）で出力した場合と、テーマごとに実行した場合の時間を比べる
+
+    どちらもコマンドラインから子プロセスで実行し、起動と読み込みの時間も含めて計測します。
+
+    Args:
+        corpus_names (list): コーパス名のリスト
+        repeat (int): 計測の繰り返し回数（中央値を使う）
+
+    Returns:
+        list: コーパス、出力方法、テーマごとに実行した合計時間、まとめて出力した時間（秒）の辞書のリスト
+    """
+    sys.path.insert(0, BASE_DIR)
+    from deep_research_slide.themes import THEMES
+
+    themes = list(THEMES)
+    workdir = tempfile.mkdtemp(prefix="slide_bench_")
+    results = []
+    try:
+        for name in corpus_names:
+            input_path = os.path.join(workdir, f"{name}.txt")
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write(load_corpus(name))
+            for writer in ("pptx", "fast"):
+                output = os.path.join(workdir, f"{name}_{writer}.pptx")
+                command = [sys.executable, "-m", "deep_research_slide", "research", input_path,
+                           "-o", output, "-t", "ベンチマーク", "--writer", writer]
+                runs = {
+                    "separate": [command + ["--theme", theme] for theme in themes],
+                    "fanout": [command + ["--themes", ",".join(themes)]],
+                }
+                row = {"corpus": name, "writer": writer}
+                for key, commands in runs.items():
+                    timings = []
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        for args in commands:
+                            subprocess.run(args, cwd=BASE_DIR, check=True, stdout=subprocess.DEVNULL)
+                        timings.append(time.perf_counter() - start)
+                    row[key] = statistics.median(timings)
+                results.append(row)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def measure_batch(corpus_names, files=16, latency=0.0, workers=None):
+    """
+    ファイルを 1 つずつ「読み込み → 描画 → 書き込み」する場合と、batch のパイプラインの時間を比べる
+
+    latency を指定すると、ネットワーク上のストレージを模して読み書きのたびにその秒数だけ待ちます。
+    latency が 0 の場合は、ワーカーが入力をメモリーマップで開くパイプライン（mapped）の時間も計ります
+    （マップした入力の読み込みには待ち時間を模せないため）。
+
+    Args:
+        corpus_names (list): コーパス名のリスト
+        files (int): 変換するファイルの数
+        latency (float): 読み書き 1 回あたりの待ち時間（秒）
+        workers (int): パイプラインの描画に使うワーカープロセス数（None の場合は CPU 数）
+
+    Returns:
+        list: コーパス、出力方法、順に処理した時間、パイプラインの時間、mapped の時間（秒、計らない場合は None）の辞書のリスト
+    """
+    sys.path.insert(0, BASE_DIR)
+    from deep_research_slide import batch
+
+    read_bytes, write_atomic = batch.read_bytes, batch.write_atomic
+
+    def slow_read(path):
+        time.sleep(latency)
+        return read_bytes(path)
+
+    def slow_write(path, data):
+        time.sleep(latency)
+        write_atomic(path, data)
+
+    workdir = tempfile.mkdtemp(prefix="slide_bench_")
+    batch.read_bytes, batch.write_atomic = slow_read, slow_write
+    results = []
+    try:
+        for name in corpus_names:
+            text = load_corpus(name)
+            input_files = []
+            for index in range(files):
+                path = os.path.join(workdir, f"{name}_{index}.txt")
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                input_files.append(path)
+            jobs = batch.plan_jobs(input_files)
+            for writer in ("pptx", "fast"):
+                options = batch.Options(title="ベンチマーク", writer=writer)
+                start = time.perf_counter()
+                for job in jobs:
+                    batch.write_atomic(job.output_file, batch.convert_bytes(batch.read_bytes(job.input_file), options))
+                sequential = time.perf_counter() - start
+                start = time.perf_counter()
+                failed = [r for r in batch.run_batch(jobs, options, workers) if r.error]
+                if failed:
+                    raise RuntimeError(f"{failed[0].input_file}: {failed[0].error}")
+                pipeline = time.perf_counter() - start
+                mapped = None
+                if not latency:
+                    start = time.perf_counter()
+                    batch.run_batch(jobs, options, workers, mapped=True)
+                    mapped = time.perf_counter() - start
+                results.append({"corpus": name, "writer": writer, "sequential": sequential,
+                                "pipeline": pipeline, "mapped": mapped})
+    finally:
+        batch.read_bytes, batch.write_atomic = read_bytes, write_atomic
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def print_batch(results, files):
+    """バッチのパイプラインの計測結果を表形式で表示する"""
+    header = (f"{'corpus':<16}{'writer':<8}{'sequential s':>14}{'pipeline s':>12}{'files/s':>10}{'speedup':>10}"
+              f"{'mmap s':>10}")
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        mapped = f"{row['mapped']:>10.3f}" if row['mapped'] is not None else f"{'-':>10}"
+        print(f"{row['corpus']:<16}{row['writer']:<8}{row['sequential']:>14.3f}{row['pipeline']:>12.3f}"
+              f"{files / row['pipeline']:>10.1f}{row['sequential'] / row['pipeline']:>9.2f}x{mapped}")
+
+
+def _descendant_rss(pid):
+    """pid の子孫プロセスの RSS の合計（バイト、/proc がない環境では 0）"""
+    total = 0
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                for child in f.read().split():
+                    with open(f"/proc/{child}/statm") as statm:
+                        total += int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+                    total += _descendant_rss(child)
+    except OSError:
+        pass
+    return total
+
+
+def measure_schedule(corpus_names, files=4, workers=2, memory_budget=None):
+    """
+    大きさの異なるファイルを、指定した順・大きい順・大きい順とメモリの上限付きで batch 変換し、
+    時間とワーカープロセスの RSS の合計の最大値を比べる
+
+    コーパスは指定した順に files 個ずつ並べるため、小さいものから指定すると、
+    指定した順では大きなファイルが最後に残ります。
+
+    Args:
+        corpus_names (list): コーパス名のリスト
+        files (int): コーパスごとのファイルの数
+        workers (int): 描画に使うワーカープロセス数
+        memory_budget (int): 3 つ目の計測で使うメモリの上限（バイト）
+
+    Returns:
+        list: 順番、メモリの上限、時間（秒）、RSS の合計の最大値（バイト）の辞書のリスト
+    """
+    import threading
+    sys.path.insert(0, BASE_DIR)
+    from deep_research_slide import batch, scheduling
+
+    workdir = tempfile.mkdtemp(prefix="slide_bench_")
+    results = []
+    try:
+        input_files = []
+        for name in corpus_names:
+            text = load_corpus(name)
+            for index in range(files):
+                path = os.path.join(workdir, f"{name}_{index}.txt")
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                input_files.append(path)
+        jobs = batch.plan_jobs(input_files)
+        options = batch.Options(title="ベンチマーク", writer="fast")
+        for order, budget in (("input", None), ("size", None), ("size", memory_budget)):
+            ordered = scheduling.order_jobs(jobs, options.writer) if order == "size" else jobs
+            peak = [0]
+            done = threading.Event()
+
+            def sample():
+                while not done.wait(0.01):
+                    peak[0] = max(peak[0], _descendant_rss(os.getpid()))
+
+            sampler = threading.Thread(target=sample)
+            sampler.start()
+            start = time.perf_counter()
+            try:
+                failed = [r for r in batch.run_batch(ordered, options, workers, memory_budget=budget) if r.error]
+            finally:
+                done.set()
+                sampler.join()
+            if failed:
+                raise RuntimeError(f"{failed[0].input_file}: {failed[0].error}")
+            results.append({"order": order, "budget": budget, "seconds": time.perf_counter() - start,
+                            "peak_rss": peak[0]})
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def print_schedule(results):
+    """大きさに応じたスケジューリングの計測結果を表形式で表示する"""
+    header = f"{'order':<8}{'budget MB':>10}{'seconds':>10}{'worker RSS MB':>15}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        budget = f"{row['budget'] / 1024 ** 2:.0f}" if row['budget'] else "-"
+        print(f"{row['order']:<8}{budget:>10}{row['seconds']:>10.2f}{row['peak_rss'] / 1024 ** 2:>15.1f}")
+
+
+def check_queue(corpus_names, worker_count, files=16):
+    """
+    queue add で登録したファイルを worker_count 個の queue work プロセスで分担して変換し、
+    すべてのファイルがちょうど 1 回ずつ変換されることを確認する
+
+    Args:
+        corpus_names (list): コーパス名のリスト
+        worker_count (int): 同時に起動する queue work のプロセス数
+        files (int): コーパスごとに登録するファイルの数
+
+    Returns:
+        list: 問題の説明文のリスト
+    """
+    import sqlite3
+
+    problems = []
+    workdir = tempfile.mkdtemp(prefix="slide_bench_")
+    queue_file = os.path.join(workdir, "queue.db")
+    output_dir = os.path.join(workdir, "out")
+    command = [sys.executable, "-m", "deep_research_slide", "queue"]
+    try:
+        input_files = []
+        for name in corpus_names:
+            text = load_corpus(name)
+            for index in range(files):
+                path = os.path.join(workdir, f"{name}_{index}.txt")
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                input_files.append(path)
+        subprocess.run(command + ["add", *input_files, "-d", output_dir, "--queue", queue_file, "--writer", "fast"],
+                       cwd=BASE_DIR, check=True, stdout=subprocess.DEVNULL)
+        start = time.perf_counter()
+        workers = [subprocess.Popen(command + ["work", "--queue", queue_file, "--jobs", "1", "--claim", "2"],
+                                    cwd=BASE_DIR, stdout=subprocess.PIPE, text=True)
+                   for _ in range(worker_count)]
+        created = []
+        for proc in workers:
+            stdout, _ = proc.communicate()
+            lines = [line for line in stdout.splitlines() if "を作成しました" in line]
+            created.append(len(lines))
+        seconds = time.perf_counter() - start
+        print(f"{len(input_files)} ファイルを {worker_count} プロセスで {seconds:.1f} 秒で変換しました"
+              f"（プロセスごと: {', '.join(map(str, created))}）")
+
+        connection = sqlite3.connect(queue_file)
+        rows = connection.execute("SELECT input_file, status, attempts FROM items").fetchall()
+        connection.close()
+        if len(rows) != len(input_files):
+            problems.append(f"登録されたファイルは {len(rows)} 個です（{len(input_files)} 個のはず）")
+        for input_file, status, attempts in rows:
+            if status != "done" or attempts != 1:
+                problems.append(f"{input_file}: 状態 {status}、試行回数 {attempts}")
+        if sum(created) != len(input_files):
+            problems.append(f"変換されたファイルは延べ {sum(created)} 個です（{len(input_files)} 個のはず）")
+        missing = [path for path in input_files
+                   if not os.path.exists(os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + ".pptx"))]
+        problems.extend(f"{path}: 出力がありません" for path in missing)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return problems
+
+
+def measure_parse(corpus_names, repeat=3):
+    """
+    入力テキストをセクションに解析する段階（段落への分割、参考文献の除去、セクションへの変換）の
+    時間と、tracemalloc で計ったメモリを計測する
+
+    Args:
+        corpus_names (list): コーパス名のリスト
+        repeat (int): 時間の計測の繰り返し回数（中央値を使う）
+
+    Returns:
+        list: コーパス、入力の文字数、時間（秒）、解析中のメモリの最大、解析後に残るメモリ（バイト）、
+            解析後に残るメモリブロックの数の辞書のリスト
+    """
+    import tracemalloc
+
+    sys.path.insert(0, BASE_DIR)
+    from deep_research_slide.parsing import drop_references, parse_sections, split_paragraphs
+
+    def parse(text):
+        return parse_sections(drop_references(split_paragraphs(text)))
+
+    results = []
+    for name in corpus_names:
+        text = load_corpus(name)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parse(text)
+            timings.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            sections = parse(text)
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        statistics_ = snapshot.statistics("filename")
+        results.append({"corpus": name, "chars": len(text), "seconds": statistics.median(timings), "peak": peak,
+                        "retained": sum(stat.size for stat in statistics_),
+                        "blocks": sum(stat.count for stat in statistics_), "sections": len(sections)})
+    return results
+
+
+def print_parse(results):
+    """解析の段階の計測結果を表形式で表示する"""
+    header = (f"{'corpus':<16}{'chars':>10}{'sections':>10}{'seconds':>10}{'peak MB':>10}"
+              f"{'retained MB':>13}{'blocks':>10}")
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(f"{row['corpus']:<16}{row['chars']:>10}{row['sections']:>10}{row['seconds']:>10.3f}"
+              f"{row['peak'] / 1024 ** 2:>10.2f}{row['retained'] / 1024 ** 2:>13.2f}{row['blocks']:>10}")
+
+
+def check_manifest():
+    """
+    完了したファイル、失敗したファイル、新しいファイルを同じマニフェストと待ち行列で再実行し、
+    記録される状態、試行回数、実行者が正しいことを確認する
+
+    Returns:
+        list: 問題の説明文のリスト
+    """
+    sys.path.insert(0, BASE_DIR)
+    from deep_research_slide.batch import Job, Result
+    from deep_research_slide.manifest import DONE, FAILED, PENDING, RUNNING, Manifest
+
+    problems = []
+    workdir = tempfile.mkdtemp(prefix="slide_bench_")
+    try:
+        jobs = []
+        for name in ("a", "b", "c"):
+            path = os.path.join(workdir, f"{name}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(name)
+            jobs.append(Job(path, os.path.join(workdir, f"{name}.pptx")))
+        with open(jobs[0].output_file, 'wb') as f:
+            f.write(b"pptx")
+
+        def rows(manifest):
+            return {os.path.basename(input_file): row for input_file, *row in manifest.connection.execute(
+                "SELECT input_file, status, attempts, owner IS NOT NULL FROM items")}
+
+        def expect(label, manifest, expected):
+            actual = rows(manifest)
+            for name, row in expected.items():
+                if tuple(actual.get(name, ())) != row:
+                    problems.append(f"{label}: {name} は {actual.get(name)}（(状態, 試行回数, 実行者あり) は {row} のはず）")
+
+        def run_first(manifest, claimed):
+            manifest.record(Result(claimed[0].input_file, claimed[0].output_file, None, 0.1))
+            manifest.record(Result(claimed[1].input_file, claimed[1].output_file, "失敗", 0.1))
+
+        # batch --manifest: a は完了、b は失敗した後、c を加えて再実行する
+        with Manifest(os.path.join(workdir, "manifest.db")) as manifest:
+            claimed, _ = manifest.claim(jobs[:2])
+            run_first(manifest, claimed)
+            claimed, skipped = manifest.claim(jobs)
+            if [job.input_file for job in claimed] != [job.input_file for job in jobs[1:]] or skipped.done != 1:
+                problems.append(f"claim: 処理中にしたファイルは {[os.path.basename(job.input_file) for job in claimed]}"
+                                "（b.txt と c.txt のはず）")
+            expect("claim", manifest, {"a.txt": (DONE, 1, 0), "b.txt": (RUNNING, 2, 1), "c.txt": (RUNNING, 1, 1)})
+            for job in claimed:
+                manifest.record(Result(job.input_file, job.output_file, None, 0.1))
+            expect("claim の結果", manifest, {"b.txt": (DONE, 2, 0), "c.txt": (DONE, 1, 0)})
+
+        # queue add: 同じ状況で登録し直す
+        with Manifest(os.path.join(workdir, "queue.db"), wal=False) as queue:
+            queue.enqueue(jobs[:2])
+            by_input = {job.input_file: job for job in jobs}
+            run_first(queue, [by_input[input_file] for input_file, _ in queue.claim_next(2)])
+            claimed, _ = queue.enqueue(jobs)
+            if len(claimed) != 2:
+                problems.append(f"enqueue: 登録したファイルは {len(claimed)} 個（2 個のはず）")
+            expect("enqueue", queue, {"a.txt": (DONE, 1, 0), "b.txt": (PENDING, 1, 0), "c.txt": (PENDING, 0, 0)})
+            names = sorted(os.path.basename(input_file) for input_file, _ in queue.claim_next(3))
+            if names != ["b.txt", "c.txt"]:
+                problems.append(f"claim_next: 取り出したファイルは {names}（b.txt と c.txt のはず）")
+            expect("claim_next", queue, {"b.txt": (RUNNING, 2, 1), "c.txt": (RUNNING, 1, 1)})
+            if FAILED in queue.counts():
+                problems.append("失敗のまま残ったファイルがあります")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return problems
+
+
+def check_dedupe():
+    """
+    言い回しの少し違う同じ文が別のセクションの長い行に含まれる場合に、その文だけが取り除かれ、
+    同じ行のほかの文、箇条書きの記号、引用の位置が残ることを確認する
+
+    Returns:
+        list: 問題の説明文のリスト
+    """
+    sys.path.insert(0, BASE_DIR)
+    from deep_research_slide.dedup import dedupe_sections
+    from deep_research_slide.parsing import Section
+
+    fact = "2024年の世界の電気自動車の市場規模は約1200億ドルで、前年から15%成長しました。"
+    repeated = "2024年の世界の電気自動車の市場規模は約1200億ドルであり、前年から15%成長しました。"
+    makers = "主要なメーカーはテスラとBYDで、両社の合計シェアは約35%に達しています。"
+    policy = "欧州では新しい排出規制が2025年から段階的に施行される予定です。"
+    sections = [
+        Section("概要", [fact + makers], []),
+        Section("地域別", ["- " + repeated + policy, repeated], [(1, "[1]"), (2, "[2]")]),
+    ]
+    expected = [
+        Section("概要", [fact + makers], []),
+        Section("地域別", ["- " + policy], [(1, "[1]"), (1, "[2]")]),
+    ]
+
+    problems = []
+    result, removed = dedupe_sections(sections)
+    for actual, section in zip(result, expected):
+        if tuple(actual) != tuple(section):
+            problems.append(f"{section.title}: {tuple(actual)}（{tuple(section)} のはず）")
+    if len(result) != len(expected):
+        problems.append(f"セクション数が {len(result)}（{len(expected)} のはず）")
+    if removed != {"sentences": 2, "lines": 1, "sections": 0}:
+        problems.append(f"取り除いた数が {removed}（文 2、行 1、セクション 0 のはず）")
+    return problems
+
+
+def print_theme_fanout(results):
+    """テーマの一括出力の計測結果を表形式で表示する"""
+    header = f"{'corpus':<16}{'writer':<8}{'separate s':>12}{'fanout s':>12}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(f"{row['corpus']:<16}{row['writer']:<8}{row['separate']:>12.3f}{row['fanout']:>12.3f}"
+              f"{row['separate'] / row['fanout']:>9.2f}x")
+
+
+def compare(results, baseline, threshold):
+    """
+    計測結果をベースラインと比較し、性能低下を検出する
+
+    Args:
+        results (list): measure() の結果のリスト
+        baseline (dict): ベースライン（"builder/corpus" をキーとする辞書）
+        threshold (float): 許容する悪化率（0.2 なら 20%）
+
+    Returns:
+        list: 性能低下の説明文のリスト
+    """
+    regressions = []
+    for result in results:
+        key = f"{result['builder']}/{result['corpus']}"
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric in ("latency_median", "peak_rss_kb"):
+            old, new = base.get(metric), result.get(metric)
+            if old and new and new > old * (1 + threshold):
+                regressions.append(f"{key}: {metric} {old:.4g} -> {new:.4g} (+{(new / old - 1) * 100:.1f}%)")
+    return regressions
+
+
+def measure_startup(module, runs=5):
+    """
+    python -X importtime でスクリプトの読み込み時間を計測し、
+    あわせて --help の実行時間と、読み込まれた重い依存を調べる
+
+    Args:
+        module (str): スクリプトのモジュール名
+        runs (int): 計測の繰り返し回数
+
+    Returns:
+        dict: 読み込み時間（ミリ秒）の中央値、--help の実行時間、読み込まれた重い依存
+    """
+    check = f"import sys, {module}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    import_ms = []
+    help_ms = []
+    heavy = []
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", check],
+                              cwd=BASE_DIR, capture_output=True, text=True, check=True)
+        for line in proc.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                import_ms.append(int(fields[1]) / 1000)
+        heavy = proc.stdout.split()
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", module, "--help"], cwd=BASE_DIR,
+                       capture_output=True, check=True)
+        help_ms.append((time.perf_counter() - start) * 1000)
+    return {
+        "module": module,
+        "import_ms": statistics.median(import_ms),
+        "help_ms": statistics.median(help_ms),
+        "heavy": heavy,
+    }
+
+
+def check_startup(budget_ms):
+    """
+    各スクリプトの読み込み時間が予算内に収まり、重い依存を読み込んでいないことを確認する
+
+    Args:
+        budget_ms (float): 読み込み時間の予算（ミリ秒）
+
+    Returns:
+        list: 違反の説明文のリスト
+    """
+    violations = []
+    print(f"{'script':<36}{'import ms':>10}{'--help ms':>10}  heavy")
+    print("-" * 66)
+    for module in SCRIPTS:
+        r = measure_startup(module)
+        print(f"{module:<36}{r['import_ms']:>10.1f}{r['help_ms']:>10.1f}  {' '.join(r['heavy']) or '-'}")
+        if r["import_ms"] > budget_ms:
+            violations.append(f"{module}: 読み込み時間 {r['import_ms']:.1f}ms が予算 {budget_ms}ms を超えています")
+        if r["heavy"]:
+            violations.append(f"{module}: 起動時に {', '.join(r['heavy'])} を読み込んでいます")
+    return violations
+
+
+def print_table(results):
+    """計測結果を表形式で表示する"""
+    header = f"{'builder':<20}{'corpus':<16}{'input KB':>10}{'slides':>8}{'median s':>10}{'slides/s':>10}{'MB/s':>8}{'RSS MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        rss = r['peak_rss_kb'] / 1024 if r['peak_rss_kb'] else 0
+        print(f"{r['builder']:<20}{r['corpus']:<16}{r['input_bytes'] / 1024:>10.1f}{r['slides']:>8}"
+              f"{r['latency_median']:>10.3f}{r['slides_per_sec']:>10.1f}{r['mb_per_sec']:>8.2f}{rss:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='プレゼンテーション作成処理のベンチマークを実行します。')
+    parser.add_argument('--corpus', nargs='+', choices=sorted(CORPORA), default=DEFAULT_CORPORA,
+                        help='計測に使うコーパス')
+    parser.add_argument('--builders', nargs='+', choices=BUILDERS, default=BUILDERS,
+                        help='計測するビルダー')
+    parser.add_argument('--repeat', type=int, default=3, help='計測の繰り返し回数')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='ベースラインファイル')
+    parser.add_argument('--save-baseline', action='store_true', help='計測結果をベースラインとして保存する')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='性能低下とみなす悪化率（既定: 0.25）')
+    parser.add_argument('--json', metavar='FILE', help='計測結果を JSON で出力する')
+    parser.add_argument('--write-corpus', metavar='DIR', help='コーパスをファイルに書き出して終了する')
+    parser.add_argument('--startup', action='store_true',
+                        help='ビルダーの代わりに各スクリプトの起動時間（-X importtime）を計測する')
+    parser.add_argument('--parity', action='store_true',
+                        help='python-pptx と fastwriter の出力が同じ内容になることを確認する')
+    parser.add_argument('--save-scaling', action='store_true',
+                        help='保存時間をパーツ数と圧縮のスレッド数ごとに計測する')
+    parser.add_argument('--save-slides', nargs='+', type=int, default=[100, 500, 2000],
+                        help='--save-scaling で作成するデッキのスライド数')
+    parser.add_argument('--save-workers', nargs='+', type=int,
+                        help='--save-scaling で比べる圧縮のスレッド数（既定: 1 と CPU 数）')
+    parser.add_argument('--theme-fanout', action='store_true',
+                        help='すべてのテーマをまとめて出力した場合とテーマごとに出力した場合の時間を比べる')
+    parser.add_argument('--batch', type=int, metavar='FILES',
+                        help='FILES 個のファイルを順に変換した場合と batch のパイプラインで変換した場合の時間を比べる')
+    parser.add_argument('--batch-latency', type=float, default=0.0, metavar='SECONDS',
+                        help='--batch で読み書きのたびに待つ秒数（ネットワーク上のストレージを模す）')
+    parser.add_argument('--schedule', type=int, metavar='FILES',
+                        help='コーパスごとに FILES 個のファイルを、指定した順・大きい順・大きい順とメモリの上限付きで'
+                             ' batch 変換し、時間とワーカーの RSS を比べる（コーパスは小さいものから指定する）')
+    parser.add_argument('--schedule-jobs', type=int, default=2, metavar='N',
+                        help='--schedule で描画に使うワーカープロセス数（既定: 2）')
+    parser.add_argument('--schedule-budget', type=float, default=400, metavar='MB',
+                        help='--schedule の 3 つ目の計測で使うメモリの上限（MB、既定: 400）')
+    parser.add_argument('--queue', type=int, metavar='WORKERS',
+                        help='queue の待ち行列を WORKERS 個の queue work プロセスで分担し、'
+                             'すべてのファイルがちょうど 1 回ずつ変換されることを確認する')
+    parser.add_argument('--manifest', action='store_true',
+                        help='完了・失敗・新しいファイルを同じマニフェストで再実行し、記録される状態を確認する')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='別のセクションで繰り返された文だけが取り除かれることを確認する')
+    parser.add_argument('--parse-memory', action='store_true',
+                        help='入力テキストをセクションに解析する段階の時間とメモリ（tracemalloc）を計測する')
+    parser.add_argument('--import-budget', type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                        help=f'--startup で許容する読み込み時間（ミリ秒、既定: {DEFAULT_IMPORT_BUDGET_MS}）')
+
+    args = parser.parse_args()
+
+    if args.startup:
+        violations = check_startup(args.import_budget)
+        if violations:
+            print("\n起動時間の予算を超えています:")
+            for line in violations:
+                print(f"  {line}")
+            return 1
+        print("\nすべてのスクリプトが起動時間の予算内です。")
+        return 0
+
+    if args.save_scaling:
+        workers_list = args.save_workers or sorted({1, os.cpu_count() or 1})
+        print_save_scaling(measure_save_scaling(args.save_slides, workers_list, args.repeat), workers_list)
+        return 0
+
+    if args.theme_fanout:
+        print_theme_fanout(measure_theme_fanout(args.corpus, args.repeat))
+        return 0
+
+    if args.batch:
+        print_batch(measure_batch(args.corpus, args.batch, args.batch_latency), args.batch)
+        return 0
+
+    if args.schedule:
+        print_schedule(measure_schedule(args.corpus, args.schedule, args.schedule_jobs,
+                                        int(args.schedule_budget * 1024 ** 2)))
+        return 0
+
+    if args.manifest:
+        problems = check_manifest()
+        if problems:
+            print("\nマニフェストの記録に問題があります:")
+            for line in problems:
+                print(f"  {line}")
+            return 1
+        print("\n再実行したファイルの状態、試行回数、実行者は正しく記録されています。")
+        return 0
+
+    if args.dedupe:
+        problems = check_dedupe()
+        if problems:
+            print("\n重複の除去に問題があります:")
+            for line in problems:
+                print(f"  {line}")
+            return 1
+        print("\n繰り返された文だけが取り除かれました。")
+        return 0
+
+    if args.parse_memory:
+        print_parse(measure_parse(args.corpus, args.repeat))
+        return 0
+
+    if args.queue:
+        problems = check_queue(args.corpus, args.queue)
+        if problems:
+            print("\n待ち行列の分担に問題があります:")
+            for line in problems:
+                print(f"  {line}")
+            return 1
+        print("\nすべてのファイルがちょうど 1 回ずつ変換されました。")
+        return 0
+
+    if args.parity:
+        problems = check_parity(args.corpus)
+        if problems:
+            print("\n出力が一致しません:")
+            for line in problems:
+                print(f"  {line}")
+            return 1
+        print("\npython-pptx と fastwriter の出力は一致しています。")
+        return 0
+
+    if args.write_corpus:
+        os.makedirs(args.write_corpus, exist_ok=True)
+        for name in args.corpus:
+            path = os.path.join(args.write_corpus, f"{name}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(load_corpus(name))
+            print(f"コーパスを {path} に書き出しました。")
+        return 0
+
+    results = []
+    workdir = tempfile.mkdtemp(prefix="slide_bench_")
+    try:
+        for name in args.corpus:
+            text = load_corpus(name)
+            for builder in args.builders:
+                # スタイル付きデッキは入力に依存しないため、1 回だけ計測する
+                if builder == "styled":
+                    if name != args.corpus[0]:
+                        continue
+                    results.append(measure(builder, "builtin", text, args.repeat, workdir))
+                else:
+                    results.append(measure(builder, name, text, args.repeat, workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_table(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        baseline = {
+            "_meta": {"python": platform.python_version(), "machine": platform.machine(),
+                      "created": time.strftime("%Y-%m-%d %H:%M:%S")},
+        }
+        baseline.update({f"{r['builder']}/{r['corpus']}": r for r in results})
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+        print(f"ベースラインを {args.baseline} に保存しました。")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n性能低下を検出しました:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nベースラインからの性能低下はありません。")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""
+テキストからパワーポイントのプレゼンテーションを作成するパッケージ
+
+入力テキストの解析（parsing）、スライド構成の組み立て（research, boardgame）、
+テーマに沿った描画（render, themes）を分けて持ち、各プレゼンテーションは
+共通の描画処理を使います。
+
+コマンドラインの起動を速くするため、各モジュールは最初に使われたときに読み込みます。
+python-pptx もプレゼンテーションを作成するときに読み込みます。
+"""
+import importlib
+
+# 公開する関数と、それを定義しているモジュール
+_EXPORTS = {
+    "create_arnak_presentation": "arnak",
+    "create_board_game_presentation": "boardgame",
+    "create_deep_research_presentation": "research",
+    "create_deep_research_presentations": "research",
+    "create_research_presentation": "research",
+    "create_styled_presentation": "styled",
+    "extract_title_from_text": "research",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
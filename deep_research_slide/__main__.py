@@ -0,0 +1,4 @@
+"""python -m deep_research_slide でコマンドラインインターフェースを実行する"""
+from .cli import main
+
+main()
@@ -0,0 +1,298 @@
+"""
+アルナック（Lost Ruins of Arnak）の戦略プレゼンテーション
+
+背景画像の上に半透明のオーバーレイを重ね、テキストボックスで内容を配置します。
+"""
+import os
+
+from . import profiling
+from .render import add_background, new_presentation, rgb, save_presentation, CONTENT_LAYOUT, TITLE_LAYOUT
+from .themes import ARNAK
+
+__all__ = ["create_arnak_presentation"]
+
+# 背景画像（古代遺跡のイメージ）
+BG_IMAGE_PATH = "arnak_bg.jpg"
+BG_IMAGE_URL = "https://images.unsplash.com/photo-1518998053901-5348d3961a04?q=80&w=1974&auto=format&fit=crop"
+
+# 目次項目
+TOC_ITEMS = [
+    "基本的な考え方",
+    "序盤戦略",
+    "中盤戦略",
+    "終盤戦略",
+    "上級者向けのポイント",
+    "プレイヤー間のインタラクション",
+    "注意点"
+]
+
+# 戦略スライドの見出しと内容
+ARNAK_SECTIONS = [
+    ("基本的な考え方", """• ゲームは「研究トラックの先行」が勝利のカギ
+• デッキ構築、ワーカープレイスメント、リソース管理の要素が融合している"""),
+    ("序盤戦略", """• 研究トラックと助手の確保:
+  - 序盤で研究トラックを進め、2ラウンド以内に助手2人を獲得
+  - 助手は後半のアクション数や資源生産に大きく貢献
+
+• アイテムカードの購入:
+  - 強力なアイテム（犬、ランプ、双眼鏡、テントなど）を早めに入手
+  - 資源獲得力を高める
+
+• ワーカーの有効活用:
+  - 遺跡発見や守護者討伐を目指し、初期段階で遺跡探索に着手
+  - 偶像や守護者ボーナスを狙う"""),
+    ("中盤戦略", """• 研究トラックの継続:
+  - 研究を進めて先行ボーナスを確保
+  - 助手のアップグレードも進める
+  - 後半の展開に直結
+
+• 遺跡探索と守護者討伐:
+  - レベル1・レベル2の遺跡発見・発掘をバランスよく行う
+  - 高得点（偶像、守護者ボーナス）を狙う
+  - 適切なリソース（コンパス、移動アイコンなど）の確保が重要
+
+• デッキ圧縮:
+  - 不要なカード（特に恐怖カードなど）を除去
+  - 効率の良いデッキサイクルを維持"""),
+    ("終盤戦略", """• 研究トラックの仕上げ:
+  - 虫眼鏡や手帳を頂上に到達させ、寺院タイルを獲得
+  - 大幅な得点アップが期待できる
+
+• リソースの使い切り:
+  - 手元の余剰リソース（コイン、コンパス）はそのラウンド内にすべて活用
+  - 追加の遺跡探索やアイテム購入、遺物活用へ変換
+
+• 守護者と偶像:
+  - 未討伐の守護者は最終ラウンドで確実に討伐
+  - 偶像はそのまま得点化するか、状況に応じた追加効果に活用"""),
+    ("上級者向けのポイント", """• 柔軟な判断:
+  - 毎手番ごとに状況を分析し、最適なアクションを選択
+  - 固定戦略に固執せず、相手の動向や市場状況を見極める
+
+• リソースの相対評価:
+  - リソース（コイン、コンパス、石版、矢じり、宝石）の価値を状況に応じて判断
+  - 必要なものに集中的に投資
+
+• カードドローとデッキ管理:
+  - ドロー効果や除去効果をうまく活用
+  - デッキの質を高めながら効率的な手番を実現"""),
+    ("プレイヤー間のインタラクション", """• 研究トラックの競争:
+  - 他プレイヤーよりも先に重要なマスに到達する
+  - 相手の虫眼鏡/手帳コマの位置と所持リソースを常に確認
+
+• ワーカープレイスメントのブロッキング:
+  - 人気のキャンプ地や強力な遺跡は争奪戦になる
+  - スタートプレイヤーの利点を活かす
+
+• 市場のカード争奪:
+  - 強力なアイテムは早い者勝ち
+  - 「次のラウンドまで残らない」と思うカードは即座に確保"""),
+]
+
+# 注意点の内容
+CAUTION_POINTS = [
+    "助手確保の遅れ、研究トラックの軽視は致命的",
+    "リソースの使い残しや無駄遣い、衝動的なカード購入は戦略全体を崩すリスクがある",
+    "相手プレイヤーの動向を常に観察し、先手を取る意識が重要"
+]
+
+# まとめの要点
+SUMMARY_POINTS = [
+    "序盤：研究トラックの先行と助手の確保",
+    "中盤：研究継続と遺跡探索のバランス",
+    "終盤：リソースの効率的な使い切りと得点の最大化",
+    "常に：柔軟な判断と相手の動向観察"
+]
+
+
+def download_background(path=BG_IMAGE_PATH, url=BG_IMAGE_URL):
+    """
+    背景画像がなければダウンロードして保存する
+
+    Args:
+        path (str): 背景画像の保存先
+        url (str): 背景画像の URL
+
+    Returns:
+        str: 背景画像のパス（ダウンロードに失敗した場合は None）
+    """
+    if os.path.exists(path):
+        return path
+    try:
+        # requests は画像がキャッシュされていない場合にだけ読み込む
+        import requests
+
+        response = requests.get(url)
+        with open(path, "wb") as f:
+            f.write(response.content)
+        print(f"背景画像を {path} として保存しました。")
+        return path
+    except Exception as e:
+        print(f"背景画像のダウンロードに失敗しました: {e}")
+        return None
+
+
+def add_text(text_frame, text, size, color, bold=None, italic=None, alignment=None,
+             space_before=None, space_after=None, level=None):
+    """
+    テキストフレームに段落を追加して書式を設定する
+
+    Returns:
+        追加した段落
+    """
+    from pptx.util import Pt
+    p = text_frame.add_paragraph()
+    p.text = text
+    if level is not None:
+        p.level = level
+    if alignment is not None:
+        p.alignment = alignment
+    if space_before is not None:
+        p.space_before = Pt(space_before)
+    if space_after is not None:
+        p.space_after = Pt(space_after)
+    # runs[0]にアクセスする前にチェック
+    if p.runs:
+        run = p.runs[0]
+        run.font.size = Pt(size)
+        if bold is not None:
+            run.font.bold = bold
+        if italic is not None:
+            run.font.italic = italic
+        run.font.color.rgb = rgb(color)
+    return p
+
+
+def add_arnak_slide(prs, layout_index, bg_image_path, transparency):
+    """背景画像と半透明のオーバーレイを敷いたスライドを追加する"""
+    slide = prs.slides.add_slide(prs.slide_layouts[layout_index])
+
+    # 背景画像の設定
+    if bg_image_path and os.path.exists(bg_image_path):
+        with profiling.phase("image"):
+            slide.shapes.add_picture(bg_image_path, 0, 0, prs.slide_width, prs.slide_height)
+
+    # 半透明の背景オーバーレイを追加（文字が見やすくなるように）
+    add_background(prs, slide, ARNAK.background, transparency)
+    return slide
+
+
+def add_heading(slide, text, color):
+    """スライド上部に見出しのテキストボックスを追加する"""
+    from pptx.util import Inches
+    from pptx.enum.text import PP_ALIGN
+    box = slide.shapes.add_textbox(
+        Inches(0.5), Inches(0.3), Inches(9), Inches(0.8)  # 上部に配置
+    )
+    add_text(box.text_frame, text, 40, color, bold=True, alignment=PP_ALIGN.CENTER)
+
+
+def add_body(slide):
+    """見出しの下に内容のテキストボックスを追加し、そのテキストフレームを返す"""
+    from pptx.util import Inches
+    box = slide.shapes.add_textbox(
+        Inches(0.5), Inches(1.2), Inches(9), Inches(5.5)  # 上部に配置し、縦幅を拡大
+    )
+    return box.text_frame
+
+
+def add_content_slide(prs, bg_image_path, title, content_text):
+    """
+    戦略のスライドを追加する
+
+    Args:
+        prs: プレゼンテーションオブジェクト
+        bg_image_path (str): 背景画像のパス
+        title (str): 見出し
+        content_text (str): 内容（"• " で始まる行が主要ポイント、"  - " で始まる行がサブポイント）
+    """
+    slide = add_arnak_slide(prs, CONTENT_LAYOUT, bg_image_path, 0.7)
+    add_heading(slide, title, ARNAK.title)
+
+    content_tf = add_body(slide)
+    content_tf.word_wrap = True
+
+    for line in content_text.split('\n'):
+        # 空行はスキップ
+        if not line.strip():
+            continue
+        if line.startswith('  - '):
+            # サブポイントは少し小さく
+            add_text(content_tf, line, 20, ARNAK.text, level=1, space_before=3, space_after=3)
+        else:
+            # 主要ポイントは強調
+            add_text(content_tf, line, 24, ARNAK.text, bold=True if line.startswith('• ') else None,
+                     space_before=6, space_after=6)
+    return slide
+
+
+def create_arnak_presentation(output_file="arnak_strategy.pptx"):
+    """
+    アルナック（Lost Ruins of Arnak）の戦略をパワーポイントにまとめる関数
+
+    Args:
+        output_file (str): 出力するパワーポイントファイル名
+
+    Returns:
+        str: 出力したファイル名
+    """
+    from pptx.util import Inches
+    from pptx.enum.text import PP_ALIGN
+
+    prs = new_presentation()
+
+    with profiling.phase("image"):
+        bg_image_path = download_background()
+
+    with profiling.phase("render"):
+        # タイトルスライドの作成
+        with profiling.slide("タイトル"):
+            slide = add_arnak_slide(prs, TITLE_LAYOUT, bg_image_path, 0.5)
+            for text, top, height, size, color, bold, italic in [
+                ("アルナック", 1.5, 1.5, 54, ARNAK.title, True, False),
+                ("Lost Ruins of Arnak", 3, 1, 32, ARNAK.subtitle, False, True),
+                ("戦略ガイド", 4.5, 1, 28, ARNAK.text, True, False),
+            ]:
+                box = slide.shapes.add_textbox(Inches(1), Inches(top), Inches(8), Inches(height))
+                add_text(box.text_frame, text, size, color, bold=bold, italic=italic,
+                         alignment=PP_ALIGN.CENTER)
+
+        # 目次スライドの作成
+        with profiling.slide("目次"):
+            slide = add_arnak_slide(prs, CONTENT_LAYOUT, bg_image_path, 0.7)
+            add_heading(slide, "目次", ARNAK.title)
+            box = slide.shapes.add_textbox(
+                Inches(2), Inches(1.3), Inches(6), Inches(5.5)  # 縦幅を拡大
+            )
+            for item in TOC_ITEMS:
+                add_text(box.text_frame, f"• {item}", 28, ARNAK.text, alignment=PP_ALIGN.LEFT,
+                         space_after=15)
+
+        # 戦略のスライド
+        for title, content_text in ARNAK_SECTIONS:
+            with profiling.slide(title):
+                add_content_slide(prs, bg_image_path, title, content_text)
+
+        # 注意点のスライド
+        with profiling.slide("注意点"):
+            slide = add_arnak_slide(prs, CONTENT_LAYOUT, bg_image_path, 0.7)
+            add_heading(slide, "注意点", ARNAK.highlight)
+            content_tf = add_body(slide)
+            for point in CAUTION_POINTS:
+                add_text(content_tf, f"• {point}", 24, ARNAK.text, bold=True, alignment=PP_ALIGN.LEFT,
+                         space_before=10, space_after=10)
+
+        # まとめスライドの作成
+        with profiling.slide("まとめ"):
+            slide = add_arnak_slide(prs, CONTENT_LAYOUT, bg_image_path, 0.7)
+            add_heading(slide, "まとめ", ARNAK.title)
+            content_tf = add_body(slide)
+            add_text(content_tf, "アルナックの勝利の鍵：", 28, ARNAK.subtitle, bold=True,
+                     alignment=PP_ALIGN.CENTER, space_after=15)
+            for point in SUMMARY_POINTS:
+                add_text(content_tf, f"• {point}", 24, ARNAK.text, bold=True, alignment=PP_ALIGN.LEFT,
+                         space_before=8, space_after=8)
+
+    save_presentation(prs, output_file)
+    print(f"アルナック戦略プレゼンテーションを {output_file} として保存しました。")
+    return output_file
@@ -0,0 +1,466 @@
+"""
+多数の入力ファイルをまとめて変換するバッチ処理
+
+ファイルごとに「読み込み → 描画 → 書き込み」を順に行うと、ネットワーク上のストレージでは
+読み書きを待つ間 CPU が遊んでしまいます。このモジュールは 3 つの段階をパイプラインにして
+重ね合わせます。
+
+1. 読み込み: スレッドで入力ファイルのバイト列を先読みする（io_threads 本を同時に）
+2. 描画: プロセスプール（server と同じく python-pptx を読み込み済みのワーカー）で
+   文字コードの判定と .pptx の作成を行う
+3. 書き込み: スレッドで .pptx のバイト列を一時ファイルに書き、名前を変えて置き換える
+
+段階の間は大きさに上限のある asyncio.Queue でつなぎます。描画が追いつかなければ読み込みが、
+書き込みが追いつかなければ描画が待つため、メモリに溜まるファイルの数は一定で、
+全体の速さは I/O の待ち時間ではなく CPU で決まります。
+
+mapped を指定すると、入力のバイト列を親プロセスで読み込んでワーカーに送る（pickle でコピーする）
+代わりに、ファイル名だけを送り、ワーカーがファイルをメモリーマップで開いてそのままデコードします。
+読み込みの段階は OS に先読み（posix_fadvise）を頼むだけになり、大きな入力でもコピーが増えません。
+
+memory_budget を指定すると、描画中のファイルの見積もりメモリ（scheduling.estimate）の合計が
+上限を超えないように描画を待たせます。ファイルの順番は scheduling.order_jobs で
+時間のかかるものから並べ替えておくと、最後に大きなファイルが 1 つだけ残りません。
+
+使用例:
+    python -m deep_research_slide batch inputs/*.txt -d slides/ --jobs 4 --writer fast
+"""
+import asyncio
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from . import reproducible
+
+# 1 つの変換
+# input_file: 入力テキストファイル、output_file: 出力する .pptx
+Job = namedtuple("Job", "input_file output_file")
+
+# 変換の結果
+# error: 失敗した場合のエラーの説明（成功した場合は None）、seconds: 読み込みから書き込みまでの秒数、
+# digest: 入力の内容の SHA-256（読み込めなかった場合は None）
+Result = namedtuple("Result", "input_file output_file error seconds digest", defaults=(None,))
+
+# 既定の読み書きのスレッド数（ネットワーク上のストレージの待ち時間を隠すのに使う）
+DEFAULT_IO_THREADS = 4
+
+def _read_umask():
+    """プロセスの umask（os.umask は設定しないと読めないため、設定して元に戻す）"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# 新しく作る出力ファイルのパーミッション（open() で作った場合と同じ）。
+# 書き込みの段階はスレッドで行うため、umask を一時的に変える読み取りは読み込み時に 1 回だけ行う
+FILE_MODE = 0o666 & ~_read_umask()
+
+# ワーカープロセスが異常終了した場合に、1 つのファイルの描画を試す回数の上限。
+# 再試行はほかのファイルと重ねずに 1 つだけで描画するため、再試行でも落ちればそのファイルが原因とわかる
+MAX_RENDER_ATTEMPTS = 2
+
+# 変換の設定（ワーカープロセスに渡す）
+Options = namedtuple("Options", "title theme writer encoding normalize save_workers",
+                     defaults=(None, "blue", "pptx", None, True, 1))
+
+
+def plan_jobs(input_files, output_dir=None):
+    """
+    入力ファイルごとの出力ファイル名を決める（"dir/report.txt" -> "output_dir/report.pptx"）
+
+    Args:
+        input_files (list): 入力テキストファイルのリスト
+        output_dir (str): 出力先のディレクトリ（None の場合は入力ファイルと同じディレクトリ）
+
+    Returns:
+        list: Job のリスト
+
+    Raises:
+        ValueError: 出力ファイル名が重なる場合
+    """
+    jobs = []
+    seen = {}
+    for input_file in input_files:
+        stem = os.path.splitext(os.path.basename(input_file))[0]
+        output_file = os.path.join(output_dir or os.path.dirname(input_file), stem + ".pptx")
+        key = os.path.normcase(os.path.abspath(output_file))
+        if key in seen:
+            raise ValueError(f"{seen[key]} と {input_file} の出力ファイル名が同じです: {output_file}")
+        seen[key] = input_file
+        jobs.append(Job(input_file, output_file))
+    return jobs
+
+
+def read_bytes(path):
+    """ファイルの内容を読み込む"""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_input(path):
+    """入力ファイルの内容と、その SHA-256 を返す"""
+    data = read_bytes(path)
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def prefetch_file(path):
+    """
+    ファイルの大きさを返し、OS に先読みを頼む（mapped の場合の読み込みの段階）
+
+    Args:
+        path (str): 入力ファイル名
+
+    Returns:
+        int: ファイルのバイト数
+    """
+    with open(path, "rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        return os.fstat(f.fileno()).st_size
+
+
+def write_atomic(path, data):
+    """
+    一時ファイルに書いてから置き換える（書き込みの途中で止まっても壊れたファイルを残さない）
+
+    Args:
+        path (str): 出力するファイル名
+        data (bytes): 内容
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".pptx", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp の一時ファイルは 0600 のため、既存のファイルのパーミッションか、open() と同じものにする
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        else:
+            os.chmod(temp_path, FILE_MODE)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _init_worker(build_time):
+    """ワーカープロセスの初期化（再現可能モードの日時を引き継ぎ、python-pptx を読み込んでおく）"""
+    from .server import _warm_worker
+    if build_time is not None:
+        reproducible.set_build_time(build_time)
+    _warm_worker()
+
+
+def convert_bytes(data, options):
+    """
+    ワーカープロセスで実行される変換処理（入力のバイト列から .pptx のバイト列を作る）
+
+    Args:
+        data (bytes): 入力テキストファイルの内容
+        options (Options): 変換の設定
+
+    Returns:
+        bytes: 作成した .pptx の内容
+    """
+    from .decoding import decode_text
+    return _convert_text(decode_text(data, options.encoding, options.normalize), len(data), options)
+
+
+def convert_file(path, options):
+    """
+    ワーカープロセスで実行される変換処理（入力ファイルをメモリーマップで開き、コピーせずにデコードする）
+
+    Args:
+        path (str): 入力テキストファイル名
+        options (Options): 変換の設定
+
+    Returns:
+        tuple: (作成した .pptx の内容, 入力の内容の SHA-256)
+    """
+    from .decoding import decode_text
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空のファイルはマップできない
+            data = b""
+    try:
+        digest = hashlib.sha256(data).hexdigest()
+        text = decode_text(data, options.encoding, options.normalize)
+        size = len(data)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    return _convert_text(text, size, options), digest
+
+
+def _convert_text(text, size, options):
+    from .scheduling import TRIM_BYTES, release_memory
+    from .server import convert
+    pptx = convert(text, options.title, options.theme, options.writer, options.save_workers)
+    if size >= TRIM_BYTES:
+        del text
+        release_memory()
+    return pptx
+
+
+def _describe_error(e):
+    if isinstance(e, OSError) and e.filename:
+        return f"{e.strerror}: {e.filename}"
+    return str(e) or type(e).__name__
+
+
+class WorkerPool:
+    """
+    描画に使う、python-pptx を読み込み済みのワーカープロセスのプール（with 文で使う）
+
+    ワーカープロセスが異常終了（メモリ不足で強制終了されるなど）して ProcessPoolExecutor が
+    使えなくなった場合は、restart で作り直します。
+
+    Args:
+        workers (int): ワーカープロセス数
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.restarts = 0
+        self.executor = self._create()
+
+    def _create(self):
+        return ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                   initargs=(reproducible.fixed_build_time(),))
+
+    def submit(self, fn, *args):
+        """
+        fn(*args) をワーカーで実行する（プールが使えなくなっていれば作り直してから投入する）
+
+        Returns:
+            tuple: (投入した ProcessPoolExecutor, concurrent.futures.Future)
+        """
+        executor = self.executor
+        try:
+            return executor, executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self.restart(executor)
+            return self.executor, self.executor.submit(fn, *args)
+
+    def restart(self, broken):
+        """使えなくなったプール broken を作り直す（同じプールで失敗が続いても作り直すのは 1 回だけ）"""
+        if self.executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.restarts += 1
+        self.executor = self._create()
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+class _RenderGate:
+    """
+    ワーカーの異常終了で描画をやり直すファイルを、ほかのファイルと重ならないように 1 つずつ描画させる
+
+    プールが使えなくなると、原因のファイルと同時に描画していたファイルもすべて失敗します。
+    やり直すファイルを 1 つだけで描画すれば、原因のファイルだけが再び失敗します。
+    やり直しを待っているファイルがある間は、新しいファイルの描画を始めません。
+    """
+
+    def __init__(self):
+        self.condition = asyncio.Condition()
+        self.running = 0
+        self.waiting_alone = 0
+        self.alone = False
+
+    async def enter(self, alone):
+        async with self.condition:
+            if alone:
+                self.waiting_alone += 1
+                try:
+                    await self.condition.wait_for(lambda: not self.alone and self.running == 0)
+                finally:
+                    self.waiting_alone -= 1
+                self.alone = True
+            else:
+                await self.condition.wait_for(lambda: not self.alone and not self.waiting_alone)
+            self.running += 1
+
+    async def leave(self, alone):
+        async with self.condition:
+            self.running -= 1
+            if alone:
+                self.alone = False
+            self.condition.notify_all()
+
+
+async def _render(pool, gate, fn, *args):
+    """
+    fn(*args) をワーカーで実行し、ワーカーの異常終了で失敗した場合はプールを作り直して再試行する
+
+    Raises:
+        BrokenProcessPool: MAX_RENDER_ATTEMPTS 回ともワーカーが異常終了した場合
+    """
+    for attempt in range(1, MAX_RENDER_ATTEMPTS + 1):
+        alone = attempt > 1
+        await gate.enter(alone)
+        try:
+            executor, future = pool.submit(fn, *args)
+            try:
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                pool.restart(executor)
+                if attempt == MAX_RENDER_ATTEMPTS:
+                    raise BrokenProcessPool(f"ワーカープロセスが異常終了しました（{attempt} 回）")
+        finally:
+            await gate.leave(alone)
+
+
+async def run_pipeline(jobs, options, pool, renderers=1, io_threads=DEFAULT_IO_THREADS, prefetch=None,
+                       on_result=None, memory_budget=None, mapped=False):
+    """
+    読み込み・描画・書き込みを重ね合わせて jobs を変換する
+
+    Args:
+        jobs (list): Job のリスト
+        options (Options): 変換の設定
+        pool (WorkerPool): 描画に使うワーカープロセスのプール（worker_pool で作る）
+        renderers (int): 同時に描画するファイルの数（pool のワーカー数）
+        io_threads (int): 読み書きに使うスレッド数
+        prefetch (int): 段階の間に溜めておけるファイルの最大数（None の場合は描画の並列数の 2 倍）
+        on_result (callable): 1 つの変換が終わるたびに Result を渡して呼ぶ関数（None の場合は呼ばない）
+        memory_budget (int): 同時に描画するファイルの見積もりメモリの合計の上限（バイト、None の場合は無制限）
+        mapped (bool): ワーカーが入力ファイルをメモリーマップで開くかどうか（False の場合は読み込んで送る）
+
+    Returns:
+        list: Result のリスト（jobs と同じ順番）
+    """
+    from .scheduling import MemoryBudget, estimate
+    loop = asyncio.get_running_loop()
+    budget = MemoryBudget(memory_budget) if memory_budget else None
+    gate = _RenderGate()
+    prefetch = prefetch or renderers * 2
+    inputs = asyncio.Queue(prefetch)
+    outputs = asyncio.Queue(prefetch)
+    results = {}
+    pending = iter(enumerate(jobs))
+
+    def finish(index, job, start, error=None, digest=None):
+        result = Result(job.input_file, job.output_file, error, time.perf_counter() - start, digest)
+        results[index] = result
+        if on_result is not None:
+            on_result(result)
+
+    with ThreadPoolExecutor(io_threads) as io_pool:
+        async def read_inputs():
+            # 読み込みのコルーチンは jobs のイテレーターを共有し、空いたものから次のファイルを取る
+            for index, job in pending:
+                start = time.perf_counter()
+                try:
+                    if mapped:
+                        data = digest = None
+                        size = await loop.run_in_executor(io_pool, prefetch_file, job.input_file)
+                    else:
+                        data, digest = await loop.run_in_executor(io_pool, read_input, job.input_file)
+                        size = len(data)
+                except OSError as e:
+                    finish(index, job, start, _describe_error(e))
+                    continue
+                await inputs.put((index, job, start, size, data, digest))
+
+        async def render():
+            while True:
+                item = await inputs.get()
+                if item is None:
+                    return
+                index, job, start, size, data, digest = item
+                memory = estimate(size, writer=options.writer).memory
+                if budget is not None:
+                    await budget.acquire(memory)
+                try:
+                    if data is None:
+                        pptx, digest = await _render(pool, gate, convert_file, job.input_file, options)
+                    else:
+                        pptx = await _render(pool, gate, convert_bytes, data, options)
+                except Exception as e:
+                    finish(index, job, start, _describe_error(e), digest)
+                    continue
+                finally:
+                    if budget is not None:
+                        budget.release(memory)
+                await outputs.put((index, job, start, pptx, digest))
+
+        async def write_outputs():
+            while True:
+                item = await outputs.get()
+                if item is None:
+                    return
+                index, job, start, pptx, digest = item
+                try:
+                    await loop.run_in_executor(io_pool, write_atomic, job.output_file, pptx)
+                except OSError as e:
+                    finish(index, job, start, _describe_error(e), digest)
+                else:
+                    finish(index, job, start, digest=digest)
+
+        writing = [asyncio.ensure_future(write_outputs()) for _ in range(io_threads)]
+        rendering = [asyncio.ensure_future(render()) for _ in range(renderers)]
+        await asyncio.gather(*[read_inputs() for _ in range(io_threads)])
+        # 終わりの印を段階ごとに流し、前の段階が終わってから次の段階を止める
+        for _ in rendering:
+            await inputs.put(None)
+        await asyncio.gather(*rendering)
+        for _ in writing:
+            await outputs.put(None)
+        await asyncio.gather(*writing)
+    return [results[index] for index in range(len(jobs))]
+
+
+def run_batch(jobs, options=Options(), workers=None, io_threads=DEFAULT_IO_THREADS, prefetch=None,
+              on_result=None, memory_budget=None, mapped=False):
+    """
+    jobs をプロセスプールで変換する（run_pipeline を asyncio のイベントループで実行する）
+
+    Args:
+        jobs (list): Job のリスト
+        options (Options): 変換の設定
+        workers (int): 描画に使うワーカープロセス数（None の場合は CPU 数）
+        io_threads (int): 読み書きに使うスレッド数
+        prefetch (int): 段階の間に溜めておけるファイルの最大数
+        on_result (callable): 1 つの変換が終わるたびに Result を渡して呼ぶ関数
+        memory_budget (int): 同時に描画するファイルの見積もりメモリの合計の上限（バイト）
+        mapped (bool): ワーカーが入力ファイルをメモリーマップで開くかどうか
+
+    Returns:
+        list: Result のリスト（jobs と同じ順番）
+    """
+    if not jobs:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    with worker_pool(workers) as pool:
+        return asyncio.run(run_pipeline(jobs, options, pool, workers, io_threads, prefetch, on_result,
+                                        memory_budget, mapped))
+
+
+def worker_pool(workers):
+    """描画に使う、python-pptx を読み込み済みのワーカープロセスのプール（WorkerPool）を作る"""
+    return WorkerPool(workers)
+
+
+def describe(results, seconds):
+    """バッチ全体の結果を 1 行の説明にする"""
+    failed = sum(1 for result in results if result.error)
+    rate = len(results) / seconds if seconds else 0.0
+    return (f"{len(results)} ファイルを {seconds:.1f} 秒で処理しました"
+            f"（成功 {len(results) - failed}、失敗 {failed}、{rate:.1f} ファイル/秒）")
@@ -0,0 +1,73 @@
+"""
+ボードゲームの攻略情報をプレゼンテーションにまとめる
+"""
+from . import profiling
+from .parsing import extract_game_name, is_url_line, parse_sections, split_paragraphs
+from .render import Slide, build_presentation, plan_section
+from .themes import PLAIN
+
+__all__ = ["create_board_game_presentation", "iter_board_game_deck", "plan_board_game_deck"]
+
+
+def iter_board_game_deck(game_info):
+    """
+    ボードゲームの攻略情報を解析し、スライドの構成を 1 枚ずつ返すイテレーターを作る
+
+    Args:
+        game_info (str): ボードゲームの攻略情報のテキスト
+
+    Returns:
+        iterator: Slide のイテレーター
+    """
+    with profiling.phase("parse"):
+        game_name = extract_game_name(game_info)
+        # テキストを段落に分割（URLを含む行は除外）
+        sections = parse_sections(split_paragraphs(game_info), is_noise=is_url_line, min_title_length=1)
+    return _board_game_slides(game_name, sections)
+
+
+def _board_game_slides(game_name, sections):
+    """解析済みのセクションから Slide を順に作る"""
+    yield Slide("title", game_name, ["ボードゲーム攻略ガイド"])
+    yield Slide("toc", "目次", [f"• {section.title}" for section in sections] + [""])
+    for section in sections:
+        yield from plan_section(section.title, section.lines)
+    yield Slide("summary", "まとめ", [
+        f"{game_name}の攻略ポイント：",
+        "",
+        "• 基本ルールを理解する",
+        "• 戦略的な思考を身につける",
+        "• 経験を積んで上達しよう",
+    ])
+
+
+def plan_board_game_deck(game_info):
+    """
+    ボードゲームの攻略情報からスライドの構成を組み立てる
+
+    Args:
+        game_info (str): ボードゲームの攻略情報のテキスト
+
+    Returns:
+        list: Slide のリスト
+    """
+    return list(iter_board_game_deck(game_info))
+
+
+def create_board_game_presentation(game_info, output_file="board_game_strategy.pptx", writer="pptx",
+                                   workers=None):
+    """
+    ボードゲームの攻略情報をパワーポイントにまとめる関数
+
+    Args:
+        game_info (str): ボードゲームの攻略情報のテキスト
+        output_file (str): 出力するパワーポイントファイル名
+        writer (str): 出力方法（"pptx": python-pptx、"fast": XML を直接書き出す高速な出力）
+        workers (int): 保存時の圧縮に使うスレッド数（None の場合は CPU 数）
+
+    Returns:
+        str: 出力したファイル名
+    """
+    build_presentation(iter_board_game_deck(game_info), PLAIN, output_file, writer, workers)
+    print(f"プレゼンテーションを {output_file} として保存しました。")
+    return output_file
@@ -0,0 +1,576 @@
+"""
+コマンドラインインターフェース
+
+使用例:
+    python -m deep_research_slide research research.txt -o output.pptx --theme dark
+    python -m deep_research_slide research research.txt -o output.pptx --themes blue,dark --jobs 2
+    python -m deep_research_slide research research.txt -o output.pptx --max-slides 500
+    python -m deep_research_slide research research_sjis.txt -o output.pptx --encoding cp932
+    python -m deep_research_slide boardgame game_info.txt
+    python -m deep_research_slide arnak
+    python -m deep_research_slide styled
+    python -m deep_research_slide compact deck.pptx
+    python -m deep_research_slide validate deck.pptx
+    python -m deep_research_slide batch inputs/*.txt -d slides/ --jobs 4
+    python -m deep_research_slide serve --port 8765
+
+python-pptx などの重いモジュールは、サブコマンドを実行するときに読み込みます。
+"""
+import argparse
+
+from . import profiling, reproducible
+from .render import WRITERS
+from .themes import THEMES
+
+
+def read_text(input_file, encoding=None, normalize=True):
+    """入力テキストファイルを読み込む（文字コードの判定と正規化は decoding.read_text で行う）"""
+    from .decoding import read_text as decode_file
+
+    with profiling.phase("read"):
+        return decode_file(input_file, encoding, normalize)
+
+
+def run_research(args):
+    """research サブコマンド: DeepResearch の結果をプレゼンテーションに変換する"""
+    from .research import (
+        create_deep_research_presentation, create_deep_research_presentations, extract_title_from_text,
+    )
+
+    research_text = read_text(args.input_file, args.encoding, args.normalize)
+
+    # タイトルが指定されていない場合はテキストから抽出
+    title = args.title if args.title else extract_title_from_text(research_text)
+
+    if args.themes:
+        if args.max_slides or args.max_bytes:
+            raise ValueError("--themes と --max-slides / --max-bytes は同時に指定できません")
+        output_files = create_deep_research_presentations(
+            research_text,
+            args.themes,
+            output_file=args.output,
+            title=title,
+            writer=args.writer,
+            workers=args.save_workers,
+            jobs=args.jobs,
+            dedupe=args.dedupe,
+            dedupe_mode=args.dedupe_mode
+        )
+        print(f"プレゼンテーションが正常に作成されました: {', '.join(output_files)}")
+        return output_files
+
+    output_file = create_deep_research_presentation(
+        research_text,
+        output_file=args.output,
+        title=title,
+        theme=args.theme,
+        writer=args.writer,
+        workers=args.save_workers,
+        max_slides=args.max_slides,
+        max_bytes=args.max_bytes,
+        jobs=args.jobs,
+        dedupe=args.dedupe,
+        dedupe_mode=args.dedupe_mode
+    )
+    output_files = output_file if isinstance(output_file, list) else [output_file]
+    print(f"プレゼンテーションが正常に作成されました: {', '.join(output_files)}")
+    return output_files
+
+
+def run_boardgame(args):
+    """boardgame サブコマンド: ボードゲームの攻略情報をプレゼンテーションに変換する"""
+    from .boardgame import create_board_game_presentation
+
+    return [create_board_game_presentation(read_text(args.input_file, args.encoding, args.normalize), output_file=args.output,
+                                           writer=args.writer, workers=args.save_workers)]
+
+
+def run_arnak(args):
+    """arnak サブコマンド: アルナックの戦略プレゼンテーションを作成する"""
+    from .arnak import create_arnak_presentation
+
+    return [create_arnak_presentation(output_file=args.output)]
+
+
+def run_styled(args):
+    """styled サブコマンド: 産業廃棄物市場分析のプレゼンテーションを作成する"""
+    from .styled import create_styled_presentation
+
+    return [create_styled_presentation(output_file=args.output)]
+
+
+def run_compact(args):
+    """compact サブコマンド: 既存の .pptx から使われていないレイアウトやパーツを取り除く"""
+    if args.output and len(args.input_files) > 1:
+        raise ValueError("-o を指定する場合は入力ファイルを 1 つにしてください")
+    compact_files(args.input_files, args.output)
+    return []
+
+
+def compact_files(input_files, output_file=None):
+    """ファイルを順に compact.compact_presentation で整理し、結果を表示する"""
+    from .compact import compact_presentation, describe
+
+    for input_file in input_files:
+        stats = compact_presentation(input_file, output_file)
+        print(describe(output_file or input_file, stats))
+
+
+def run_batch(args):
+    """batch サブコマンド: 多数の研究結果を読み込み・描画・書き込みを重ねて変換する"""
+    import time
+    from .batch import Options, describe, plan_jobs, run_batch as run_jobs
+    from .scheduling import default_memory_budget, order_jobs
+
+    jobs = plan_jobs(args.input_files, args.output_dir)
+    if args.order == 'size':
+        jobs = order_jobs(jobs, args.writer)
+    options = Options(args.title, args.theme, args.writer, args.encoding, args.normalize, args.save_workers or 1)
+    memory_budget = args.memory_budget or default_memory_budget()
+
+    if not args.manifest:
+        start = time.perf_counter()
+        with profiling.phase("batch"):
+            results = run_jobs(jobs, options, args.jobs, args.io_threads, args.prefetch, print_result,
+                               memory_budget, args.mmap)
+        print(describe(results, time.perf_counter() - start))
+        return finish_batch(args, results)
+
+    from .manifest import Heartbeat, Manifest, describe_skipped
+    manifest = Manifest(args.manifest, args.lease)
+    try:
+        jobs, skipped = manifest.claim(jobs, args.max_attempts)
+        if any(skipped):
+            print(describe_skipped(skipped))
+        # 試行回数の上限に達して飛ばしたファイルは、失敗したままになっている
+        args.failed = skipped.exhausted > 0
+
+        def report(result):
+            manifest.record(result)
+            print_result(result)
+
+        start = time.perf_counter()
+        with profiling.phase("batch"), Heartbeat(manifest):
+            results = run_jobs(jobs, options, args.jobs, args.io_threads, args.prefetch, report, memory_budget,
+                               args.mmap)
+    finally:
+        manifest.release()
+        manifest.close()
+    print(describe(results, time.perf_counter() - start))
+    return finish_batch(args, results)
+
+
+def finish_batch(args, results):
+    """
+    失敗したファイルがあれば終了コードを 1 にし（args.failed）、作成したファイルのリストを返す
+
+    Args:
+        args (argparse.Namespace): 解析済みの引数
+        results (list): batch.Result のリスト
+
+    Returns:
+        list: 作成した .pptx のリスト
+    """
+    if any(result.error for result in results):
+        args.failed = True
+    return [result.output_file for result in results if not result.error]
+
+
+def print_result(result):
+    """batch.Result を 1 行で表示する"""
+    if result.error:
+        print(f"失敗: {result.input_file}: {result.error}")
+    else:
+        print(f"{result.output_file} を作成しました（{result.seconds:.2f} 秒）")
+
+
+def run_queue_add(args):
+    """queue add サブコマンド: 共有の待ち行列に入力ファイルを登録する"""
+    from .batch import Options, plan_jobs
+    from .jobqueue import enqueue
+    from .manifest import describe_skipped
+    from .scheduling import order_jobs
+
+    # ワーカーは登録した順に取り出すため、時間のかかるファイルから登録する
+    jobs = plan_jobs(args.input_files, args.output_dir)
+    if args.order == 'size':
+        jobs = order_jobs(jobs, args.writer)
+    options = Options(args.title, args.theme, args.writer, args.encoding, args.normalize, args.save_workers or 1)
+    jobs, skipped = enqueue(args.queue, jobs, options, args.max_attempts)
+    if any(skipped):
+        print(describe_skipped(skipped))
+    print(f"{args.queue} に {len(jobs)} ファイルを登録しました")
+    return []
+
+
+def run_queue_work(args):
+    """queue work サブコマンド: 共有の待ち行列からファイルを取り出して変換する"""
+    import time
+    from .batch import describe
+    from .jobqueue import open_queue, run_worker
+    from .manifest import FAILED
+    from .scheduling import default_memory_budget
+
+    start = time.perf_counter()
+    with profiling.phase("queue"):
+        results = run_worker(args.queue, args.jobs, args.io_threads, args.prefetch, args.claim,
+                             args.max_attempts, args.lease, args.poll, print_result,
+                             args.memory_budget or default_memory_budget(), args.mmap)
+    print(describe(results, time.perf_counter() - start))
+    # ほかのワーカーの失敗も含め、試行回数の上限に達して失敗したままのファイルがあれば失敗とする
+    queue = open_queue(args.queue)
+    try:
+        failed = queue.counts().get(FAILED, 0)
+    finally:
+        queue.close()
+    if failed:
+        print(f"{failed} ファイルが失敗したままです")
+        args.failed = True
+    return finish_batch(args, results)
+
+
+def run_queue_status(args):
+    """queue status サブコマンド: 共有の待ち行列の進み具合を表示する"""
+    from .jobqueue import open_queue
+    from .manifest import describe_counts
+
+    queue = open_queue(args.queue)
+    try:
+        print(describe_counts(queue.counts()))
+    finally:
+        queue.close()
+    return []
+
+
+def run_validate(args):
+    """validate サブコマンド: 既存の .pptx の構造を検証する"""
+    if not validate_files(args.input_files, args.max_media):
+        raise SystemExit(1)
+    return []
+
+
+def validate_files(input_files, max_media_bytes=None):
+    """
+    ファイルを順に validate.validate_presentation で検証し、結果を表示する
+
+    Returns:
+        bool: すべてのファイルに問題がなければ True
+    """
+    from .validate import DEFAULT_MAX_MEDIA_BYTES, describe, validate_presentation
+
+    ok = True
+    with profiling.phase("validate"):
+        for input_file in input_files:
+            issues = validate_presentation(input_file, max_media_bytes or DEFAULT_MAX_MEDIA_BYTES)
+            print('\n'.join(describe(input_file, issues)))
+            ok = ok and not issues
+    return ok
+
+
+def parse_themes(text):
+    """
+    カンマ区切りのテーマ名を解析する（argparse の type に使う）
+
+    Args:
+        text (str): "blue,dark" の形式のテーマ名
+
+    Returns:
+        list: テーマ名のリスト（重複は除く）
+    """
+    themes = []
+    for name in text.split(','):
+        name = name.strip()
+        if name not in THEMES:
+            raise argparse.ArgumentTypeError(f"未知のテーマです: {name}（{', '.join(THEMES)} から選んでください）")
+        if name not in themes:
+            themes.append(name)
+    return themes
+
+
+def parse_encoding(text):
+    """
+    文字コードの名前を確かめる（argparse の type に使う）
+
+    Args:
+        text (str): 文字コードの名前（例: cp932, euc_jp, utf-16）
+
+    Returns:
+        str: 文字コードの名前
+    """
+    import codecs
+
+    try:
+        codecs.lookup(text)
+    except LookupError:
+        raise argparse.ArgumentTypeError(f"未知の文字コードです: {text}")
+    return text
+
+
+def parse_size(text):
+    """
+    "500K" や "40M" の形式のバイト数を解析する（argparse の type に使う）
+
+    Args:
+        text (str): バイト数（K, M, G の接尾辞を付けられる）
+
+    Returns:
+        int: バイト数
+    """
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    text = text.strip().upper().rstrip("B")
+    try:
+        if text[-1:] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"バイト数を解析できません: {text}")
+
+
+def add_server_arguments(parser):
+    """変換サーバーの起動オプションを引数パーサーに追加する（server の読み込みは重いためここで定義する）"""
+    parser.add_argument('--host', default='127.0.0.1', help='待ち受けるホスト（既定: 127.0.0.1）')
+    parser.add_argument('--port', type=int, default=8765, help='待ち受けるポート（既定: 8765）')
+    parser.add_argument('--socket', help='TCP の代わりに使う Unix ソケットのパス')
+    parser.add_argument('--workers', type=int, help='ワーカープロセス数（既定: CPU 数）')
+    parser.add_argument('--max-queue', type=int, default=32, help='実行待ちにできるリクエストの最大数')
+    parser.add_argument('--max-body', type=int, default=50 * 1024 * 1024, help='リクエスト本文の最大バイト数')
+    parser.add_argument('--timeout', type=float, default=300, help='1 リクエストあたりのタイムアウト（秒）')
+
+
+def build_parser():
+    """サブコマンドを含む引数パーサーを作成する"""
+    # プロファイリングと再現可能な出力の引数はすべての変換サブコマンドで共通
+    common_parent = argparse.ArgumentParser(add_help=False)
+    profiling.add_profile_arguments(common_parent)
+
+    common_parent.add_argument('--reproducible', action='store_true',
+                               help='同じ入力から同じバイト列を出力する（日時は SOURCE_DATE_EPOCH、'
+                                    '未設定の場合は 2000-01-01）')
+    common_parent.add_argument('--build-date', type=reproducible.parse_build_date, metavar='YYYY-MM-DD',
+                               help='タイトルの日付やタイムスタンプに使う日付（--reproducible を含む）')
+    common_parent.add_argument('--compact', action='store_true',
+                               help='保存後に、使われていないスライドレイアウトやパーツを取り除き、重複した画像をまとめる')
+    common_parent.add_argument('--validate', action='store_true',
+                               help='保存後に、空のプレースホルダーやテキストのはみ出しなどの構造の問題を調べて表示する')
+
+    # 出力方法は Slide の構成から描画するサブコマンド（research, boardgame）で共通
+    writer_parent = argparse.ArgumentParser(add_help=False)
+    writer_parent.add_argument('--writer', choices=WRITERS, default='pptx',
+                               help='出力方法（pptx: python-pptx で描画、fast: XML を直接書き出す高速な出力）')
+    writer_parent.add_argument('--save-workers', type=int, metavar='N',
+                               help='保存時にパーツの圧縮に使うスレッド数（既定: CPU 数、1 で並列化しない）')
+
+    # 入力テキストの読み込み方は入力ファイルを取るサブコマンド（research, boardgame）で共通
+    input_parent = argparse.ArgumentParser(add_help=False)
+    input_parent.add_argument('--encoding', type=parse_encoding,
+                              help='入力の文字コード（既定: BOM と先頭の内容から UTF-8、UTF-16、Shift_JIS、'
+                                   'EUC-JP を判定する）')
+    input_parent.add_argument('--no-normalize', dest='normalize', action='store_false',
+                              help='入力の NFKC 正規化（全角英数字を半角にするなど）を行わない')
+
+    parser = argparse.ArgumentParser(
+        prog='python -m deep_research_slide',
+        description='テキストからパワーポイントのプレゼンテーションを作成します。',
+    )
+    # failed: 一部のファイルの変換に失敗したかどうか（終了コードを 1 にする）
+    parser.set_defaults(failed=False)
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    research = subparsers.add_parser(
+        'research', parents=[common_parent, writer_parent, input_parent],
+        help='OpenAIのDeepResearchの結果をプレゼンテーションに変換します。',
+    )
+    research.add_argument('input_file', help='入力テキストファイル（DeepResearchの結果）')
+    research.add_argument('-o', '--output', help='出力するパワーポイントファイル名')
+    research.add_argument('-t', '--title', help='プレゼンテーションのタイトル')
+    research.add_argument('--theme', choices=list(THEMES), default='blue',
+                          help='カラーテーマ（blue, dark, light, green）')
+    research.add_argument('--themes', type=parse_themes, metavar='THEME,...',
+                          help='複数のテーマで出力する（例: blue,dark）。解析は 1 回で済ませ、'
+                               '出力ファイル名にテーマ名を付ける')
+    research.add_argument('--dedupe', type=float, nargs='?', const=0.8, metavar='THRESHOLD',
+                          help='ほぼ同じ内容の行やセクションを取り除く（THRESHOLD: 類似度のしきい値 0〜1、既定: 0.8）')
+    research.add_argument('--dedupe-mode', choices=('drop', 'fold'), default='drop',
+                          help='重複したセクションの扱い（drop: 取り除く、fold: 先に出てきたセクションにまとめる）')
+    research.add_argument('--max-slides', type=int, metavar='N',
+                          help='1 ファイルあたりの最大スライド数。超える場合はセクションの切れ目で '
+                               '"_part1" などのファイルに分割する')
+    research.add_argument('--max-bytes', type=parse_size, metavar='SIZE',
+                          help='1 ファイルあたりの本文の最大バイト数（例: 2M）。超える場合は分割する')
+    research.add_argument('--jobs', type=int, default=1, metavar='N',
+                          help='--themes や分割で、並列に作成するファイルの数（既定: 1）')
+    research.set_defaults(func=run_research, entry='deep_research')
+
+    boardgame = subparsers.add_parser(
+        'boardgame', parents=[common_parent, writer_parent, input_parent],
+        help='ボードゲームの攻略情報をプレゼンテーションに変換します。',
+    )
+    boardgame.add_argument('input_file', nargs='?', default='game_info.txt',
+                           help='入力テキストファイル（既定: game_info.txt）')
+    boardgame.add_argument('-o', '--output', default='board_game_strategy.pptx',
+                           help='出力するパワーポイントファイル名（既定: board_game_strategy.pptx）')
+    boardgame.set_defaults(func=run_boardgame, entry='board_game')
+
+    arnak = subparsers.add_parser(
+        'arnak', parents=[common_parent],
+        help='アルナックの戦略プレゼンテーションを作成します。',
+    )
+    arnak.add_argument('-o', '--output', default='arnak_strategy.pptx',
+                       help='出力するパワーポイントファイル名（既定: arnak_strategy.pptx）')
+    arnak.set_defaults(func=run_arnak, entry='arnak')
+
+    styled = subparsers.add_parser(
+        'styled', parents=[common_parent],
+        help='産業廃棄物市場分析のプレゼンテーションを作成します。',
+    )
+    styled.add_argument('-o', '--output', help='出力するパワーポイントファイル名（既定: 日時から自動生成）')
+    styled.set_defaults(func=run_styled, entry='styled')
+
+    compact = subparsers.add_parser(
+        'compact', parents=[common_parent],
+        help='既存の .pptx から使われていないスライドレイアウトやパーツを取り除きます。',
+    )
+    compact.add_argument('input_files', nargs='+', help='整理する .pptx ファイル（既定では上書きする）')
+    compact.add_argument('-o', '--output', help='出力するファイル名（入力ファイルが 1 つの場合のみ）')
+    compact.set_defaults(func=run_compact, entry='compact')
+
+    batch = subparsers.add_parser(
+        'batch', parents=[common_parent, writer_parent, input_parent],
+        help='多数の研究結果のテキストファイルを、読み込み・描画・書き込みを重ねてまとめて変換します。',
+    )
+    batch.add_argument('input_files', nargs='+', help='入力テキストファイル（DeepResearchの結果）')
+    batch.add_argument('-d', '--output-dir', help='出力先のディレクトリ（既定: 入力ファイルと同じディレクトリ）')
+    batch.add_argument('-t', '--title', help='プレゼンテーションのタイトル（既定: 各テキストから抽出）')
+    batch.add_argument('--theme', choices=list(THEMES), default='blue',
+                       help='カラーテーマ（blue, dark, light, green）')
+    batch.add_argument('--jobs', type=int, metavar='N', help='描画に使うワーカープロセス数（既定: CPU 数）')
+    batch.add_argument('--io-threads', type=int, default=4, metavar='N',
+                       help='入力の先読みと出力の書き込みに使うスレッド数（既定: 4）')
+    batch.add_argument('--prefetch', type=int, metavar='N',
+                       help='読み込み済み・描画済みで待たせておけるファイルの最大数（既定: --jobs の 2 倍）')
+    batch.add_argument('--order', choices=['size', 'input'], default='size',
+                       help='変換の順番（size: 時間のかかりそうな大きいファイルから、input: 指定した順。既定: size）')
+    batch.add_argument('--memory-budget', type=parse_size, metavar='SIZE',
+                       help='同時に変換するファイルの見積もりメモリの合計の上限（例: 2G。既定: 物理メモリの 3/4）')
+    batch.add_argument('--mmap', action='store_true',
+                       help='入力を読み込んでワーカーに送る代わりに、ワーカーがメモリーマップで開く'
+                            '（大きな入力のコピーを避ける。ローカルのディスク向け）')
+    batch.add_argument('--manifest', metavar='FILE',
+                       help='進み具合を記録する SQLite のファイル。再実行すると完了したファイルを飛ばし、'
+                            '失敗したファイルを再試行する（同じファイルに対する同時実行も安全）')
+    batch.add_argument('--max-attempts', type=int, default=3, metavar='N',
+                       help='--manifest で 1 つのファイルを試行する回数の上限（既定: 3）')
+    batch.add_argument('--lease', type=float, default=3600, metavar='SECONDS',
+                       help='--manifest でほかの実行が処理中のファイルを、止まったものとみなして引き継ぐまでの秒数'
+                            '（既定: 3600）')
+    batch.set_defaults(func=run_batch, entry='batch')
+
+    queue = subparsers.add_parser(
+        'queue', help='共有ストレージ上の待ち行列を使い、複数のホストのワーカーで変換を分担します。',
+    )
+    queue_commands = queue.add_subparsers(dest='queue_command', required=True, help='操作')
+    queue_parent = argparse.ArgumentParser(add_help=False)
+    queue_parent.add_argument('--queue', required=True, metavar='FILE',
+                              help='待ち行列にする SQLite のファイル（すべてのホストから同じパスで見える共有ストレージ上）')
+
+    queue_add = queue_commands.add_parser(
+        'add', parents=[common_parent, writer_parent, input_parent, queue_parent],
+        help='入力ファイルを待ち行列に登録します（変換の設定は最初の登録時に保存します）。',
+    )
+    queue_add.add_argument('input_files', nargs='+', help='入力テキストファイル（DeepResearchの結果）')
+    queue_add.add_argument('-d', '--output-dir', help='出力先のディレクトリ（既定: 入力ファイルと同じディレクトリ）')
+    queue_add.add_argument('-t', '--title', help='プレゼンテーションのタイトル（既定: 各テキストから抽出）')
+    queue_add.add_argument('--theme', choices=list(THEMES), default='blue',
+                           help='カラーテーマ（blue, dark, light, green）')
+    queue_add.add_argument('--order', choices=['size', 'input'], default='size',
+                           help='登録する順番＝ワーカーが取り出す順番（size: 大きいファイルから、input: 指定した順。'
+                                '既定: size）')
+    queue_add.add_argument('--max-attempts', type=int, default=3, metavar='N',
+                           help='この回数まで失敗したファイルは登録し直さない（既定: 3）')
+    queue_add.set_defaults(func=run_queue_add, entry='queue-add')
+
+    queue_work = queue_commands.add_parser(
+        'work', parents=[common_parent, queue_parent],
+        help='待ち行列からファイルを取り出して変換します（取り出せるファイルがなくなると終わる）。',
+    )
+    queue_work.add_argument('--jobs', type=int, metavar='N', help='描画に使うワーカープロセス数（既定: CPU 数）')
+    queue_work.add_argument('--io-threads', type=int, default=4, metavar='N',
+                            help='入力の先読みと出力の書き込みに使うスレッド数（既定: 4）')
+    queue_work.add_argument('--prefetch', type=int, metavar='N',
+                            help='読み込み済み・描画済みで待たせておけるファイルの最大数（既定: --jobs の 2 倍）')
+    queue_work.add_argument('--claim', type=int, metavar='N',
+                            help='1 回に取り出すファイルの数（既定: --jobs の 4 倍）')
+    queue_work.add_argument('--memory-budget', type=parse_size, metavar='SIZE',
+                            help='このホストで同時に変換するファイルの見積もりメモリの合計の上限'
+                                 '（既定: 物理メモリの 3/4）')
+    queue_work.add_argument('--mmap', action='store_true',
+                            help='入力を読み込んでワーカーに送る代わりに、ワーカーがメモリーマップで開く')
+    queue_work.add_argument('--max-attempts', type=int, default=3, metavar='N',
+                            help='1 つのファイルを試行する回数の上限（既定: 3）')
+    queue_work.add_argument('--lease', type=float, default=3600, metavar='SECONDS',
+                            help='ほかのワーカーが処理中のファイルを、止まったものとみなして引き継ぐまでの秒数'
+                                 '（既定: 3600。ホスト間の時計のずれより十分に長くする）')
+    queue_work.add_argument('--poll', type=float, default=5.0, metavar='SECONDS',
+                            help='ほかのワーカーの処理中のファイルしか残っていない場合に、引き継げるように'
+                                 'なるのを待つ間隔（既定: 5。0 の場合は待たずに終わる）')
+    queue_work.set_defaults(func=run_queue_work, entry='queue-work')
+
+    queue_status = queue_commands.add_parser(
+        'status', parents=[common_parent, queue_parent],
+        help='待ち行列の進み具合（実行待ち・処理中・完了・失敗の数）を表示します。',
+    )
+    queue_status.set_defaults(func=run_queue_status, entry='queue-status')
+
+    validate = subparsers.add_parser(
+        'validate', parents=[common_parent],
+        help='既存の .pptx の構造（空のプレースホルダー、はみ出し、重なり順、リレーションシップ）を検証します。',
+    )
+    validate.add_argument('input_files', nargs='+', help='検証する .pptx ファイル（問題があれば終了コード 1）')
+    validate.add_argument('--max-media', type=parse_size, metavar='SIZE',
+                          help='メディア 1 つあたりの最大バイト数（既定: 5M）')
+    validate.set_defaults(func=run_validate, entry='validate')
+
+    serve = subparsers.add_parser('serve', help='プレゼンテーション変換サーバーを起動します。')
+    add_server_arguments(serve)
+    serve.set_defaults(func=None, entry=None)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        from .server import run_server
+        run_server(args)
+        return
+
+    if args.build_date is not None:
+        reproducible.set_build_time(args.build_date)
+    elif args.reproducible:
+        reproducible.enable()
+
+    profiling.start_from_args(args.entry, args)
+    try:
+        output_files = args.func(args)
+        if args.compact:
+            compact_files(output_files)
+        if args.validate and not validate_files(output_files):
+            args.failed = True
+    except FileNotFoundError as e:
+        print(f"エラー: ファイル '{e.filename}' が見つかりません。")
+        args.failed = True
+    except Exception as e:
+        print(f"エラー: {e}")
+        args.failed = True
+    finally:
+        profiling.stop()
+    if args.failed:
+        # バッチやキューはスケジューラーから実行されるため、失敗を終了コードで知らせる
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
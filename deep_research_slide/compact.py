@@ -0,0 +1,286 @@
+"""
+作成したプレゼンテーションから使われていないパーツを取り除く
+
+python-pptx の既定のテンプレートには 11 種類のスライドレイアウトが入っていますが、
+このパッケージのデッキが使うのはタイトルスライドとタイトルと内容のレイアウトだけです。
+このモジュールは .pptx（zip）をパーツの単位で読み、次の整理をして書き直します。
+
+1. どのスライドからも使われていないスライドレイアウトをマスターから外す
+2. ノートのスライドがなければノートマスターを外す
+3. 内容が同じメディア（画像など）を 1 つにまとめる
+4. どこからも参照されなくなったパーツ（レイアウト、テーマ、メディアなど）を削除する
+
+使用例:
+    python -m deep_research_slide compact deck.pptx
+    python -m deep_research_slide research research.txt --compact
+"""
+import hashlib
+import os
+import posixpath
+import shutil
+import tempfile
+import zipfile
+
+from . import profiling
+
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+OFFICE_DOCUMENT_REL_TYPE = R_NS + "/officeDocument"
+SLIDE_REL_TYPE = R_NS + "/slide"
+SLIDE_MASTER_REL_TYPE = R_NS + "/slideMaster"
+SLIDE_LAYOUT_REL_TYPE = R_NS + "/slideLayout"
+NOTES_MASTER_REL_TYPE = R_NS + "/notesMaster"
+NOTES_SLIDE_REL_TYPE = R_NS + "/notesSlide"
+
+CONTENT_TYPES = "[Content_Types].xml"
+MEDIA_DIR = "ppt/media/"
+
+
+def rels_name(source):
+    """パーツのリレーションシップのパーツ名を返す（パッケージ自体は ""）"""
+    directory, name = posixpath.split(source)
+    return posixpath.join(directory, "_rels", name + ".rels")
+
+
+def resolve(source, target):
+    """リレーションシップの Target をパーツ名にする"""
+    if target.startswith("/"):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source), target))
+
+
+def _parse(data):
+    from lxml import etree
+    return etree.fromstring(data)
+
+
+def _serialize(element):
+    from lxml import etree
+    return etree.tostring(element, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+class _Package:
+    """パーツとリレーションシップを読み書きするための、zip の中身の簡単なモデル"""
+
+    def __init__(self, parts):
+        self.parts = parts
+        self.elements = {}
+
+    def element(self, name):
+        """パーツの XML を返す（変更するとそのパーツは書き直される）"""
+        if name not in self.elements:
+            self.elements[name] = _parse(self.parts[name])
+        return self.elements[name]
+
+    def relationships(self, source):
+        """パーツのリレーションシップの要素のリスト（外部へのリンクを除く）"""
+        name = rels_name(source)
+        if name not in self.parts:
+            return []
+        return [rel for rel in self.element(name) if rel.get("TargetMode") != "External"]
+
+    def targets(self, source, rel_type):
+        """指定した種類のリレーションシップの参照先のパーツ名のリスト"""
+        return [resolve(source, rel.get("Target")) for rel in self.relationships(source)
+                if rel.get("Type") == rel_type]
+
+    def remove_relationships(self, source, predicate):
+        """条件に合うリレーションシップを削除し、削除した rId のセットを返す"""
+        removed = set()
+        for rel in self.relationships(source):
+            if predicate(rel):
+                rel.getparent().remove(rel)
+                removed.add(rel.get("Id"))
+        return removed
+
+    def reachable(self):
+        """パッケージのリレーションシップからたどれるパーツ名のセット"""
+        seen = set()
+        stack = [""]
+        while stack:
+            source = stack.pop()
+            for rel in self.relationships(source):
+                target = resolve(source, rel.get("Target"))
+                if target not in seen and target in self.parts:
+                    seen.add(target)
+                    stack.append(target)
+        return seen
+
+    def serialized(self):
+        """変更した XML を書き戻したパーツの辞書を返す"""
+        for name, element in self.elements.items():
+            self.parts[name] = _serialize(element)
+        return self.parts
+
+
+def prune_layouts(package, presentation):
+    """
+    どのスライドからも使われていないスライドレイアウトをマスターから外す
+
+    使っているレイアウトが 1 つもないマスターは、そのままにします。
+
+    Returns:
+        int: 外したレイアウトの数
+    """
+    used = set()
+    for slide in package.targets(presentation, SLIDE_REL_TYPE):
+        used.update(package.targets(slide, SLIDE_LAYOUT_REL_TYPE))
+
+    removed = 0
+    for master in package.targets(presentation, SLIDE_MASTER_REL_TYPE):
+        layouts = package.targets(master, SLIDE_LAYOUT_REL_TYPE)
+        if not used.intersection(layouts):
+            continue
+        ids = package.remove_relationships(
+            master, lambda rel: rel.get("Type") == SLIDE_LAYOUT_REL_TYPE
+            and resolve(master, rel.get("Target")) not in used
+        )
+        for layout_id in package.element(master).iter(f"{{{P_NS}}}sldLayoutId"):
+            if layout_id.get(f"{{{R_NS}}}id") in ids:
+                layout_id.getparent().remove(layout_id)
+        removed += len(ids)
+    return removed
+
+
+def prune_notes_master(package, presentation):
+    """
+    ノートのスライドがなければ、ノートマスターをプレゼンテーションから外す
+
+    Returns:
+        bool: 外した場合は True
+    """
+    slides = package.targets(presentation, SLIDE_REL_TYPE)
+    if any(package.targets(slide, NOTES_SLIDE_REL_TYPE) for slide in slides):
+        return False
+    if not package.targets(presentation, NOTES_MASTER_REL_TYPE):
+        return False
+    package.remove_relationships(presentation, lambda rel: rel.get("Type") == NOTES_MASTER_REL_TYPE)
+    for element in package.element(presentation).findall(f"{{{P_NS}}}notesMasterIdLst"):
+        element.getparent().remove(element)
+    return True
+
+
+def dedupe_media(package):
+    """
+    内容が同じメディアを 1 つにまとめ、リレーションシップの参照先を付け替える
+
+    Returns:
+        int: まとめた（参照されなくなった）メディアの数
+    """
+    canonical = {}
+    duplicates = {}
+    for name, data in package.parts.items():
+        if name.startswith(MEDIA_DIR):
+            digest = hashlib.sha1(data).hexdigest()
+            if digest in canonical:
+                duplicates[name] = canonical[digest]
+            else:
+                canonical[digest] = name
+    if not duplicates:
+        return 0
+
+    for name in list(package.parts):
+        if not name.endswith(".rels"):
+            continue
+        source = _rels_source(name)
+        for rel in package.relationships(source):
+            target = resolve(source, rel.get("Target"))
+            if target in duplicates:
+                rel.set("Target", posixpath.relpath(duplicates[target], posixpath.dirname(source) or "."))
+    return len(duplicates)
+
+
+def _rels_source(name):
+    """リレーションシップのパーツ名から、元のパーツ名を返す"""
+    directory, base = posixpath.split(name)
+    return posixpath.join(posixpath.dirname(directory), base[:-len(".rels")])
+
+
+def compact_parts(parts):
+    """
+    パーツの辞書から使われていないパーツを取り除く
+
+    Args:
+        parts (dict): パーツ名 -> 内容のバイト列（zip の格納順）
+
+    Returns:
+        tuple: (整理したパーツの辞書, 整理の内容の辞書)
+    """
+    package = _Package(dict(parts))
+    presentation = package.targets("", OFFICE_DOCUMENT_REL_TYPE)[0]
+
+    layouts = prune_layouts(package, presentation)
+    notes_master = prune_notes_master(package, presentation)
+    media = dedupe_media(package)
+
+    # 参照されているパーツと、そのリレーションシップだけを残す
+    keep = package.reachable()
+    keep.add(CONTENT_TYPES)
+    keep.update([rels_name(name) for name in keep] + [rels_name("")])
+    removed = [name for name in package.parts if name not in keep]
+    for name in removed:
+        del package.parts[name]
+        package.elements.pop(name, None)
+
+    content_types = package.element(CONTENT_TYPES)
+    for override in content_types.findall(f"{{{CT_NS}}}Override"):
+        if override.get("PartName")[1:] not in package.parts:
+            content_types.remove(override)
+
+    stats = {
+        "parts_before": len(parts),
+        "parts_after": len(package.parts),
+        "layouts_removed": layouts,
+        "notes_master_removed": notes_master,
+        "media_deduplicated": media,
+    }
+    return package.serialized(), stats
+
+
+def compact_presentation(input_file, output_file=None, workers=None):
+    """
+    .pptx ファイルから使われていないレイアウトやパーツを取り除いて保存する
+
+    Args:
+        input_file (str): 整理する .pptx ファイル名
+        output_file (str): 出力するファイル名（None の場合は input_file を置き換える）
+        workers (int): 圧縮に使うスレッド数（None の場合は CPU 数）
+
+    Returns:
+        dict: 整理の内容（パーツ数、ファイルサイズ、外したレイアウトの数など）
+    """
+    from .zipwriter import ParallelZipWriter
+
+    output_file = output_file or input_file
+    with profiling.phase("compact"):
+        bytes_before = os.path.getsize(input_file)
+        with zipfile.ZipFile(input_file) as zf:
+            parts = {info.filename: zf.read(info) for info in zf.infolist()}
+        parts, stats = compact_parts(parts)
+
+        # 書き込みに失敗しても元のファイルが壊れないよう、一時ファイルに書いてから置き換える
+        directory = os.path.dirname(os.path.abspath(output_file))
+        fd, temp_path = tempfile.mkstemp(suffix=".pptx", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f, ParallelZipWriter(f, workers) as writer:
+                for name, data in parts.items():
+                    writer.writestr(name, data)
+            shutil.copymode(input_file, temp_path)
+            os.replace(temp_path, output_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    stats["bytes_before"] = bytes_before
+    stats["bytes_after"] = os.path.getsize(output_file)
+    return stats
+
+
+def describe(output_file, stats):
+    """整理の内容を 1 行の説明にする"""
+    return (f"{output_file} を整理しました: {stats['parts_before']} → {stats['parts_after']} パーツ、"
+            f"{stats['bytes_before'] / 1024:.1f} KB → {stats['bytes_after'] / 1024:.1f} KB"
+            f"（レイアウト {stats['layouts_removed']} 個を削除、"
+            f"重複したメディア {stats['media_deduplicated']} 個を統合）")
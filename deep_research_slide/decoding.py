@@ -0,0 +1,246 @@
+"""
+入力テキストの文字コードの判定とデコード
+
+日本語のツールが書き出すテキストは UTF-8 とは限らず、Shift_JIS（CP932）や EUC-JP、
+BOM 付きの UTF-16 のこともあります。このモジュールはファイルの先頭（SNIFF_BYTES バイト）
+だけを見て文字コードを判定し、残りは一定の大きさのブロックごとに逐次デコードします。
+判定にかかる時間はファイルの大きさによらず一定です。
+
+デコードと同時に改行（\\r\\n, \\r）を \\n にそろえ、Unicode の NFKC 正規化（全角英数字を
+半角に、半角カナを全角にするなど）を行います。段落の分割や見出しの判定は、この正規化した
+テキストに対して行われます。
+
+ファイルはメモリーマップで開き、ブロックはマップの memoryview のスライスとしてデコーダーに
+渡すため、バイト列のコピーを作りません（パイプなどマップできないものは通常どおり読み込みます）。
+
+使用例:
+    text = read_text("research_sjis.txt")
+    text = read_text("research.txt", encoding="cp932", normalize=False)
+"""
+import codecs
+import mmap
+import unicodedata
+
+# 文字コードの判定に使う先頭のバイト数と、デコードするブロックのバイト数
+SNIFF_BYTES = 64 * 1024
+CHUNK_BYTES = 1024 * 1024
+
+# BOM と文字コード（UTF-32 LE の BOM は UTF-16 LE の BOM で始まるため、長いものから調べる）
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+# UTF-8 として読めない場合に試す日本語の文字コード（先にあるものを優先する）
+JAPANESE_ENCODINGS = ("cp932", "euc_jp")
+
+# BOM のない UTF-16 とみなす、NUL の位置の偏り（偶数・奇数の位置の NUL の数の比）
+UTF16_NUL_SKEW = 4
+
+
+def detect_bom(prefix):
+    """
+    BOM から文字コードを判定する
+
+    Returns:
+        tuple: (文字コード, BOM のバイト数)。BOM がない場合は (None, 0)
+    """
+    for bom, encoding in BOMS:
+        if prefix.startswith(bom):
+            return encoding, len(bom)
+    return None, 0
+
+
+def _decode_prefix(prefix, encoding, complete):
+    """先頭のバイト列をデコードする（途中で切れた最後の文字は無視する）。読めない場合は None"""
+    try:
+        return codecs.getincrementaldecoder(encoding)().decode(prefix, complete)
+    except UnicodeDecodeError:
+        return None
+
+
+def _halfwidth_kana(text):
+    """半角カナの数（CP932 と EUC-JP のどちらでも読める場合に、文字化けの少ない方を選ぶのに使う）"""
+    return sum(1 for char in text if '\uff61' <= char <= '\uff9f')
+
+
+def detect_encoding(prefix, complete=False):
+    """
+    ファイルの先頭のバイト列から文字コードを判定する
+
+    BOM、BOM のない UTF-16（NUL の位置の偏り）、UTF-8、日本語の文字コード
+    （JAPANESE_ENCODINGS）の順に調べます。
+
+    Args:
+        prefix (bytes): ファイルの先頭のバイト列
+        complete (bool): prefix がファイル全体かどうか（False の場合は最後の文字が途中で切れていてもよい）
+
+    Returns:
+        tuple: (文字コード, BOM のバイト数)
+
+    Raises:
+        ValueError: どの文字コードでも読めない場合
+    """
+    encoding, bom = detect_bom(prefix)
+    if encoding is not None:
+        return encoding, bom
+
+    # テキストに NUL はまず現れないため、NUL があれば BOM のない UTF-16 を疑う
+    # （ASCII の文字の上位バイトが 0 になるので、NUL が偶数・奇数のどちらの位置に偏るかで判定する）
+    even, odd = prefix[0::2].count(0), prefix[1::2].count(0)
+    if max(even, odd) > UTF16_NUL_SKEW * min(even, odd):
+        encoding = "utf-16-le" if odd > even else "utf-16-be"
+        if _decode_prefix(prefix, encoding, complete) is not None:
+            return encoding, 0
+
+    if _decode_prefix(prefix, "utf-8", complete) is not None:
+        return "utf-8", 0
+
+    candidates = []
+    for order, encoding in enumerate(JAPANESE_ENCODINGS):
+        text = _decode_prefix(prefix, encoding, complete)
+        if text is not None:
+            candidates.append((_halfwidth_kana(text), order, encoding))
+    if not candidates:
+        raise ValueError("入力の文字コードを判定できません（UTF-8、UTF-16、Shift_JIS、EUC-JP のいずれでもありません）。"
+                         "--encoding で指定してください")
+    return min(candidates)[2], 0
+
+
+def iter_text(stream, encoding=None, normalize=True, chunk_size=CHUNK_BYTES):
+    """
+    バイナリのストリームを逐次デコードし、改行と NFKC を正規化したテキストを返す
+
+    改行（\\r\\n）や NFKC の合成がブロックの境目をまたがないよう、各ブロックの最後の
+    改行より後ろは次のブロックと合わせて処理します。
+
+    Args:
+        stream: バイナリモードで開いたファイルオブジェクト
+        encoding (str): 文字コード（None の場合は先頭から判定する）
+        normalize (bool): NFKC 正規化を行うかどうか（改行は常にそろえる）
+        chunk_size (int): 1 回に読み込むバイト数
+
+    Yields:
+        str: 正規化したテキスト（改行の位置で区切ったかたまり）
+    """
+    data = stream.read(SNIFF_BYTES)
+    if encoding is None:
+        try:
+            encoding, bom = detect_encoding(bytes(data), complete=len(data) < SNIFF_BYTES)
+        except ValueError:
+            # トレースバックに残るフレームからマップのスライスを手放す（残っていると mmap を閉じられない）
+            data = None
+            raise
+        data = data[bom:]
+    decoder = codecs.getincrementaldecoder(encoding)()
+
+    offset = 0
+    pending = ''
+    first = True
+    while True:
+        final = not data
+        try:
+            text = pending + decoder.decode(data, final)
+        except UnicodeDecodeError as e:
+            failed_at = offset + e.start
+        else:
+            failed_at = None
+        if failed_at is not None:
+            # 元の例外（とマップのスライス）をトレースバックに残さないよう、except の外で送出する
+            data = None
+            raise ValueError(f"入力を {encoding} としてデコードできません（{failed_at} バイト目付近）。"
+                             "--encoding で文字コードを指定してください")
+        offset += len(data)
+        if first and text:
+            # 文字コードを指定した場合や UTF-16 などでは BOM が文字として残る
+            text = text[1:] if text[0] == '\ufeff' else text
+            first = False
+
+        pending = ''
+        if not final:
+            # \r\n が境目をまたぐ場合に備えて、最後の \r は次のブロックに回す
+            if text.endswith('\r'):
+                text, pending = text[:-1], '\r'
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if not final:
+            cut = text.rfind('\n') + 1
+            text, pending = text[:cut], text[cut:] + pending
+
+        if normalize:
+            text = unicodedata.normalize('NFKC', text)
+        if text:
+            yield text
+        if final:
+            return
+        data = stream.read(chunk_size)
+
+
+class BufferReader:
+    """
+    バイト列（bytes、mmap など）をファイルオブジェクトのように読む（read はコピーを作らず memoryview のスライスを返す）
+
+    Args:
+        data: バッファープロトコルに対応したバイト列
+    """
+
+    def __init__(self, data):
+        self.view = memoryview(data)
+        self.position = 0
+
+    def read(self, size):
+        chunk = self.view[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+    def close(self):
+        """memoryview を解放する（mmap を閉じる前に呼ぶ）"""
+        self.view.release()
+
+
+def read_text(path, encoding=None, normalize=True):
+    """
+    テキストファイルを文字コードを判定して読み込む
+
+    Args:
+        path (str): ファイル名
+        encoding (str): 文字コード（None の場合は判定する）
+        normalize (bool): NFKC 正規化を行うかどうか
+
+    Returns:
+        str: 正規化したテキスト
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # 空のファイルやパイプはマップできない
+            return ''.join(iter_text(f, encoding, normalize))
+        with mapped:
+            return decode_text(mapped, encoding, normalize)
+
+
+def decode_text(data, encoding=None, normalize=True):
+    """
+    バイト列を read_text と同じように判定・デコード・正規化する
+
+    Args:
+        data: バイト列（bytes、mmap など。コピーせずに読む）
+        encoding (str): 文字コード（None の場合は判定する）
+        normalize (bool): NFKC 正規化を行うかどうか
+
+    Returns:
+        str: 正規化したテキスト
+    """
+    reader = BufferReader(data)
+    try:
+        chunks = iter_text(reader, encoding, normalize)
+        text = ''.join(chunks)
+        # ジェネレーターが持つスライスを手放してから memoryview を解放する
+        chunks.close()
+        del chunks
+    finally:
+        reader.close()
+    return text
@@ -0,0 +1,239 @@
+"""
+セクションと文の重複（ほぼ同じ内容の繰り返し）を取り除く
+
+DeepResearch の結果は、同じ事実（市場規模の数字など）を前置き・各セクション・まとめで
+何度も繰り返します。このモジュールは本文の文（行を要約と同じ区切りで分けたもの）を
+文字の n-gram（日本語は 1 文字、英数字は 1 単語を 1 トークンとする）の集合とみなし、
+MinHash の署名と LSH（署名をいくつかの帯に分けたバケット）で、似た文の候補を
+全組み合わせを比べずに見つけます。同じ事実は言い回しを変えた長い段落の中で
+繰り返されることが多いため、行全体ではなく文ごとに比べます。
+候補は署名から推定した Jaccard 係数がしきい値以上の場合だけ重複とみなします。
+
+署名は 1 回のハッシュで作る one permutation hashing（ハッシュ値の上位ビットでビンに
+振り分け、ビンごとの最小値を取る）を使うため、処理時間は入力の長さにほぼ比例します。
+"""
+import re
+import zlib
+
+from .parsing import Section
+from .summarize import SENTENCE_PATTERN
+
+# 署名の長さ（ビンの数）と、LSH の帯の数（帯あたりの行数は SIGNATURE_SIZE // BANDS）。
+# 32 ビン・8 帯では、Jaccard 係数がおよそ 0.6 以上の組が候補になる
+SIGNATURE_SIZE = 32
+BANDS = 8
+BIN_BITS = 5  # 2 ** BIN_BITS == SIGNATURE_SIZE
+
+# 1 つの shingle に含めるトークン数と、重複を調べる最小の shingle 数（短い文や見出しは調べない）
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 8
+
+# 既定のしきい値（推定した Jaccard 係数がこれ以上なら重複とみなす）
+DEFAULT_THRESHOLD = 0.8
+
+# 重複したセクションの扱い（"drop": 取り除く、"fold": 先に出てきたセクションにまとめる）
+MODES = ("drop", "fold")
+
+# 英数字の単語、または ASCII 以外の文字（日本語の 1 文字）。記号や空白は無視する
+TOKEN_PATTERN = re.compile(r'[0-9a-z]+|[^\x00-\x7f\W]')
+
+# 箇条書きの記号（行の最初の文を取り除いても、残りの文に付け直す）
+BULLET_PATTERN = re.compile(r'\s*(?:[-*•]|\d+\.)\s+')
+
+MASK64 = (1 << 64) - 1
+VALUE_MASK = (1 << (64 - BIN_BITS)) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """
+    テキストを正規化し、トークンの n-gram の集合にする
+
+    Args:
+        text (str): テキスト
+        size (int): 1 つの shingle に含めるトークン数
+
+    Returns:
+        set: shingle（トークンを連結した文字列）の集合
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def split_sentences(line):
+    """
+    行を文に分ける（区切りの空白は前の文に含めるため、つなげると元の行に戻る）
+
+    Args:
+        line (str): 本文の行
+
+    Returns:
+        list: 文のリスト
+    """
+    sentences = []
+    start = 0
+    for match in SENTENCE_PATTERN.finditer(line):
+        if match.start() > start:
+            sentences.append(line[start:match.end()])
+            start = match.end()
+    if start < len(line):
+        sentences.append(line[start:])
+    return sentences
+
+
+def signature(items):
+    """
+    shingle の集合から MinHash の署名を作る（one permutation hashing）
+
+    Args:
+        items (set): shingle の集合
+
+    Returns:
+        tuple: SIGNATURE_SIZE 個の最小値
+    """
+    mins = [None] * SIGNATURE_SIZE
+    for item in items:
+        # crc32 はプロセスによらず同じ値になるため、出力が実行ごとに変わらない
+        h = (zlib.crc32(item.encode("utf-8")) * GOLDEN) & MASK64
+        index = h >> (64 - BIN_BITS)
+        value = h & VALUE_MASK
+        if mins[index] is None or value < mins[index]:
+            mins[index] = value
+
+    # 空のビンは右隣の空でないビンの値で埋める（densification）
+    filled = [i for i, value in enumerate(mins) if value is not None]
+    if len(filled) < SIGNATURE_SIZE and filled:
+        for i in range(SIGNATURE_SIZE):
+            if mins[i] is None:
+                j = next((j for j in filled if j > i), filled[0])
+                mins[i] = mins[j] + ((j - i) % SIGNATURE_SIZE << (64 - BIN_BITS))
+    return tuple(mins)
+
+
+def similarity(a, b):
+    """2 つの署名から Jaccard 係数を推定する"""
+    return sum(x == y for x, y in zip(a, b)) / SIGNATURE_SIZE
+
+
+class NearDuplicateIndex:
+    """
+    署名を LSH のバケットに登録し、似た署名を探すインデックス
+
+    使用例:
+        index = NearDuplicateIndex(0.8)
+        if index.find(sig) is None:
+            index.add(sig, key)
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.rows = SIGNATURE_SIZE // BANDS
+        self.buckets = [{} for _ in range(BANDS)]
+        self.signatures = {}
+
+    def _bands(self, sig):
+        rows = self.rows
+        return [sig[band * rows:(band + 1) * rows] for band in range(BANDS)]
+
+    def find(self, sig):
+        """
+        登録済みの署名のうち、しきい値以上に似たものを探す
+
+        Returns:
+            登録したときのキー（見つからなければ None）
+        """
+        for bucket, band in zip(self.buckets, self._bands(sig)):
+            for key in bucket.get(band, ()):
+                if similarity(sig, self.signatures[key]) >= self.threshold:
+                    return key
+        return None
+
+    def add(self, sig, key):
+        """署名をキーとともに登録する"""
+        self.signatures[key] = sig
+        for bucket, band in zip(self.buckets, self._bands(sig)):
+            bucket.setdefault(band, []).append(key)
+
+
+def dedupe_sections(sections, threshold=DEFAULT_THRESHOLD, mode="drop"):
+    """
+    セクションの本文から、ほぼ同じ内容の文とセクションを取り除く
+
+    文は先に出てきたものを残し、後から出てきたほぼ同じ文を取り除きます（すべての文を
+    取り除いた行はなくなります）。
+    本文全体がほかのセクションとほぼ同じセクションは、mode="drop" では取り除き、
+    mode="fold" では先に出てきたセクションにまとめます（見出しを併記し、
+    重複しなかった行を後ろに加えます）。本文のないセクションはそのまま残します。
+    引用（Section.citations）は残した行に合わせて位置を付け替えます。
+
+    Args:
+        sections (list): Section のリスト
+        threshold (float): 重複とみなす Jaccard 係数（0〜1）
+        mode (str): 重複したセクションの扱い（"drop" または "fold"）
+
+    Returns:
+        tuple: (Section のリスト, {"sentences": 取り除いた文の数, "lines": なくなった行数,
+                "sections": 取り除いた・まとめたセクション数})
+    """
+    if mode not in MODES:
+        raise ValueError(f"未知の重複の扱いです: {mode}")
+
+    sentence_index = NearDuplicateIndex(threshold)
+    section_index = NearDuplicateIndex(threshold)
+    result = []
+    removed_sentences = 0
+    removed_lines = 0
+    removed_sections = 0
+    for section in sections:
+        whole = shingles('\n'.join(section.lines))
+        target = None
+        if len(whole) >= MIN_SHINGLES:
+            whole_sig = signature(whole)
+            target = section_index.find(whole_sig)
+            if target is None:
+                section_index.add(whole_sig, len(result))
+
+        if target is not None and mode == "drop":
+            # 取り除くセクションの文は登録しない（後のセクションの同じ文を重複として消さない）
+            removed_sections += 1
+            continue
+
+        lines = []
+        # kept[i]: 元の本文の i 行目より前に残した行の数（引用の位置を付け替えるのに使う）
+        kept = [0]
+        for line in section.lines:
+            sentences = split_sentences(line)
+            remaining = []
+            for sentence in sentences:
+                items = shingles(sentence)
+                if len(items) < MIN_SHINGLES:
+                    remaining.append(sentence)
+                    continue
+                sig = signature(items)
+                if sentence_index.find(sig) is not None:
+                    removed_sentences += 1
+                else:
+                    # キーは登録した文の通し番号（文ごとに異なる）
+                    sentence_index.add(sig, len(sentence_index.signatures))
+                    remaining.append(sentence)
+            if len(remaining) == len(sentences):
+                lines.append(line)
+            elif remaining:
+                bullet = BULLET_PATTERN.match(line)
+                prefix = bullet.group() if bullet and remaining[0] is not sentences[0] else ''
+                lines.append(prefix + ''.join(remaining).rstrip())
+            else:
+                removed_lines += 1
+            kept.append(len(lines))
+        citations = [(kept[anchor], citation) for anchor, citation in section.citations]
+
+        if target is None:
+            result.append(Section(section.title, lines, citations))
+            continue
+        removed_sections += 1
+        folded = result[target]
+        citations = [(len(folded.lines) + anchor, citation) for anchor, citation in citations]
+        result[target] = Section(f"{folded.title} / {section.title}", folded.lines + lines,
+                                 list(folded.citations) + citations)
+
+    return result, {"sentences": removed_sentences, "lines": removed_lines, "sections": removed_sections}
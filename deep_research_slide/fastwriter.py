@@ -0,0 +1,729 @@
+"""
+python-pptx を使わずにスライドの XML を直接書き出す高速な出力
+
+研究結果やボードゲームのデッキは、タイトルと本文のプレースホルダーに書式付きの
+ランを入れただけのスライド（と表のスライド）でできています。python-pptx でシェイプのオブジェクトと
+lxml の木を組み立てる処理が大きなデッキでは処理時間の大半を占めるため、
+このモジュールは Slide のリストからスライドの XML を文字列のテンプレートで直接作り、
+既定のテンプレート（python-pptx の default.pptx）のマスターやレイアウトは
+そのままコピーして .pptx に書き込みます。スライドは作るそばから書き込むため、
+python-pptx と違って使用メモリがデッキの長さに比例して増えません。
+
+描画結果は render.add_slide と同じ内容になります（benchmark.py --parity で確認できます）。
+"""
+import os
+import re
+import zipfile
+from collections import namedtuple
+
+from . import profiling
+from .render import SIZES, TITLE_LAYOUT, CONTENT_LAYOUT, TITLE_ONLY_LAYOUT
+from .zipwriter import ParallelZipWriter
+
+# スライドとして追加するパーツの種類
+SLIDE_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+SLIDE_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+LAYOUT_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout"
+
+# スピーカーノートのパーツの種類（ノートのあるスライドがある場合だけ追加する）
+NOTES_SLIDE_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.notesSlide+xml"
+NOTES_MASTER_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.notesMaster+xml"
+THEME_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.theme+xml"
+NOTES_SLIDE_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide"
+NOTES_MASTER_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesMaster"
+THEME_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/theme"
+NOTES_MASTER = "ppt/notesMasters/notesMaster1.xml"
+NOTES_THEME = "ppt/theme/theme2.xml"
+
+XML_DECLARATION = "<?xml version='1.0' encoding='UTF-8' standalone='yes'?>\n"
+
+NAMESPACES = (
+    ' xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    ' xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"'
+    ' xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+
+SLIDE_HEAD = (
+    XML_DECLARATION
+    + '<p:sld' + NAMESPACES + '>'
+    '<p:cSld><p:spTree><p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr/>'
+)
+SLIDE_TAIL = '</p:spTree></p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>'
+
+PLACEHOLDER_HEAD = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="{name}"/><p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+    '<p:nvPr>{ph}</p:nvPr></p:nvSpPr><p:spPr/><p:txBody><a:bodyPr/><a:lstStyle/>'
+)
+PLACEHOLDER_TAIL = '</p:txBody></p:sp>'
+
+# render.add_background（暗いテーマの背景）と同じ矩形
+BACKGROUND = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="Rectangle {index}"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="9144000" cy="6858000"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>{fill}<a:ln><a:noFill/></a:ln><a:effectLst/></p:spPr>'
+    '<p:style><a:lnRef idx="1"><a:schemeClr val="accent1"/></a:lnRef>'
+    '<a:fillRef idx="3"><a:schemeClr val="accent1"/></a:fillRef>'
+    '<a:effectRef idx="2"><a:schemeClr val="accent1"/></a:effectRef>'
+    '<a:fontRef idx="minor"><a:schemeClr val="lt1"/></a:fontRef></p:style>'
+    '<p:txBody><a:bodyPr rtlCol="0" anchor="ctr"/><a:lstStyle/><a:p><a:pPr algn="ctr"/></a:p></p:txBody></p:sp>'
+)
+
+# render.add_date（タイトルスライドの日付）と同じテキストボックス
+# シェイプの ID は暗いテーマの背景の有無で変わるため、テーマを当てるときに決める
+DATE_BOX_ID = '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="TextBox {index}"/>'
+DATE_BOX_HEAD = (
+    '<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="457200" y="4572000"/><a:ext cx="8229600" cy="457200"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="none"><a:spAutoFit/></a:bodyPr><a:lstStyle/><a:p/>'
+    '<a:p><a:pPr algn="r"/>'
+)
+DATE_BOX_TAIL = '</a:p></p:txBody></p:sp>'
+
+# 表（render.add_table でも同じ XML を使う）。位置と幅は本文のプレースホルダーと同じ
+TABLE_FRAME_ID = '<p:graphicFrame><p:nvGraphicFramePr><p:cNvPr id="{id}" name="Table {index}"/>'
+TABLE_FRAME_HEAD = (
+    '<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr><p:nvPr/></p:nvGraphicFramePr>'
+    '<p:xfrm><a:off x="457200" y="1600200"/><a:ext cx="{width}" cy="{height}"/></p:xfrm>'
+    '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table"><a:tbl>'
+    '<a:tblPr firstRow="1" bandRow="1"><a:tableStyleId>{{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}}</a:tableStyleId>'
+    '</a:tblPr><a:tblGrid>{grid}</a:tblGrid>'
+)
+TABLE_FRAME_TAIL = '</a:tbl></a:graphicData></a:graphic></p:graphicFrame>'
+CELL_HEAD = '<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>'
+TABLE_WIDTH = 8229600
+ROW_HEIGHT = 342900
+
+# 列の幅の計算に使う、セルの表示幅（全角は 2）の範囲
+MIN_COLUMN_WIDTH = 4
+MAX_COLUMN_WIDTH = 40
+
+SLIDE_RELS = (
+    XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="' + LAYOUT_REL_TYPE + '" Target="../slideLayouts/slideLayout{layout}.xml"/>'
+    '{links}</Relationships>'
+)
+SLIDE_LINK_REL = '<Relationship Id="rId{id}" Type="' + SLIDE_REL_TYPE + '" Target="slide{target}.xml"/>'
+SLIDE_NOTES_REL = (
+    '<Relationship Id="rId2" Type="' + NOTES_SLIDE_REL_TYPE + '" Target="../notesSlides/notesSlide{number}.xml"/>'
+)
+
+# python-pptx の slide.notes_slide が作るノートのスライドと同じ内容
+NOTES_HEAD = (
+    XML_DECLARATION
+    + '<p:notes' + NAMESPACES + '><p:cSld><p:spTree>'
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/><a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/>'
+    '</a:xfrm></p:grpSpPr>'
+    '<p:sp><p:nvSpPr><p:cNvPr id="2" name="Slide Image Placeholder 1"/><p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+    '<p:nvPr><p:ph type="sldImg" idx="2"/></p:nvPr></p:nvSpPr><p:spPr/></p:sp>'
+    '<p:sp><p:nvSpPr><p:cNvPr id="3" name="Notes Placeholder 2"/><p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+    '<p:nvPr><p:ph type="body" idx="3" sz="quarter"/></p:nvPr></p:nvSpPr><p:spPr/><p:txBody><a:bodyPr/><a:lstStyle/>'
+)
+NOTES_TAIL = (
+    '</p:txBody></p:sp>'
+    '<p:sp><p:nvSpPr><p:cNvPr id="4" name="Slide Number Placeholder 3"/><p:cNvSpPr><a:spLocks noGrp="1"/>'
+    '</p:cNvSpPr><p:nvPr><p:ph type="sldNum" idx="5" sz="quarter"/></p:nvPr></p:nvSpPr><p:spPr/></p:sp>'
+    '</p:spTree></p:cSld><p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:notes>'
+)
+NOTES_RELS = (
+    XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="' + NOTES_MASTER_REL_TYPE + '" Target="../notesMasters/notesMaster1.xml"/>'
+    '<Relationship Id="rId2" Type="' + SLIDE_REL_TYPE + '" Target="../slides/slide{slide}.xml"/>'
+    '</Relationships>'
+)
+NOTES_MASTER_RELS = (
+    XML_DECLARATION
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="' + THEME_REL_TYPE + '" Target="../theme/theme2.xml"/>'
+    '</Relationships>'
+)
+
+# 目次の項目からスライドへのジャンプ（render.add_links と同じ）。a:rPr の中に書く
+SLIDE_JUMP = '<a:hlinkClick r:id="rId{id}" action="ppaction://hlinksldjump"/></a:rPr>'
+
+# compile_slide が残す、テーマによって変わる部分のスロット
+# （タイトルの書式, 本文の書式, 日付の書式, 暗いテーマの背景, 日付のテキストボックスの ID,
+#   リンクを付ける本文の書式（a:rPr の閉じタグなし）, 表のシェイプの ID,
+#   表の見出しのセルの書式, 見出しのセルの塗りつぶし, データのセルの書式, データのセルの塗りつぶし）
+(TITLE_STYLE, BODY_STYLE, DATE_STYLE, BACKGROUND_SLOT, DATE_BOX_SLOT, BODY_LINK_STYLE, TABLE_FRAME_SLOT,
+ HEADER_CELL_STYLE, HEADER_CELL_FILL, CELL_STYLE, CELL_FILL) = range(11)
+
+# テーマを当てる前のスライド（segments は文字列とスロットの番号の並び、layout はレイアウトの番号、
+# shapes は背景を除いたシェイプ数、links は順に割り当てたリンク先のスライド番号（ノートがある場合は
+# rId3 から、ない場合は rId2 から）、notes はノートのスライドの XML（ノートがない場合は None））
+CompiledSlide = namedtuple("CompiledSlide", "title kind segments layout runs shapes links notes")
+
+# プレースホルダーの種類（スライドの種類ごとに、タイトルと本文）
+TITLE_PLACEHOLDERS = (("Title 1", '<p:ph type="ctrTitle"/>'), ("Subtitle 2", '<p:ph type="subTitle" idx="1"/>'))
+CONTENT_PLACEHOLDERS = (("Title 1", '<p:ph type="title"/>'), ("Content Placeholder 2", '<p:ph idx="1"/>'))
+
+# python-pptx と同じく、XML に書けない制御文字は _xHHHH_ の形式にする
+CONTROL_CHAR_PATTERN = re.compile('[\x00-\x08\x0c\x0e-\x1f\r]')
+ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# スライドの一覧を持つため、すべてのスライドを書き込んだ後に書き込むパーツ
+MANIFESTS = ("ppt/presentation.xml", "ppt/_rels/presentation.xml.rels", "[Content_Types].xml")
+
+# 既定のテンプレートのパーツと、ノートマスターのパーツ（最初に使うときに読み込む）
+_template = None
+_notes_master = None
+
+# テンプレートのパーツとスライドのリレーションシップの圧縮結果。どの出力でも同じ内容のため、
+# プロセス内のすべての出力で使い回す（ParallelZipWriter の cache）
+_compressed_parts = {}
+
+
+def template_path():
+    """python-pptx の既定のテンプレートのパスを返す（python-pptx 自体は読み込まない）"""
+    import importlib.util
+    spec = importlib.util.find_spec("pptx")
+    if spec is None:
+        raise RuntimeError("python-pptx がインストールされていません")
+    return os.path.join(spec.submodule_search_locations[0], "templates", "default.pptx")
+
+
+def load_template():
+    """
+    既定のテンプレートのパーツを読み込む。結果はプロセス内で使い回す
+
+    Returns:
+        list: (パーツ名, 内容のバイト列) のリスト（テンプレートの格納順）
+    """
+    global _template
+    if _template is None:
+        with zipfile.ZipFile(template_path()) as zf:
+            _template = [(info.filename, zf.read(info)) for info in zf.infolist()]
+    return _template
+
+
+def notes_master_parts():
+    """
+    python-pptx が最初のノートを作るときに追加するノートマスターとそのテーマのパーツを返す
+
+    python-pptx と同じく、パッケージのテンプレート（notesMaster.xml, theme.xml）の空白を
+    取り除いて書き出します。結果はプロセス内で使い回します。
+
+    Returns:
+        list: (パーツ名, 内容のバイト列) のリスト
+    """
+    global _notes_master
+    if _notes_master is None:
+        from lxml import etree
+        parser = etree.XMLParser(remove_blank_text=True, resolve_entities=False)
+        directory = os.path.dirname(template_path())
+
+        def load(name):
+            with open(os.path.join(directory, name), "rb") as f:
+                element = etree.fromstring(f.read(), parser)
+            return etree.tostring(element, encoding="UTF-8", standalone=True)
+
+        _notes_master = [
+            (NOTES_MASTER, load("notesMaster.xml")),
+            ("ppt/notesMasters/_rels/notesMaster1.xml.rels", NOTES_MASTER_RELS.encode("utf-8")),
+            (NOTES_THEME, load("theme.xml")),
+        ]
+    return _notes_master
+
+
+def escape_text(text):
+    """テキストを a:t 要素の内容として書ける形にする"""
+    text = text.translate(ESCAPES)
+    return CONTROL_CHAR_PATTERN.sub(lambda m: f"_x{ord(m.group()):04X}_", text)
+
+
+def run_properties(color, size, bold=None, italic=None, open_only=False):
+    """
+    a:rPr 要素を作る（属性の並びは python-pptx と同じ）
+
+    open_only=True の場合は閉じタグを付けず、後ろに a:hlinkClick などの子要素を続けられるようにします。
+    """
+    attrs = f' sz="{size * 100}"'
+    if bold is not None:
+        attrs += f' b="{int(bold)}"'
+    if italic is not None:
+        attrs += f' i="{int(italic)}"'
+    fill = '' if color is None else f'<a:solidFill><a:srgbClr val="{color_hex(color)}"/></a:solidFill>'
+    if open_only:
+        return f'<a:rPr{attrs}>{fill}'
+    if not fill:
+        return f'<a:rPr{attrs}/>'
+    return f'<a:rPr{attrs}>{fill}</a:rPr>'
+
+
+def color_hex(color):
+    """(R, G, B) のタプルを "RRGGBB" に変換する"""
+    return "%02X%02X%02X" % tuple(color)
+
+
+def paragraph_runs(text, style, link_id=None):
+    """
+    1 段落分のランを作る。垂直タブは python-pptx と同じく改行（a:br）にする
+
+    Args:
+        text (str): 段落のテキスト
+        style (int): ランの書式を差し込むスロット（TITLE_STYLE など）
+        link_id (int): ランに付けるスライドへのリンクの rId の番号（None の場合はリンクなし。
+            本文の段落だけに使い、書式は BODY_LINK_STYLE になる）
+
+    Returns:
+        tuple: (セグメントのリスト, ランの数)
+    """
+    segments = []
+    runs = 0
+    for i, segment in enumerate(text.split('\v')):
+        if i:
+            segments.append('<a:br/>')
+        if not segment:
+            continue
+        if link_id is None:
+            segments += ['<a:r>', style, f'<a:t>{escape_text(segment)}</a:t></a:r>']
+        else:
+            segments += ['<a:r>', BODY_LINK_STYLE,
+                         SLIDE_JUMP.format(id=link_id) + f'<a:t>{escape_text(segment)}</a:t></a:r>']
+        runs += 1
+    return segments, runs
+
+
+def text_body(lines, style, link_ids=None):
+    """
+    行のリストを段落のセグメントにする
+
+    Args:
+        lines (list): 段落のテキストのリスト
+        style (int): ランの書式を差し込むスロット
+        link_ids (list): 段落ごとのリンクの rId の番号（None の段落はリンクなし）
+
+    Returns:
+        tuple: (セグメントのリスト, ランの数)
+    """
+    segments = []
+    runs = 0
+    for i, line in enumerate(lines):
+        link_id = link_ids[i] if link_ids and i < len(link_ids) else None
+        paragraph, count = paragraph_runs(line, style, link_id)
+        if paragraph:
+            segments.append('<a:p>')
+            segments += paragraph
+            segments.append('</a:p>')
+        else:
+            segments.append('<a:p/>')
+        runs += count
+    return segments, runs
+
+
+def compile_slide(spec):
+    """
+    Slide の内容から、テーマによらないスライドの XML を組み立てる
+
+    文字のエスケープや段落の組み立てはここで済ませ、色や文字サイズなどテーマによって
+    変わる部分はスロット（TITLE_STYLE など）として残します。同じデッキを複数のテーマで
+    出力する場合は、この結果を使い回して render_slide でテーマを当てるだけで済みます。
+
+    Args:
+        spec (Slide): スライドの内容
+
+    Returns:
+        CompiledSlide: テーマを当てる前のスライド
+    """
+    if spec.kind == "table":
+        return _compile_table_slide(spec)
+
+    is_title = spec.kind == "title"
+    (title_name, title_ph), (body_name, body_ph) = TITLE_PLACEHOLDERS if is_title else CONTENT_PLACEHOLDERS
+
+    title_body, title_runs = text_body(spec.title.split('\n'), TITLE_STYLE)
+    body_lines = spec.lines[0].split('\n') if is_title else '\n'.join(spec.lines).split('\n')
+
+    # リンク先のスライドには、python-pptx と同じく最初に出てきた順に rId を割り当てる
+    # （ノートのリレーションシップはスライドを追加したときに、リンクは最後に作られる）
+    first_link_id = 3 if spec.notes else 2
+    links = []
+    link_ids = None
+    if spec.links and not is_title:
+        link_ids = []
+        for target in spec.links:
+            if target is not None and target not in links:
+                links.append(target)
+            link_ids.append(None if target is None else links.index(target) + first_link_id)
+    body, body_runs = text_body(body_lines, BODY_STYLE, link_ids)
+
+    segments = [SLIDE_HEAD, BACKGROUND_SLOT, PLACEHOLDER_HEAD.format(id=2, name=title_name, ph=title_ph)]
+    segments += title_body
+    segments += [PLACEHOLDER_TAIL, PLACEHOLDER_HEAD.format(id=3, name=body_name, ph=body_ph)]
+    segments += body
+    segments.append(PLACEHOLDER_TAIL)
+    runs = title_runs + body_runs
+    shapes = 2
+
+    if is_title and len(spec.lines) > 1:
+        date_runs, count = paragraph_runs(spec.lines[1], DATE_STYLE)
+        segments += [DATE_BOX_SLOT, DATE_BOX_HEAD]
+        segments += date_runs
+        segments.append(DATE_BOX_TAIL)
+        runs += count
+        shapes += 1
+
+    segments.append(SLIDE_TAIL)
+    layout = (TITLE_LAYOUT if is_title else CONTENT_LAYOUT) + 1
+    return CompiledSlide(spec.title, spec.kind, _merge_segments(segments), layout, runs, shapes, tuple(links),
+                         notes_xml(spec.notes))
+
+
+def _compile_table_slide(spec):
+    """表のスライド（タイトルのみのレイアウトと表）を compile_slide と同じ形に組み立てる"""
+    (title_name, title_ph), _ = CONTENT_PLACEHOLDERS
+    title_body, title_runs = text_body(spec.title.split('\n'), TITLE_STYLE)
+    table, table_runs = table_segments(spec.table)
+
+    segments = [SLIDE_HEAD, BACKGROUND_SLOT, PLACEHOLDER_HEAD.format(id=2, name=title_name, ph=title_ph)]
+    segments += title_body
+    segments.append(PLACEHOLDER_TAIL)
+    segments += table
+    segments.append(SLIDE_TAIL)
+    return CompiledSlide(spec.title, spec.kind, _merge_segments(segments), TITLE_ONLY_LAYOUT + 1,
+                         title_runs + table_runs, 2, (), notes_xml(spec.notes))
+
+
+def notes_xml(notes):
+    """ノートの行からノートのスライドの XML を作る（ノートがない場合は None）"""
+    if not notes:
+        return None
+    segments, _ = text_body(notes, '')
+    return NOTES_HEAD + ''.join(segments) + NOTES_TAIL
+
+
+def display_width(text):
+    """テキストの表示幅（ASCII 以外の文字は 2 として数える）"""
+    return len(text) + sum(1 for char in text if char > '\x7f')
+
+
+def column_widths(table, total=TABLE_WIDTH):
+    """
+    セルの表示幅に比例した列の幅を求める（EMU、合計は total）
+
+    Args:
+        table (Table): 表の内容
+        total (int): 表の幅
+
+    Returns:
+        list: 列の幅のリスト
+    """
+    weights = [MIN_COLUMN_WIDTH] * len(table.header)
+    for row in [table.header] + table.rows:
+        for i, cell in enumerate(row):
+            weights[i] = max(weights[i], min(display_width(cell), MAX_COLUMN_WIDTH))
+    widths = [total * weight // sum(weights) for weight in weights]
+    widths[-1] += total - sum(widths)
+    return widths
+
+
+def table_segments(table):
+    """
+    表の a:graphicFrame をセグメントにする
+
+    セルの書式と塗りつぶしはテーマによって変わるため、スロット（HEADER_CELL_STYLE など）として
+    残します。セルは python-pptx のオブジェクトを介さずに文字列でまとめて組み立てます。
+
+    Args:
+        table (Table): 表の内容
+
+    Returns:
+        tuple: (セグメントのリスト, ランの数)
+    """
+    grid = ''.join(f'<a:gridCol w="{width}"/>' for width in column_widths(table))
+    height = ROW_HEIGHT * (len(table.rows) + 1)
+    segments = [TABLE_FRAME_SLOT, TABLE_FRAME_HEAD.format(width=TABLE_WIDTH, height=height, grid=grid)]
+    runs = 0
+    for row, style, fill in [(table.header, HEADER_CELL_STYLE, HEADER_CELL_FILL)] + [
+            (row, CELL_STYLE, CELL_FILL) for row in table.rows]:
+        segments.append(f'<a:tr h="{ROW_HEIGHT}">')
+        for cell in row:
+            paragraph, count = text_body([cell], style)
+            segments.append(CELL_HEAD)
+            segments += paragraph
+            segments += ['</a:txBody>', fill, '</a:tc>']
+            runs += count
+        segments.append('</a:tr>')
+    segments.append(TABLE_FRAME_TAIL)
+    return segments, runs
+
+
+def cell_fill(color):
+    """セルの a:tcPr 要素を作る（色が None の場合は表のスタイルのまま）"""
+    if color is None:
+        return '<a:tcPr/>'
+    return f'<a:tcPr><a:solidFill><a:srgbClr val="{color_hex(color)}"/></a:solidFill></a:tcPr>'
+
+
+def _merge_segments(segments):
+    """隣り合う文字列のセグメントをつなげ、テーマを当てるときの結合の回数を減らす"""
+    merged = []
+    text = []
+    for segment in segments:
+        if segment.__class__ is str:
+            text.append(segment)
+            continue
+        if text:
+            merged.append(''.join(text))
+            text = []
+        merged.append(segment)
+    if text:
+        merged.append(''.join(text))
+    return tuple(merged)
+
+
+def theme_styles(theme):
+    """
+    テーマによって変わる部分を、スライドの種類ごとにスロットの並びとして作る
+
+    Args:
+        theme (Theme): カラーテーマ
+
+    Returns:
+        dict: スライドの種類 -> スロットの番号で引ける XML のタプル
+    """
+    date_style = run_properties(theme.subtitle, 12)
+
+    # 表の見出しは、タイトルの色で塗りつぶして背景の色（暗いテーマ以外は白）の文字にする。
+    # データのセルは表のスタイルの色のままにし、暗いテーマでは文字が読めるよう背景の色で塗る
+    header_text = None
+    if theme.title is not None:
+        header_text = theme.background if theme.dark else (255, 255, 255)
+    header_fill = cell_fill(theme.title)
+    body_fill = cell_fill(theme.background if theme.dark else None)
+
+    styles = {}
+    for kind, (title_size, body_size) in SIZES.items():
+        # 暗いテーマの場合は背景を暗く（render.add_background と同じく、ID はプレースホルダーの後の番号で最背面に置く）
+        background = ''
+        shapes = 1 if kind == "table" else 2
+        if theme.dark:
+            shapes += 1
+            fill = f'<a:solidFill><a:srgbClr val="{color_hex(theme.background)}"/></a:solidFill>'
+            background = BACKGROUND.format(id=shapes + 1, index=shapes, fill=fill)
+        date_box = DATE_BOX_ID.format(id=shapes + 2, index=shapes + 1)
+        table_frame = TABLE_FRAME_ID.format(id=shapes + 2, index=shapes + 1)
+
+        title_style = run_properties(theme.title, title_size, bold=True)
+        if kind == "title":
+            body_args = (theme.subtitle, body_size, None, True)
+        else:
+            body_args = (theme.text, body_size)
+        body_style = run_properties(*body_args)
+        body_link_style = run_properties(*body_args, open_only=True)
+        styles[kind] = (title_style, body_style, date_style, background, date_box, body_link_style, table_frame,
+                        run_properties(header_text, body_size, bold=True), header_fill,
+                        run_properties(theme.text, body_size), body_fill)
+    return styles
+
+
+def render_slide(compiled, styles):
+    """
+    compile_slide で組み立てたスライドにテーマを当てて XML にする
+
+    Args:
+        compiled (CompiledSlide): テーマを当てる前のスライド
+        styles (dict): theme_styles の結果
+
+    Returns:
+        tuple: (スライドの XML, シェイプ数)
+    """
+    slots = styles[compiled.kind]
+    xml = ''.join([s if s.__class__ is str else slots[s] for s in compiled.segments])
+    return xml, compiled.shapes + bool(slots[BACKGROUND_SLOT])
+
+
+def slide_xml(spec, theme):
+    """
+    Slide の内容からスライドの XML を作る（render.add_slide と同じ内容）
+
+    Args:
+        spec (Slide): スライドの内容
+        theme (Theme): カラーテーマ
+
+    Returns:
+        tuple: (スライドの XML, シェイプ数, ラン数)
+    """
+    compiled = compile_slide(spec)
+    xml, shapes = render_slide(compiled, theme_styles(theme))
+    return xml, shapes, compiled.runs
+
+
+def slide_rels(compiled, notes_number=None):
+    """
+    スライドのリレーションシップ（レイアウト、ノート、リンク先のスライド）の XML を作る
+
+    Args:
+        compiled (CompiledSlide): スライド
+        notes_number (int): ノートのスライドの番号（ノートがない場合は None）
+    """
+    rels = '' if notes_number is None else SLIDE_NOTES_REL.format(number=notes_number)
+    first = 2 if notes_number is None else 3
+    rels += ''.join(SLIDE_LINK_REL.format(id=n, target=target) for n, target in enumerate(compiled.links, first))
+    return SLIDE_RELS.format(layout=compiled.layout, links=rels).encode("utf-8")
+
+
+def table_frame_xml(table, theme, shape_id):
+    """
+    表のシェイプの XML を作る（render.add_table で使う。名前空間の宣言を含む）
+
+    Args:
+        table (Table): 表の内容
+        theme (Theme): カラーテーマ
+        shape_id (int): シェイプの ID
+
+    Returns:
+        str: p:graphicFrame 要素の XML
+    """
+    slots = list(theme_styles(theme)["table"])
+    slots[TABLE_FRAME_SLOT] = TABLE_FRAME_ID.format(id=shape_id, index=shape_id - 1).replace(
+        '<p:graphicFrame>', '<p:graphicFrame' + NAMESPACES + '>', 1)
+    segments, _ = table_segments(table)
+    return ''.join([s if s.__class__ is str else slots[s] for s in segments])
+
+
+def _next_rel_id(rels_xml):
+    """リレーションシップの XML で使われていない最小の rId の番号を返す"""
+    used = [int(n) for n in re.findall(r'Id="rId(\d+)"', rels_xml)]
+    return max(used, default=0) + 1
+
+
+def is_package_part(name):
+    """リレーションシップやコンテンツタイプではない、内容を持つパーツかどうか"""
+    return not name.endswith(".rels") and name != "[Content_Types].xml"
+
+
+def manifest_parts(count, notes=0):
+    """
+    スライドの数に合わせて書き換えた、テンプレートのマニフェスト（MANIFESTS）を返す
+
+    Args:
+        count (int): スライドの数
+        notes (int): ノートのスライドの数（1 以上の場合はノートマスターも登録する）
+
+    Returns:
+        list: (パーツ名, 内容のバイト列) のリスト
+    """
+    template = dict(load_template())
+    first = _next_rel_id(template["ppt/_rels/presentation.xml.rels"].decode("utf-8"))
+
+    overrides = ''.join(
+        f'<Override PartName="/ppt/slides/slide{n}.xml" ContentType="{SLIDE_CONTENT_TYPE}"/>'
+        for n in range(1, count + 1)
+    )
+    slide_rels = ''.join(
+        f'<Relationship Id="rId{first + n}" Type="{SLIDE_REL_TYPE}" Target="slides/slide{n + 1}.xml"/>'
+        for n in range(count)
+    )
+    slide_ids = ''.join(f'<p:sldId id="{256 + n}" r:id="rId{first + n}"/>' for n in range(count))
+    if notes:
+        # python-pptx と同じく、プレゼンテーションからノートマスターへはリレーションシップだけを追加する
+        overrides += ''.join(
+            f'<Override PartName="/ppt/notesSlides/notesSlide{n}.xml" ContentType="{NOTES_SLIDE_CONTENT_TYPE}"/>'
+            for n in range(1, notes + 1)
+        )
+        overrides += (f'<Override PartName="/{NOTES_MASTER}" ContentType="{NOTES_MASTER_CONTENT_TYPE}"/>'
+                      f'<Override PartName="/{NOTES_THEME}" ContentType="{THEME_CONTENT_TYPE}"/>')
+        slide_rels += (f'<Relationship Id="rId{first + count}" Type="{NOTES_MASTER_REL_TYPE}"'
+                       f' Target="notesMasters/notesMaster1.xml"/>')
+    replacements = {
+        "[Content_Types].xml": ("</Types>", overrides + "</Types>"),
+        "ppt/_rels/presentation.xml.rels": ("</Relationships>", slide_rels + "</Relationships>"),
+        "ppt/presentation.xml": ("</p:sldMasterIdLst>", f"</p:sldMasterIdLst><p:sldIdLst>{slide_ids}</p:sldIdLst>"),
+    }
+    parts = []
+    for name in MANIFESTS:
+        old, new = replacements[name]
+        parts.append((name, template[name].decode("utf-8").replace(old, new, 1).encode("utf-8")))
+    return parts
+
+
+def write_presentation(slides, theme, output_file, workers=None):
+    """
+    Slide の並びからプレゼンテーションを作成して保存する（render.build_presentation の高速版）
+
+    スライドは 1 枚作るごとに .pptx に書き込み、スライドの一覧を持つマニフェストだけを
+    最後に書き込みます。slides にジェネレーターを渡すと、デッキの長さによらず
+    使用メモリはほぼ一定になります。
+
+    Args:
+        slides (iterable): Slide、または compile_slide で組み立てた CompiledSlide の並び
+        theme (Theme): カラーテーマ
+        output_file (str): 出力するファイル名、または書き込み可能なファイルオブジェクト
+        workers (int): 圧縮に使うスレッド数（None の場合は CPU 数、1 の場合は並列化しない）
+    """
+    styles = theme_styles(theme)
+    count = 0
+    notes = 0
+    shapes = 0
+    runs = 0
+    package_parts = 0
+    with ParallelZipWriter(output_file, workers, cache=_compressed_parts) as zf:
+        # マスターやレイアウトなど、スライドの数によらないパーツはそのまま書き込む
+        with profiling.phase("save"):
+            for name, data in load_template():
+                if name not in MANIFESTS:
+                    zf.writestr(name, data, reuse=True)
+                    package_parts += is_package_part(name)
+
+        for spec in slides:
+            count += 1
+            with profiling.slide(spec.title):
+                with profiling.phase("render"):
+                    compiled = spec if isinstance(spec, CompiledSlide) else compile_slide(spec)
+                    xml, shape_count = render_slide(compiled, styles)
+                with profiling.phase("save"):
+                    zf.writestr(f"ppt/slides/slide{count}.xml", xml.encode("utf-8"))
+                    notes_number = None
+                    if compiled.notes is not None:
+                        notes += 1
+                        notes_number = notes
+                        write_notes(zf, compiled.notes, notes, count)
+                    zf.writestr(f"ppt/slides/_rels/slide{count}.xml.rels", slide_rels(compiled, notes_number),
+                                reuse=not compiled.links and notes_number is None)
+            shapes += shape_count
+            runs += compiled.runs
+
+        with profiling.phase("save"):
+            for name, data in manifest_parts(count, notes):
+                zf.writestr(name, data)
+                package_parts += is_package_part(name)
+
+    # パーツ数は python-pptx と同じく、リレーションシップとコンテンツタイプを除いて数える
+    # （ノートがある場合は、ノートのスライドとノートマスター、そのテーマも数える）
+    if notes:
+        package_parts += notes + 2
+    profiling.record_counts(slides=count, shapes=shapes, runs=runs, parts=package_parts + count)
+
+
+def write_notes(zf, xml, number, slide_number):
+    """
+    ノートのスライドを書き込む。最初のノートではノートマスターとそのテーマも書き込む
+
+    Args:
+        zf (ParallelZipWriter): 書き込み先
+        xml (str): ノートのスライドの XML
+        number (int): ノートのスライドの番号（1 から）
+        slide_number (int): ノートを付けるスライドの番号
+    """
+    if number == 1:
+        for name, data in notes_master_parts():
+            zf.writestr(name, data, reuse=True)
+    zf.writestr(f"ppt/notesSlides/notesSlide{number}.xml", xml.encode("utf-8"))
+    zf.writestr(f"ppt/notesSlides/_rels/notesSlide{number}.xml.rels",
+                NOTES_RELS.format(slide=slide_number).encode("utf-8"))
+
+
+def compile_slides(slides):
+    """
+    Slide の並びをまとめて compile_slide する（複数のテーマで出力する場合に使う）
+
+    Returns:
+        list: CompiledSlide のリスト
+    """
+    with profiling.phase("render"):
+        return [compile_slide(spec) for spec in slides]
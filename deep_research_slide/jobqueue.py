@@ -0,0 +1,124 @@
+"""
+複数のホストで変換を分担するジョブキュー
+
+1 台のマシンでは終わらない量のバッチ変換を、共有ストレージ上の SQLite のファイル
+（manifest.Manifest）を待ち行列にして、任意の数のホストのワーカーで分担します。
+メッセージブローカーなどの別のサーバーは要りません。
+
+- コーディネーター（enqueue）が入力ファイルと変換の設定を待ち行列に登録する
+- ワーカー（run_worker）は少しずつファイルを取り出して（claim_next）処理中にし、
+  batch のパイプラインで変換して結果を記録する。取り出せるファイルがなくなれば終わる
+- 処理中のファイルは Heartbeat が lease を延ばし続ける。ワーカーのホストが止まると
+  lease が切れ、ほかのワーカーが引き継ぐ
+
+共有ストレージは、すべてのホストで同じパスにマウントしてください（入力と出力のファイル名は
+絶対パスで記録します）。SQLite の WAL はネットワーク上のファイルシステムでは使えないため、
+待ち行列はロールバックジャーナルで開きます。
+
+使用例:
+    python -m deep_research_slide queue add /shared/inputs/*.txt -d /shared/slides --queue /shared/queue.db
+    python -m deep_research_slide queue work --queue /shared/queue.db --jobs 4   # 各ホストで実行
+    python -m deep_research_slide queue status --queue /shared/queue.db
+"""
+import asyncio
+import os
+import time
+
+from .batch import DEFAULT_IO_THREADS, Job, Options, run_pipeline, worker_pool
+from .manifest import DEFAULT_LEASE, DEFAULT_MAX_ATTEMPTS, RUNNING, Heartbeat, Manifest
+
+# 変換の設定を保存する設定のキー
+OPTIONS_KEY = "options"
+
+# 実行待ちのファイルがなく、ほかのワーカーが処理中のファイルがある場合に待つ間隔（秒）
+DEFAULT_POLL = 5.0
+
+
+def open_queue(path, lease=DEFAULT_LEASE):
+    """共有ストレージ上の待ち行列を開く（ロールバックジャーナルを使う）"""
+    return Manifest(path, lease, wal=False)
+
+
+def enqueue(path, jobs, options, max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """
+    ファイルを待ち行列に登録する
+
+    変換の設定は待ち行列ごとに 1 つで、最初に登録したときに保存します。
+
+    Args:
+        path (str): 待ち行列のファイル名
+        jobs (list): batch.Job のリスト
+        options (batch.Options): 変換の設定
+        max_attempts (int): 1 つのファイルの試行回数の上限（これに達した失敗は登録し直さない）
+
+    Returns:
+        tuple: (登録した Job のリスト, manifest.Skipped)
+
+    Raises:
+        ValueError: 保存済みの変換の設定と異なる場合
+    """
+    queue = open_queue(path)
+    try:
+        saved = queue.get_setting(OPTIONS_KEY)
+        if saved is None:
+            queue.set_setting(OPTIONS_KEY, options._asdict())
+        elif Options(**saved) != options:
+            raise ValueError(f"{path} の変換の設定（{saved}）と異なる設定では登録できません")
+        return queue.enqueue(jobs, max_attempts)
+    finally:
+        queue.close()
+
+
+def run_worker(path, workers=None, io_threads=DEFAULT_IO_THREADS, prefetch=None, batch_size=None,
+               max_attempts=DEFAULT_MAX_ATTEMPTS, lease=DEFAULT_LEASE, poll=DEFAULT_POLL, on_result=None,
+               memory_budget=None, mapped=False):
+    """
+    待ち行列からファイルを取り出して変換し、取り出せるファイルがなくなるまで続ける
+
+    Args:
+        path (str): 待ち行列のファイル名
+        workers (int): 描画に使うワーカープロセス数（None の場合は CPU 数）
+        io_threads (int): 読み書きに使うスレッド数
+        prefetch (int): 段階の間に溜めておけるファイルの最大数
+        batch_size (int): 1 回に取り出すファイルの数（None の場合はワーカープロセス数の 4 倍）
+        max_attempts (int): 1 つのファイルの試行回数の上限
+        lease (float): 処理中のまま止まったとみなすまでの秒数
+        poll (float): ほかのワーカーの処理中のファイルしか残っていない場合に、引き継げるように
+            なるのを待つ間隔（秒、0 の場合は待たずに終わる）
+        on_result (callable): 1 つの変換が終わるたびに batch.Result を渡して呼ぶ関数
+        memory_budget (int): 同時に描画するファイルの見積もりメモリの合計の上限（バイト）
+        mapped (bool): ワーカーが入力ファイルをメモリーマップで開くかどうか
+
+    Returns:
+        list: このワーカーが処理した batch.Result のリスト
+    """
+    workers = workers or os.cpu_count() or 1
+    batch_size = batch_size or workers * 4
+    queue = open_queue(path, lease)
+    results = []
+
+    def record(result):
+        queue.record(result)
+        if on_result is not None:
+            on_result(result)
+
+    try:
+        saved = queue.get_setting(OPTIONS_KEY)
+        if saved is None:
+            raise ValueError(f"{path} にはまだファイルが登録されていません")
+        options = Options(**saved)
+        with Heartbeat(queue), worker_pool(workers) as pool:
+            while True:
+                rows = queue.claim_next(batch_size, max_attempts)
+                if not rows:
+                    if poll and queue.counts().get(RUNNING):
+                        time.sleep(poll)
+                        continue
+                    break
+                jobs = [Job(input_file, output_file) for input_file, output_file in rows]
+                results += asyncio.run(run_pipeline(jobs, options, pool, workers, io_threads, prefetch, record,
+                                                    memory_budget, mapped))
+    finally:
+        queue.release()
+        queue.close()
+    return results
@@ -0,0 +1,107 @@
+"""
+解析に使う、テキストの範囲と行の索引
+
+入力を段落の文字列のリストに分け、段落ごとに行のリストに分け、残した行のリストを作り…と
+進めると、段階ごとにテキストのコピーが作られます。このモジュールでは、デコードした
+テキスト 1 つと、行ごとの開始・終了の位置（array('I')）とフラグ（bytearray）で行を表します。
+段落やセクションの本文は、同じテキストの範囲を指すビュー（TextSpans）で、文字列は
+取り出したとき（スライドを組み立てるとき）に初めて作ります。
+
+TextSpans は文字列のリストと同じように使えます（len、添字、スライス、for、"\\n".join など）。
+"""
+from array import array
+from collections.abc import Sequence
+
+# 行のフラグ
+# HEADING: セクションの見出しの行（本文には含めない）
+# CITATION: 引用や URL の行（本文から除き、引用としてスピーカーノートに残す）
+HEADING = 1
+CITATION = 2
+
+
+class TextSpans(Sequence):
+    """
+    テキストの範囲の並びを、文字列のリストのように扱う（要素は取り出すたびに部分文字列にする）
+
+    Args:
+        text (str): 元のテキスト
+        starts (array): 各要素の開始位置（None の場合は空）
+        ends (array): 各要素の終了位置（None の場合は空）
+    """
+    __slots__ = ("text", "starts", "ends")
+
+    def __init__(self, text, starts=None, ends=None):
+        self.text = text
+        self.starts = array('I') if starts is None else starts
+        self.ends = array('I') if ends is None else ends
+
+    @classmethod
+    def from_strings(cls, strings):
+        """文字列のリストから作る（文字列を改行でつないだテキストの範囲にする）"""
+        strings = list(strings)
+        spans = cls('\n'.join(strings))
+        position = 0
+        for string in strings:
+            spans.append(position, position + len(string))
+            position += len(string) + 1
+        return spans
+
+    def append(self, start, end):
+        """text[start:end] を末尾に加える"""
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def span(self, i):
+        """i 番目の要素の (開始位置, 終了位置)"""
+        return self.starts[i], self.ends[i]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return TextSpans(self.text, self.starts[i], self.ends[i])
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def __iter__(self):
+        text = self.text
+        for start, end in zip(self.starts, self.ends):
+            yield text[start:end]
+
+    def __eq__(self, other):
+        if isinstance(other, TextSpans):
+            other = list(other)
+        return list(self) == other
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def as_spans(strings):
+    """TextSpans でなければ TextSpans にする（段落の文字列のリストを受け取る関数の入り口で使う）"""
+    return strings if isinstance(strings, TextSpans) else TextSpans.from_strings(strings)
+
+
+class LineIndex(TextSpans):
+    """
+    行の索引（テキスト、行ごとの開始・終了の位置とフラグ）
+
+    Args:
+        text (str): 元のテキスト
+    """
+    __slots__ = ("flags",)
+
+    def __init__(self, text):
+        super().__init__(text)
+        self.flags = bytearray()
+
+    def append(self, start, end, flags=0):
+        """text[start:end] の行をフラグとともに加える"""
+        super().append(start, end)
+        self.flags.append(flags)
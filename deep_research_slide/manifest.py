@@ -0,0 +1,333 @@
+"""
+バッチ変換の進み具合を記録するマニフェスト（SQLite）
+
+数千ファイルのバッチ変換が途中で止まっても、最初からやり直さずに済むよう、入力ファイルごとに
+状態（実行中・完了・失敗）、入力の SHA-256、出力ファイル名、処理時間、試行回数を記録します。
+同じマニフェストで再実行すると次のように扱います。
+
+- 完了していて、入力の大きさと更新日時が記録と同じで、出力ファイルもあるものは飛ばす
+- 失敗したものは max_attempts 回まで再試行する
+- ほかの実行が処理中のものは飛ばす（ただし、同じホストで実行していたプロセスが
+  もう存在しない場合や、lease 秒を過ぎても終わらない場合は、止まったものとみなして引き継ぐ）
+
+実行中にする処理は 1 つのトランザクション（BEGIN IMMEDIATE）で行うため、同じマニフェストに
+対して複数の実行を同時に始めても、同じファイルを二重に変換することはありません。
+実行中のファイルの記録は Heartbeat が定期的に更新するため、lease より長くかかる変換が
+ほかの実行に引き継がれることはありません。
+
+複数のホストから共有ストレージ上のマニフェストを使う場合（jobqueue）は、wal=False で開きます。
+SQLite の WAL は共有メモリを使うため、ネットワーク上のファイルシステムでは使えません。
+
+使用例:
+    python -m deep_research_slide batch inputs/*.txt -d slides/ --manifest slides/manifest.db
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# 状態
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# 既定の試行回数の上限と、実行中のまま止まったとみなすまでの秒数
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_LEASE = 3600
+
+# started は実行中にした日時で、Heartbeat が更新する（lease の起点）
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    input_file TEXT PRIMARY KEY,
+    output_file TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    digest TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    seconds REAL,
+    owner TEXT,
+    started REAL,
+    finished REAL
+)
+"""
+
+# claim と enqueue で飛ばしたファイルの数
+# done: 完了済み、running: ほかの実行が処理中、exhausted: 試行回数の上限に達した
+Skipped = namedtuple("Skipped", "done running exhausted")
+
+
+def owner_id():
+    """この実行を表す名前（ホスト名:プロセス ID）"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def owner_alive(owner, host=None):
+    """
+    実行中として記録したプロセスがまだ動いているかどうか
+
+    ほかのホストのプロセスは確かめられないため、動いているものとみなします。
+    """
+    name, _, pid = (owner or "").rpartition(":")
+    if name != (host or socket.gethostname()) or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def fingerprint(path):
+    """入力ファイルの (大きさ, 更新日時) を返す（ない場合は (None, None)）"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None, None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _key(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+class Manifest:
+    """
+    バッチ変換のマニフェスト
+
+    Args:
+        path (str): SQLite のファイル名
+        lease (float): 実行中のまま止まったとみなすまでの秒数
+        wal (bool): WAL モードで開くかどうか（複数のホストから使う場合は False）
+    """
+
+    def __init__(self, path, lease=DEFAULT_LEASE, wal=True):
+        self.path = path
+        self.lease = lease
+        self.wal = wal
+        self.owner = owner_id()
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self.connection.execute("PRAGMA synchronous=NORMAL" if wal else "PRAGMA synchronous=FULL")
+        self.connection.executescript(SCHEMA)
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise ValueError(f"{path} は未対応のマニフェストです（バージョン {version}）")
+        self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        self.close()
+
+    def claim(self, jobs, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        jobs のうち変換が必要なものを、この実行で処理中にする
+
+        Args:
+            jobs (list): batch.Job のリスト
+            max_attempts (int): 1 つのファイルの試行回数の上限
+
+        Returns:
+            tuple: (この実行で変換する Job のリスト, Skipped)
+        """
+        return self._admit(jobs, max_attempts, RUNNING)
+
+    def enqueue(self, jobs, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        jobs のうち変換が必要なものを、実行待ちにする（どの実行が処理するかは claim_next で決まる）
+
+        Returns:
+            tuple: (実行待ちにした Job のリスト, Skipped)
+        """
+        return self._admit(jobs, max_attempts, PENDING)
+
+    def _admit(self, jobs, max_attempts, status):
+        now = time.time()
+        claimed = []
+        done = running = exhausted = 0
+        # 大きさと更新日時はトランザクションの外で調べる（ネットワーク上のストレージでは時間がかかる）
+        stats = [fingerprint(job.input_file) for job in jobs]
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for job, (size, mtime_ns) in zip(jobs, stats):
+                key = _key(job.input_file)
+                row = cursor.execute(
+                    "SELECT output_file, size, mtime_ns, status, attempts, owner, started FROM items"
+                    " WHERE input_file = ?", (key,)).fetchone()
+                attempts = 0
+                if row is not None:
+                    # status（この呼び出しで記録する状態）を上書きしないよう、記録済みの状態は old_status にする
+                    output_file, old_size, old_mtime, old_status, attempts, owner, started = row
+                    changed = (output_file != _key(job.output_file) or (old_size, old_mtime) != (size, mtime_ns))
+                    if old_status == DONE and not changed and os.path.exists(job.output_file):
+                        done += 1
+                        continue
+                    if changed or old_status == DONE:
+                        # 入力や出力先が変わった場合と、出力ファイルが消された場合は最初からやり直す
+                        attempts = 0
+                    elif old_status == RUNNING and owner != self.owner and now - (started or 0) < self.lease \
+                            and owner_alive(owner):
+                        running += 1
+                        continue
+                    elif attempts >= max_attempts:
+                        exhausted += 1
+                        continue
+                if status == RUNNING:
+                    attempts, owner, started = attempts + 1, self.owner, now
+                else:
+                    owner = started = None
+                cursor.execute(
+                    "INSERT OR REPLACE INTO items (input_file, output_file, size, mtime_ns, digest, status, attempts,"
+                    " error, seconds, owner, started, finished) VALUES (?, ?, ?, ?, NULL, ?, ?, NULL, NULL, ?, ?, NULL)",
+                    (key, _key(job.output_file), size, mtime_ns, status, attempts, owner, started))
+                claimed.append(job)
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return claimed, Skipped(done, running, exhausted)
+
+    def claim_next(self, limit, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        実行待ちのファイル、再試行できる失敗したファイル、止まった実行が残したファイルを、
+        登録した順に limit 個まで、この実行で処理中にする
+
+        Args:
+            limit (int): 処理中にするファイルの最大数
+            max_attempts (int): 1 つのファイルの試行回数の上限
+
+        Returns:
+            list: (入力ファイル, 出力ファイル) のリスト（処理できるファイルがなければ空）
+        """
+        now = time.time()
+        host = socket.gethostname()
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            # 試行回数の上限に達したまま止まったものは、失敗として記録する
+            cursor.execute("UPDATE items SET status = ?, owner = NULL, error = ? WHERE status = ? AND attempts >= ?"
+                           " AND started < ?", (FAILED, "処理中に止まりました", RUNNING, max_attempts, now - self.lease))
+            rows = cursor.execute(
+                "SELECT input_file, output_file FROM items WHERE status IN (?, ?) AND attempts < ?"
+                " ORDER BY rowid LIMIT ?", (PENDING, FAILED, max_attempts, limit)).fetchall()
+            if len(rows) < limit:
+                # lease を過ぎたもの、同じホストで止まったプロセスのもの
+                stale = cursor.execute(
+                    "SELECT input_file, output_file, owner, started FROM items"
+                    " WHERE status = ? AND attempts < ? AND (started < ? OR owner LIKE ?) ORDER BY rowid",
+                    (RUNNING, max_attempts, now - self.lease, f"{host}:%")).fetchall()
+                rows += [(input_file, output_file) for input_file, output_file, owner, started in stale
+                         if started < now - self.lease or not owner_alive(owner, host)][:limit - len(rows)]
+            cursor.executemany(
+                "UPDATE items SET status = ?, attempts = attempts + 1, owner = ?, started = ?, error = NULL"
+                " WHERE input_file = ?", [(RUNNING, self.owner, now, input_file) for input_file, _ in rows])
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return rows
+
+    def renew(self):
+        """この実行で処理中のファイルの lease を延ばす"""
+        self.connection.execute("UPDATE items SET started = ? WHERE owner = ? AND status = ?",
+                                (time.time(), self.owner, RUNNING))
+
+    def get_setting(self, key):
+        """設定を返す（JSON で保存した値、ない場合は None）"""
+        row = self.connection.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set_setting(self, key, value):
+        """設定を JSON で保存する"""
+        self.connection.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                                (key, json.dumps(value, ensure_ascii=False)))
+
+    def record(self, result):
+        """
+        1 つの変換の結果を記録する（batch.run_batch の on_result に使う）
+
+        Args:
+            result (batch.Result): 変換の結果
+        """
+        self.connection.execute(
+            "UPDATE items SET status = ?, digest = ?, error = ?, seconds = ?, finished = ?, owner = NULL"
+            " WHERE input_file = ? AND owner = ?",
+            (FAILED if result.error else DONE, result.digest, result.error, result.seconds, time.time(),
+             _key(result.input_file), self.owner))
+
+    def release(self):
+        """この実行で処理中にしたまま終わっていないものを、次の実行で処理できるように戻す"""
+        self.connection.execute("UPDATE items SET status = ?, owner = NULL WHERE owner = ? AND status = ?",
+                                (PENDING, self.owner, RUNNING))
+
+    def counts(self):
+        """状態ごとのファイル数の辞書"""
+        return dict(self.connection.execute("SELECT status, COUNT(*) FROM items GROUP BY status"))
+
+
+class Heartbeat:
+    """
+    処理中のファイルの lease を別のスレッドで定期的に延ばす（with 文で使う）
+
+    Args:
+        manifest (Manifest): マニフェスト（同じファイルを別の接続で開く）
+        interval (float): 延ばす間隔（秒、None の場合は lease の 1/3）
+    """
+
+    def __init__(self, manifest, interval=None):
+        self.manifest = manifest
+        self.interval = interval or manifest.lease / 3
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        # SQLite の接続はスレッドをまたいで使えないため、スレッドで開き直す
+        manifest = Manifest(self.manifest.path, self.manifest.lease, self.manifest.wal)
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    manifest.renew()
+                except sqlite3.OperationalError:
+                    # ほかのホストが長くロックしている場合は、次の間隔で延ばし直す
+                    pass
+        finally:
+            manifest.close()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+
+
+def describe_counts(counts):
+    """状態ごとのファイル数を 1 行の説明にする"""
+    names = {PENDING: "実行待ち", RUNNING: "処理中", DONE: "完了", FAILED: "失敗"}
+    return "、".join(f"{label} {counts.get(status, 0)}" for status, label in names.items())
+
+
+def describe_skipped(skipped):
+    """claim で飛ばしたファイルの数を 1 行の説明にする"""
+    return (f"マニフェストにより {sum(skipped)} ファイルを飛ばします（完了済み {skipped.done}、"
+            f"ほかの実行が処理中 {skipped.running}、試行回数の上限 {skipped.exhausted}）")
@@ -0,0 +1,397 @@
+"""
+入力テキストの解析
+
+テキストを段落に分け、参考文献や URL を取り除いたうえで、
+見出しと本文行からなるセクションのリストに変換します。
+本文の中の表（Markdown の表や、列を揃えたデータ）もここで見つけます。
+"""
+import re
+from collections import namedtuple
+
+from .lineindex import CITATION, HEADING, LineIndex, TextSpans, as_spans
+
+# URLや引用番号を含む行を除外するための正規表現パターン
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+|\[\d+\]|\(\d+\)|参考文献|References')
+
+# 参考文献セクションを検出するパターン（前後の空白を除いた行がこの表記で始まる。段落の範囲を search で調べる）
+REF_SECTION_PATTERN = re.compile(r'^[^\S\n]*(?:参考文献|References|引用文献|Sources|Citations)',
+                                 re.IGNORECASE | re.MULTILINE)
+
+# 数字だけの見出し（"1." など）
+NUMBER_HEADING_PATTERN = re.compile(r'^\d+\.?$')
+
+# 段落の区切り（空行）
+PARAGRAPH_PATTERN = re.compile(r'\n\s*\n')
+
+# 空白でない文字（段落や行の範囲の前後の空白を飛ばすのに使う）
+NONSPACE_PATTERN = re.compile(r'\S')
+
+# テキストの先頭の BOM と空白（最初の行を探すときに飛ばす）
+LEADING_BLANK_PATTERN = re.compile(r'\ufeff*\s*')
+
+# 引用のリンク（"[タイトル](URL)"）と URL（除外した行から引用を取り出すのに使う）
+CITATION_LINK_PATTERN = re.compile(r'\[([^\]]*)\]\((https?://[^)\s]+)\)|https?://[^\s)\]]+|www\.[^\s)\]]+')
+
+# Markdown の表の見出しの下の区切り行（"|---|:---:|" など）
+TABLE_RULE_PATTERN = re.compile(r'^\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?$')
+
+# 列をタブ、または 2 つ以上の空白で揃えた行の、列の区切り
+ALIGNED_COLUMN_PATTERN = re.compile(r'\t+| {2,}')
+
+# 列を揃えたデータを表とみなす最小の行数（見出しの行を含む）
+MIN_ALIGNED_ROWS = 3
+
+# title: セクションの見出し、lines: 本文の行のリスト（解析したテキストの範囲のビュー lineindex.TextSpans）、
+# citations: 本文から除外した引用の (直前までに残した本文の行数, 引用のテキスト) のリスト
+Section = namedtuple("Section", "title lines citations", defaults=((),))
+
+# header: 見出しの行のセルのリスト、rows: データの行（セルのリスト）のリスト
+Table = namedtuple("Table", "header rows")
+
+
+def split_paragraphs(text):
+    """
+    テキストを空行で段落に分割する
+
+    Args:
+        text (str): 入力テキスト
+
+    Returns:
+        TextSpans: 段落（text の範囲）の並び。PARAGRAPH_PATTERN.split(text) と同じ段落になる
+    """
+    paragraphs = TextSpans(text)
+    position = 0
+    for match in PARAGRAPH_PATTERN.finditer(text):
+        paragraphs.append(position, match.start())
+        position = match.end()
+    paragraphs.append(position, len(text))
+    return paragraphs
+
+
+def drop_references(paragraphs):
+    """
+    参考文献セクション以降の段落を取り除く
+
+    Args:
+        paragraphs (list): 段落のリスト（split_paragraphs の TextSpans、または文字列のリスト）
+
+    Returns:
+        TextSpans: 参考文献セクションより前の段落の並び
+    """
+    paragraphs = as_spans(paragraphs)
+    text = paragraphs.text
+    for i in range(len(paragraphs)):
+        # 参考文献セクションを検出したら、それ以降は含めない（段落は行の先頭から始まる）
+        if REF_SECTION_PATTERN.search(text, *paragraphs.span(i)):
+            return paragraphs[:i]
+    return paragraphs
+
+
+def is_citation_line(line):
+    """URL、引用番号、参考文献の表記を含む行かどうか"""
+    return URL_PATTERN.search(line) is not None
+
+
+def is_url_line(line):
+    """URL の行かどうか（ボードゲームの攻略情報用の緩い判定）"""
+    return line.startswith('http') or 'www.' in line
+
+
+def _span_predicate(is_noise):
+    """
+    行の判定関数を、text[start:end] の行を文字列にせずに判定する関数 (text, start, end) にする
+
+    is_citation_line と is_url_line は範囲のまま判定し、それ以外の関数には行の文字列を渡します。
+
+    Returns:
+        tuple: (行を判定する関数, 範囲の中に除外する行があり得るかを判定する関数。分からない場合は None)
+    """
+    if is_noise is is_citation_line:
+        # URL_PATTERN は改行をまたいで一致しないため、段落全体で一致しなければどの行も除外しない
+        def is_noise_at(text, start, end):
+            return URL_PATTERN.search(text, start, end) is not None
+        return is_noise_at, is_noise_at
+    if is_noise is is_url_line:
+        return (lambda text, start, end: text.startswith('http', start, end) or text.find('www.', start, end) >= 0,
+                lambda text, start, end: text.find('http', start, end) >= 0 or text.find('www.', start, end) >= 0)
+    return lambda text, start, end: is_noise(text[start:end]), None
+
+
+def _index_paragraph(index, start, end, is_noise_at, may_be_noise):
+    """
+    段落 text[start:end] の前後の空白を除いた範囲を行に分けて索引に加える
+
+    para.strip().split('\n') と同じ行になります（空白だけの段落は空の行 1 つ）。
+    除外する行には CITATION のフラグを立てます。
+    """
+    text = index.text
+    match = NONSPACE_PATTERN.search(text, start, end)
+    if match is None:
+        index.append(start, start)
+        return
+    start = match.start()
+    while text[end - 1].isspace():
+        end -= 1
+    check = may_be_noise is None or may_be_noise(text, start, end)
+    starts, ends, flags = index.starts, index.ends, index.flags
+    while True:
+        newline = text.find('\n', start, end)
+        line_end = end if newline < 0 else newline
+        starts.append(start)
+        ends.append(line_end)
+        flags.append(CITATION if check and is_noise_at(text, start, line_end) else 0)
+        if newline < 0:
+            return
+        start = newline + 1
+
+
+def extract_citations(line):
+    """
+    除外した行から引用（リンクのタイトルと URL）を取り出す
+
+    Args:
+        line (str): 除外した行
+
+    Returns:
+        list: 引用のテキスト（"タイトル: URL" または URL）のリスト。
+            リンクや URL のない行（"[1] 著者名" など）は行そのもの
+    """
+    citations = []
+    for match in CITATION_LINK_PATTERN.finditer(line):
+        if match.group(2):
+            title = match.group(1).strip()
+            citations.append(f"{title}: {match.group(2)}" if title else match.group(2))
+        else:
+            citations.append(match.group())
+    return citations or [line.strip()]
+
+
+def parse_sections(paragraphs, is_noise=is_citation_line, min_title_length=4):
+    """
+    段落のリストをセクションのリストに変換する
+
+    最初の段落はタイトルとして扱い、それ以外の段落の最初の行を見出しとします。
+    見出しにならない段落は直前のセクションの続きとして本文に加えます。
+    除外した行（URL など）の引用は、本文のどの位置にあったかとともに Section.citations に残します。
+
+    段落は 1 つのテキストの範囲のまま行の索引（lineindex.LineIndex）にし、セクションの本文は
+    その行の範囲のビューにします（行ごとの文字列のリストは作りません）。
+
+    Args:
+        paragraphs (list): 段落のリスト（split_paragraphs の TextSpans、または文字列のリスト）
+        is_noise (callable): 除外する行（URL など）を判定する関数
+        min_title_length (int): 見出しとして扱う最小の文字数
+
+    Returns:
+        list: Section のリスト
+    """
+    paragraphs = as_spans(paragraphs)
+    text = paragraphs.text
+    index = LineIndex(text)
+    is_noise_at, may_be_noise = _span_predicate(is_noise)
+
+    # 段落を行の索引にし、見出しの候補を集める
+    bounds = []
+    section_titles = set()
+    for i in range(1, len(paragraphs)):
+        first = len(index)
+        _index_paragraph(index, *paragraphs.span(i), is_noise_at, may_be_noise)
+        bounds.append((first, len(index)))
+        section_title = index[first].strip()
+        # URLや参考文献を含む行、数字だけの見出しや短すぎる見出し、表の見出しの行は除外
+        if (not is_noise(section_title) and not NUMBER_HEADING_PATTERN.match(section_title)
+                and len(section_title) >= min_title_length and _markdown_table(index[first:first + 2], 0)[0] is None):
+            section_titles.add(section_title)
+
+    sections = []
+    current = None
+    starts, ends, flags = index.starts, index.ends, index.flags
+    for first, end in bounds:
+        # URLや引用番号を含まない行だけを残し、除いた行はその前に残した行の数とともに取っておく
+        if not any(flags[first:end]):
+            kept = range(first, end)
+            dropped = ()
+        else:
+            kept = []
+            dropped = []
+            for i in range(first, end):
+                if flags[i] & CITATION:
+                    dropped.append((len(kept), i))
+                else:
+                    kept.append(i)
+
+        title = index[kept[0]].strip() if kept else None
+        if title in section_titles:
+            # 新しいセクションの開始（見出しの行は本文に含めない）
+            flags[kept[0]] |= HEADING
+            current = Section(title, TextSpans(text), [])
+            sections.append(current)
+            kept = kept[1:]
+            offset = -1
+        elif current is not None:
+            # 同じセクションの続き
+            offset = len(current.lines)
+        else:
+            continue
+        current.lines.starts.extend([starts[i] for i in kept])
+        current.lines.ends.extend([ends[i] for i in kept])
+        for position, i in dropped:
+            anchor = max(offset + position, 0)
+            current.citations.extend((anchor, citation) for citation in extract_citations(index[i]))
+    return sections
+
+
+def table_cells(line):
+    """Markdown の表の行をセルのリストにする（"\\|" はセルの中の "|" とみなす）"""
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|') and not line.endswith('\\|'):
+        line = line[:-1]
+    return [cell.strip().replace('\\|', '|') for cell in re.split(r'(?<!\\)\|', line)]
+
+
+def _fit_cells(cells, width):
+    """行のセルの数を見出しの列数に合わせる（足りない列は空にし、余った列は最後の列につなげる）"""
+    if len(cells) > width:
+        return cells[:width - 1] + [' '.join(cells[width - 1:])]
+    return cells + [''] * (width - len(cells))
+
+
+def _markdown_table(lines, start):
+    """start の行から Markdown の表が始まる場合は (Table, 表の次の行の番号) を返す"""
+    if start + 1 >= len(lines) or '|' not in lines[start] or '|' not in lines[start + 1]:
+        return None, start
+    rule = lines[start + 1].strip()
+    header = table_cells(lines[start])
+    # 区切り行の列数は見出しと同じ（"---" だけの行は水平線なので表とみなさない）
+    if not TABLE_RULE_PATTERN.match(rule) or len(table_cells(rule)) != len(header):
+        return None, start
+    end = start + 2
+    rows = []
+    while end < len(lines) and '|' in lines[end] and lines[end].strip():
+        rows.append(_fit_cells(table_cells(lines[end]), len(header)))
+        end += 1
+    return Table(header, rows), end
+
+
+def _aligned_table(lines, start):
+    """start の行から列を揃えたデータが始まる場合は (Table, 表の次の行の番号) を返す"""
+    header = ALIGNED_COLUMN_PATTERN.split(lines[start].strip())
+    if len(header) < 2:
+        return None, start
+    end = start + 1
+    rows = []
+    while end < len(lines):
+        cells = ALIGNED_COLUMN_PATTERN.split(lines[end].strip())
+        if len(cells) != len(header):
+            break
+        rows.append(cells)
+        end += 1
+    if len(rows) + 1 < MIN_ALIGNED_ROWS:
+        return None, start
+    return Table(header, rows), end
+
+
+def split_tables(lines):
+    """
+    本文の行を、表とそれ以外の行のかたまりに分ける
+
+    Markdown の表（見出しの行と "|---|" の区切り行で始まる表）と、列をタブまたは
+    2 つ以上の空白で揃えた MIN_ALIGNED_ROWS 行以上のデータを表とみなします。
+
+    Args:
+        lines (list): 本文の行のリスト
+
+    Returns:
+        list: 行のリスト、または Table のリスト（本文の順番）。表がない場合は [lines]
+    """
+    return [block for block, _, _ in table_spans(lines)]
+
+
+def table_spans(lines):
+    """
+    split_tables と同じように分け、それぞれのかたまりが本文の何行目から何行目かを返す
+
+    Returns:
+        list: (行のリストまたは Table, 最初の行の番号, 最後の行の次の番号) のリスト
+    """
+    spans = []
+    text_start = 0
+    i = 0
+    while i < len(lines):
+        table, end = _markdown_table(lines, i)
+        if table is None:
+            table, end = _aligned_table(lines, i)
+        if table is None:
+            i += 1
+            continue
+        if i > text_start:
+            spans.append((lines[text_start:i], text_start, i))
+        spans.append((table, i, end))
+        i = text_start = end
+    if text_start < len(lines) or not spans:
+        spans.append((lines[text_start:], text_start, len(lines)))
+    return spans
+
+
+def summarize_intro(paragraphs, limit=500):
+    """
+    最初の段落（前置き）からまとめのテキストを作る
+
+    Args:
+        paragraphs (list): 段落のリスト
+        limit (int): 最大文字数。超える場合は末尾を "..." で省略する
+
+    Returns:
+        str: まとめのテキスト
+    """
+    if not paragraphs:
+        return "研究結果の主要ポイント"
+    # 最初の段落から要約を抽出（URLや参考文献を除外）
+    summary_lines = [line for line in paragraphs[0].split('\n') if not is_citation_line(line)]
+    summary_text = '\n'.join(summary_lines)
+
+    # 長すぎる場合は短縮
+    if len(summary_text) > limit:
+        summary_text = summary_text[:limit - 3] + "..."
+    return summary_text
+
+
+def extract_title_from_text(text):
+    """
+    テキストから適切なタイトルを抽出する
+
+    Args:
+        text (str): 入力テキスト
+
+    Returns:
+        str: 抽出されたタイトル
+    """
+    # 最初の空でない行をタイトルとして使用（BOM は strip では取り除かれない）。
+    # 大きな入力でもテキスト全体をコピーしたり行に分けたりしないよう、最初の行の範囲だけを探す
+    start = LEADING_BLANK_PATTERN.match(text).end()
+    end = text.find('\n', start)
+    first_line = text[start:end if end >= 0 else len(text)].strip()
+    # URLや参考文献を含まない場合のみ使用
+    if not is_citation_line(first_line):
+        return first_line
+
+    # 適切なタイトルが見つからない場合はデフォルト
+    return "研究結果"
+
+
+def extract_game_name(text):
+    """
+    ボードゲームの攻略情報からゲーム名を抽出する（最初の行、または「ゲーム名:」などの形式から）
+
+    Args:
+        text (str): 入力テキスト
+
+    Returns:
+        str: ゲーム名
+    """
+    game_name = text.strip().split('\n')[0]
+    if ':' in game_name:
+        game_name = game_name.split(':', 1)[1].strip()
+    return game_name
@@ -0,0 +1,380 @@
+"""
+プレゼンテーション作成処理の計測ユーティリティ
+
+各 create_* スクリプトの --profile オプション、または環境変数 SLIDE_PROFILE で
+有効化すると、フェーズごと・スライドごとの経過時間、CPU 時間、ピークメモリを記録し、
+作成したシェイプ数・ラン数・パーツ数とあわせて JSON レポートとして出力します。
+無効な場合、計測用の関数はすべて何もしません。
+
+使用例:
+    python -m deep_research_slide research research.txt --profile report.json
+    SLIDE_PROFILE=report.json SLIDE_PROFILE_PSTATS=run.pstats python create_presentation.py
+    python -m deep_research_slide.profiling aggregate reports/*.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 環境変数名
+PROFILE_ENV = "SLIDE_PROFILE"
+PSTATS_ENV = "SLIDE_PROFILE_PSTATS"
+
+# --profile をファイル名なしで指定した場合の出力先
+DEFAULT_REPORT = "profile_report.json"
+
+# 計測が無効な場合の起動コストを抑えるため、tracemalloc と cProfile は
+# 計測を開始するときに読み込む
+
+# 現在有効なプロファイラ（無効な場合は None）
+_active = None
+
+
+class Profiler:
+    """
+    1 回のプレゼンテーション作成を計測するクラス
+
+    Args:
+        entry (str): 計測対象のエントリポイント名
+        report_path (str): JSON レポートの出力先
+        pstats_path (str): cProfile の統計情報の出力先（None の場合は出力しない）
+    """
+
+    def __init__(self, entry, report_path=DEFAULT_REPORT, pstats_path=None):
+        self.entry = entry
+        self.report_path = report_path
+        self.pstats_path = pstats_path
+        self.phases = {}
+        self.slides = []
+        self.counts = {}
+        self._cprofile = None
+        if pstats_path:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+        self._started_tracing = False
+        self._start_wall = None
+        self._start_cpu = None
+        # tracemalloc のピークは 1 つしかないため、入れ子の計測が始まるたびにリセットする前に、
+        # それまでのピークを開いている計測（外側のフェーズなど）と全体のピークに繰り込む
+        self._open_peaks = []
+        self._total_peak = 0
+
+    def start(self):
+        """計測を開始する"""
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        self._total_peak = 0
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+
+    @contextmanager
+    def measure(self):
+        """
+        ブロックの経過時間、CPU 時間、ピークメモリを計測する
+
+        Yields:
+            dict: ブロック終了時に wall / cpu / peak_kb が書き込まれる辞書
+        """
+        import tracemalloc
+        result = {}
+        self._fold_peak()
+        tracemalloc.reset_peak()
+        peak = [0]
+        self._open_peaks.append(peak)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield result
+        finally:
+            result["wall"] = time.perf_counter() - wall
+            result["cpu"] = time.process_time() - cpu
+            self._fold_peak()
+            self._open_peaks.pop()
+            result["peak_kb"] = peak[0] / 1024
+
+    def _fold_peak(self):
+        """前回のリセットからの tracemalloc のピークを、開いている計測と全体のピークに繰り込む"""
+        import tracemalloc
+        current = tracemalloc.get_traced_memory()[1]
+        for peak in self._open_peaks:
+            peak[0] = max(peak[0], current)
+        self._total_peak = max(self._total_peak, current)
+
+    @contextmanager
+    def phase(self, name):
+        """フェーズ（解析、描画、保存など）を計測する。同名のフェーズは合算される"""
+        with self.measure() as result:
+            yield
+        stats = self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0, "peak_kb": 0.0, "calls": 0})
+        stats["wall"] += result["wall"]
+        stats["cpu"] += result["cpu"]
+        stats["peak_kb"] = max(stats["peak_kb"], result["peak_kb"])
+        stats["calls"] += 1
+
+    @contextmanager
+    def slide(self, label):
+        """スライド 1 枚の作成を計測する"""
+        with self.measure() as result:
+            yield
+        result["index"] = len(self.slides) + 1
+        result["title"] = label
+        self.slides.append(result)
+
+    def record_presentation(self, prs):
+        """
+        保存直前のプレゼンテーションからシェイプ数・ラン数・パーツ数を数える
+
+        Args:
+            prs: プレゼンテーションオブジェクト
+        """
+        shapes = 0
+        runs = 0
+        for slide in prs.slides:
+            for shape in slide.shapes:
+                shapes += 1
+                if shape.has_text_frame:
+                    for paragraph in shape.text_frame.paragraphs:
+                        runs += len(paragraph.runs)
+                elif shape.has_table:
+                    runs += len(shape._element.xpath('.//a:tc//a:r'))
+        self.record_counts(
+            slides=len(prs.slides),
+            shapes=shapes,
+            runs=runs,
+            parts=sum(1 for _ in prs.part.package.iter_parts()),
+        )
+
+    def record_counts(self, slides, shapes, runs, parts):
+        """python-pptx を使わずに作成したプレゼンテーションの規模を記録する"""
+        self.counts = {"slides": slides, "shapes": shapes, "runs": runs, "parts": parts}
+
+    def stop(self):
+        """
+        計測を終了し、レポートを書き出す
+
+        Returns:
+            dict: レポートの内容
+        """
+        import tracemalloc
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.pstats_path)
+        self._fold_peak()
+        report = {
+            "entry": self.entry,
+            "total": {
+                "wall": time.perf_counter() - self._start_wall,
+                "cpu": time.process_time() - self._start_cpu,
+                "peak_kb": self._total_peak / 1024,
+            },
+            "max_rss_kb": _max_rss_kb(),
+            "phases": self.phases,
+            "slides": self.slides,
+            "counts": self.counts,
+        }
+        if self._started_tracing:
+            tracemalloc.stop()
+        if self.report_path:
+            with open(self.report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"計測結果を {self.report_path} に保存しました。", file=sys.stderr)
+        return report
+
+
+def _max_rss_kb():
+    """プロセスの最大常駐メモリ（KB）を返す。取得できない環境では None"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS はバイト単位、Linux は KB 単位
+    return rss / 1024 if sys.platform == "darwin" else rss
+
+
+def add_profile_arguments(parser):
+    """
+    引数パーサーに計測用のオプションを追加する
+
+    Args:
+        parser: argparse.ArgumentParser
+    """
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_REPORT, metavar='REPORT',
+                        help=f'処理時間とメモリを計測し、JSON レポートを出力する（既定: {DEFAULT_REPORT}）')
+    parser.add_argument('--profile-pstats', metavar='FILE',
+                        help='cProfile の統計情報を pstats 形式で出力する')
+
+
+def start(entry, report_path=None, pstats_path=None):
+    """
+    計測を開始する。引数が指定されていない場合は環境変数を参照し、
+    どちらも無ければ何もしない
+
+    Args:
+        entry (str): エントリポイント名
+        report_path (str): JSON レポートの出力先
+        pstats_path (str): cProfile の統計情報の出力先
+
+    Returns:
+        Profiler: 有効になったプロファイラ（無効な場合は None）
+    """
+    global _active
+    if report_path is None:
+        report_path = os.environ.get(PROFILE_ENV) or None
+        if report_path == "1":
+            report_path = DEFAULT_REPORT
+    if pstats_path is None:
+        pstats_path = os.environ.get(PSTATS_ENV) or None
+    if report_path is None and pstats_path is None:
+        return None
+    _active = Profiler(entry, report_path, pstats_path)
+    _active.start()
+    return _active
+
+
+def start_from_args(entry, args):
+    """argparse の結果から計測を開始する"""
+    return start(entry, getattr(args, "profile", None), getattr(args, "profile_pstats", None))
+
+
+def stop():
+    """
+    計測を終了してレポートを書き出す
+
+    Returns:
+        dict: レポートの内容（計測が無効な場合は None）
+    """
+    global _active
+    if _active is None:
+        return None
+    profiler, _active = _active, None
+    return profiler.stop()
+
+
+@contextmanager
+def phase(name):
+    """フェーズを計測する。計測が無効な場合は何もしない"""
+    if _active is None:
+        yield
+    else:
+        with _active.phase(name):
+            yield
+
+
+@contextmanager
+def slide(label):
+    """スライド 1 枚の作成を計測する。計測が無効な場合は何もしない"""
+    if _active is None:
+        yield
+    else:
+        with _active.slide(label):
+            yield
+
+
+def record_presentation(prs):
+    """保存前のプレゼンテーションの規模を記録する。計測が無効な場合は何もしない"""
+    if _active is not None:
+        _active.record_presentation(prs)
+
+
+def record_counts(slides, shapes, runs, parts):
+    """スライド数・シェイプ数・ラン数・パーツ数を記録する。計測が無効な場合は何もしない"""
+    if _active is not None:
+        _active.record_counts(slides, shapes, runs, parts)
+
+
+def _percentile(values, q):
+    """ソート済みの値から線形補間でパーセンタイルを求める"""
+    if not values:
+        return None
+    pos = (len(values) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (pos - lower)
+
+
+def summarize(values):
+    """
+    値の件数、パーセンタイル（p50 / p90 / p99）、最大値を求める
+
+    Args:
+        values (list): 数値のリスト
+
+    Returns:
+        dict: 集計結果
+    """
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50": _percentile(values, 50),
+        "p90": _percentile(values, 90),
+        "p99": _percentile(values, 99),
+        "max": values[-1] if values else None,
+    }
+
+
+def aggregate(reports):
+    """
+    複数の計測レポートを集計し、パーセンタイルを求める
+
+    Args:
+        reports (list): レポート（dict）のリスト
+
+    Returns:
+        dict: 全体・フェーズごと・スライドごとのパーセンタイル
+    """
+    totals = {"wall": [], "cpu": [], "peak_kb": []}
+    phases = {}
+    slide_walls = []
+    for report in reports:
+        for key in totals:
+            totals[key].append(report["total"][key])
+        for name, stats in report["phases"].items():
+            phases.setdefault(name, {"wall": [], "cpu": [], "peak_kb": []})
+            for key in ("wall", "cpu", "peak_kb"):
+                phases[name][key].append(stats[key])
+        slide_walls.extend(s["wall"] for s in report["slides"])
+    return {
+        "reports": len(reports),
+        "total": {key: summarize(values) for key, values in totals.items()},
+        "phases": {
+            name: {key: summarize(values) for key, values in stats.items()}
+            for name, stats in phases.items()
+        },
+        "slide_wall": summarize(slide_walls),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='計測レポートを扱います。')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    agg = subparsers.add_parser('aggregate', help='複数のレポートをパーセンタイルに集計する')
+    agg.add_argument('reports', nargs='+', help='--profile で出力した JSON レポート')
+    agg.add_argument('-o', '--output', help='集計結果の出力先（省略時は標準出力）')
+
+    args = parser.parse_args()
+
+    reports = []
+    for path in args.reports:
+        with open(path, 'r', encoding='utf-8') as f:
+            reports.append(json.load(f))
+    result = json.dumps(aggregate(reports), ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(result)
+    else:
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,544 @@
+"""
+プレゼンテーション描画の共通処理
+
+研究結果やボードゲームのデッキは、まずスライドの構成（Slide のリスト）を組み立て、
+それをテーマに沿って python-pptx で描画します。スライドの追加、背景、文字の装飾、
+長い本文や表の分割、保存はすべてこのモジュールで行います。
+
+python-pptx の読み込みは重いため、描画する関数の中で読み込みます。
+"""
+from collections import namedtuple
+
+from . import profiling
+from .parsing import Table, table_spans
+
+# kind: スライドの種類（"title", "toc", "section", "table", "summary"）、title: タイトル、
+# lines: 本文の行のリスト（タイトルスライドの場合は [サブタイトル, 日付]）、
+# links: 本文の行ごとのリンク先のスライド番号（1 から、None の行はリンクなし。省略時はリンクなし）、
+# table: 表のスライドに載せる Table（kind が "table" の場合だけ）、
+# notes: スピーカーノートに載せる行のリスト（None の場合はノートを作らない）
+Slide = namedtuple("Slide", "kind title lines links table notes", defaults=(None, None, None))
+
+# スライドの種類ごとの文字サイズ（タイトル, 本文）
+SIZES = {
+    "title": (44, 28),
+    "toc": (40, 24),
+    "section": (36, 18),
+    "table": (36, 14),
+    "summary": (40, 24),
+}
+
+# 1 枚のスライドに載せる本文の最大文字数
+MAX_SLIDE_CHARS = 1500
+
+# 表の 1 枚あたりのデータの行数（見出しの行は各スライドに繰り返す）
+MAX_TABLE_ROWS = 12
+
+# 目次の 1 枚あたりの項目数
+TOC_ENTRIES_PER_SLIDE = 10
+
+# 出力方法（"pptx": python-pptx で描画、"fast": fastwriter で XML を直接書き出す）
+WRITERS = ("pptx", "fast")
+
+# スライドレイアウトの番号
+TITLE_LAYOUT = 0    # タイトルスライド
+CONTENT_LAYOUT = 1  # タイトルと内容のスライド
+TITLE_ONLY_LAYOUT = 5  # タイトルのみのスライド（表のスライド）
+
+
+def split_chunks(content, max_chars=MAX_SLIDE_CHARS):
+    """
+    長い本文を行単位でスライドに収まる長さに分割する
+
+    Args:
+        content (str): 本文
+        max_chars (int): 1 枚あたりの最大文字数
+
+    Returns:
+        list: 分割した本文のリスト
+    """
+    return ['\n'.join(chunk) for chunk in chunk_lines(content.split('\n'), max_chars)]
+
+
+def chunk_lines(lines, max_chars=MAX_SLIDE_CHARS):
+    """
+    本文の行を、改行でつないだ長さがスライドに収まるかたまりに分割する（split_chunks の行のリスト版）
+
+    Args:
+        lines (list): 本文の行のリスト
+        max_chars (int): 1 枚あたりの最大文字数
+
+    Returns:
+        list: 行のリストのリスト（最初の行だけで max_chars を超える場合は、先頭が [''] になる）
+    """
+    if sum(len(line) for line in lines) + len(lines) - 1 <= max_chars:
+        return [list(lines) or ['']]
+
+    chunks = []
+    current_chunk = []
+    current_length = 0
+    for line in lines:
+        line_length = len(line)
+        if current_length + line_length > max_chars:
+            chunks.append(current_chunk or [''])
+            current_chunk = [line]
+            current_length = line_length
+        else:
+            current_chunk.append(line)
+            current_length += line_length
+
+    if current_chunk:
+        chunks.append(current_chunk)
+    return chunks
+
+
+def section_pages(lines, max_chars=MAX_SLIDE_CHARS, max_rows=MAX_TABLE_ROWS):
+    """
+    セクションの本文を 1 枚ずつのページに分ける
+
+    表は max_rows 行ずつに分け、各ページに見出しの行を付けます。
+    表の間の空行だけのかたまりはページにしません。
+
+    Args:
+        lines (list): 本文の行のリスト
+        max_chars (int): 1 枚あたりの最大文字数
+        max_rows (int): 表の 1 枚あたりのデータの行数
+
+    Returns:
+        list: ページ（本文の行のリスト、または Table）のリスト
+    """
+    return [page for page, _ in _page_spans(lines, max_chars, max_rows)]
+
+
+def _page_spans(lines, max_chars, max_rows):
+    """section_pages のページと、各ページが始まる本文の行の番号の組のリストを返す"""
+    # 解析した本文はテキストの範囲のビュー（lineindex.TextSpans）のため、ここで文字列にする
+    lines = list(lines)
+    spans = table_spans(lines)
+    pages = []
+    for block, start, end in spans:
+        if isinstance(block, Table):
+            # 見出しの行（と Markdown の区切り行）は最初のページに含める
+            first_row = end - len(block.rows)
+            for offset in range(0, max(len(block.rows), 1), max_rows):
+                page = Table(block.header, block.rows[offset:offset + max_rows])
+                pages.append((page, first_row + offset if offset else start))
+        elif len(spans) == 1 or any(line.strip() for line in block):
+            for index, page in enumerate(chunk_lines(block, max_chars)):
+                pages.append((page, start))
+                # chunk_lines は最初の行だけで max_chars を超える場合、行を含まない空のページを先に作る
+                if index or page != [''] or not block or len(block[0]) <= max_chars:
+                    start += len(page)
+    return pages
+
+
+def plan_section(title, lines, max_chars=MAX_SLIDE_CHARS, citations=()):
+    """
+    セクションのスライドを組み立てる。長い場合は「続き」のスライドに分割する
+
+    本文の中の表は、表のスライド（kind が "table"）にします。引用は、除外する前に
+    その直前にあった本文の行を載せたスライドのスピーカーノートに載せます。
+
+    Args:
+        title (str): セクションの見出し
+        lines (list): 本文の行のリスト
+        max_chars (int): 1 枚あたりの最大文字数
+        citations (list): (直前までの本文の行数, 引用のテキスト) のリスト（Section.citations）
+
+    Returns:
+        list: Slide のリスト
+    """
+    spans = _page_spans(lines, max_chars, MAX_TABLE_ROWS)
+    notes = [[] for _ in spans]
+    for anchor, citation in citations:
+        # 直前の行（anchor - 1 行目）を含むページ。行がない場合は最初のページ
+        index = max(sum(1 for _, start in spans if start < anchor) - 1, 0)
+        if citation not in notes[index]:
+            notes[index].append(citation)
+
+    slides = []
+    for i, ((page, _), page_notes) in enumerate(zip(spans, notes)):
+        page_title = f"{title} (続き {i}/{len(spans) - 1})" if i else title
+        page_notes = page_notes or None
+        if isinstance(page, Table):
+            slides.append(Slide("table", page_title, [], table=page, notes=page_notes))
+        else:
+            slides.append(Slide("section", page_title, page, notes=page_notes))
+    return slides
+
+
+def section_slide_count(lines, max_chars=MAX_SLIDE_CHARS):
+    """plan_section で作られるスライドの枚数を返す（目次のページ番号の計算に使う）"""
+    return len(section_pages(lines, max_chars))
+
+
+def toc_slide_count(entry_count, per_slide=TOC_ENTRIES_PER_SLIDE):
+    """目次の項目数から、目次のスライドの枚数を返す"""
+    return max(1, -(-entry_count // per_slide))
+
+
+def plan_toc(entries, per_slide=TOC_ENTRIES_PER_SLIDE):
+    """
+    目次のスライドを組み立てる。項目が多い場合は複数のスライドに分ける
+
+    Args:
+        entries (list): (項目のテキスト, リンク先のスライド番号（None の場合はリンクなし）) のリスト
+        per_slide (int): 1 枚あたりの項目数
+
+    Returns:
+        list: Slide のリスト（toc_slide_count(len(entries)) 枚）
+    """
+    pages = [entries[i:i + per_slide] for i in range(0, len(entries), per_slide)] or [[]]
+    slides = []
+    for i, page in enumerate(pages):
+        title = "目次" if i == 0 else f"目次 (続き {i}/{len(pages) - 1})"
+        lines = [text for text, _ in page] + [""]
+        links = [target for _, target in page] + [None]
+        slides.append(Slide("toc", title, lines, links if any(links) else None))
+    return slides
+
+
+def rgb(color):
+    """(R, G, B) のタプルを RGBColor に変換する"""
+    from pptx.dml.color import RGBColor
+    return RGBColor(*color)
+
+
+def style_runs(text_frame, color=None, size=None, bold=None, italic=None):
+    """
+    テキストフレーム内のすべてのランの書式を設定する
+
+    Args:
+        text_frame: テキストフレーム
+        color (tuple): 文字色（None の場合は変更しない）
+        size (int): 文字サイズ（ポイント、None の場合は変更しない）
+        bold (bool): 太字（None の場合は変更しない）
+        italic (bool): 斜体（None の場合は変更しない）
+    """
+    from pptx.util import Pt
+    color = rgb(color) if color is not None else None
+    size = Pt(size) if size is not None else None
+    for paragraph in text_frame.paragraphs:
+        for run in paragraph.runs:
+            if color is not None:
+                run.font.color.rgb = color
+            if size is not None:
+                run.font.size = size
+            if bold is not None:
+                run.font.bold = bold
+            if italic is not None:
+                run.font.italic = italic
+
+
+def add_background(prs, slide, color, transparency=None):
+    """
+    スライド全面に背景色の矩形を追加する
+
+    Args:
+        prs: プレゼンテーションオブジェクト
+        slide: スライド
+        color (tuple): 背景色
+        transparency (float): 透明度（None の場合は不透明で、影と枠線を消す）
+
+    Returns:
+        追加した矩形
+    """
+    from pptx.enum.shapes import MSO_SHAPE
+    background = slide.shapes.add_shape(
+        MSO_SHAPE.RECTANGLE, 0, 0, prs.slide_width, prs.slide_height
+    )
+    fill = background.fill
+    fill.solid()
+    fill.fore_color.rgb = rgb(color)
+    if transparency is not None:
+        # python-pptx には透明度を設定する API がないため、色の要素に a:alpha を追加する
+        from lxml import etree
+        from pptx.oxml.ns import qn
+        color_element = background._element.spPr.find(qn('a:solidFill'))[0]
+        etree.SubElement(color_element, qn('a:alpha'), val=str(int((1 - transparency) * 100000)))
+    else:
+        background.line.fill.background()
+        background.shadow.inherit = False
+        # 背景を最背面に配置（シェイプは追加した順に重なるため、プレースホルダーより前に移す）
+        sp_tree = slide.shapes._spTree
+        sp_tree.remove(background._element)
+        sp_tree.insert(2, background._element)
+    return background
+
+
+def new_presentation():
+    """既定のテンプレートからプレゼンテーションを作成する"""
+    from pptx import Presentation
+    with profiling.phase("setup"):
+        return Presentation()
+
+
+def add_slide(prs, spec, theme):
+    """
+    Slide の内容をテーマに沿って描画し、プレゼンテーションに追加する
+
+    Args:
+        prs: プレゼンテーションオブジェクト
+        spec (Slide): スライドの内容
+        theme (Theme): カラーテーマ
+
+    Returns:
+        追加したスライド
+    """
+    layouts = {"title": TITLE_LAYOUT, "table": TITLE_ONLY_LAYOUT}
+    slide = prs.slides.add_slide(prs.slide_layouts[layouts.get(spec.kind, CONTENT_LAYOUT)])
+
+    # 暗いテーマの場合は背景を暗く
+    if theme.dark:
+        add_background(prs, slide, theme.background)
+
+    title_size, body_size = SIZES[spec.kind]
+    title_shape = slide.shapes.title
+
+    title_shape.text = spec.title
+    style_runs(title_shape.text_frame, theme.title, title_size, bold=True)
+
+    if spec.kind == "table":
+        add_table(slide, spec.table, theme)
+        return slide
+
+    body_shape = slide.placeholders[1]
+    if spec.kind == "title":
+        body_shape.text = spec.lines[0]
+        style_runs(body_shape.text_frame, theme.subtitle, body_size, italic=True)
+        if len(spec.lines) > 1:
+            add_date(slide, spec.lines[1], theme.subtitle)
+    else:
+        body_shape.text = '\n'.join(spec.lines)
+        style_runs(body_shape.text_frame, theme.text, body_size)
+    return slide
+
+
+def add_table(slide, table, theme):
+    """
+    スライドに表を追加する
+
+    python-pptx のセルごとの text_frame の操作は遅いため、fastwriter と同じ a:tbl の XML を
+    まとめて組み立て、シェイプとしてそのまま追加します。
+
+    Args:
+        slide: スライド
+        table (Table): 表の内容
+        theme (Theme): カラーテーマ
+    """
+    from pptx.oxml import parse_xml
+    from .fastwriter import table_frame_xml
+    slide.shapes._spTree.append(parse_xml(table_frame_xml(table, theme, slide.shapes._next_shape_id)))
+
+
+def add_date(slide, date_text, color):
+    """タイトルスライドの右下に日付を追加する"""
+    from pptx.util import Inches, Pt
+    from pptx.enum.text import PP_ALIGN
+    date_box = slide.shapes.add_textbox(
+        Inches(0.5), Inches(5), Inches(9), Inches(0.5)
+    )
+    date_p = date_box.text_frame.add_paragraph()
+    date_p.text = date_text
+    date_p.alignment = PP_ALIGN.RIGHT
+    date_run = date_p.runs[0]
+    date_run.font.size = Pt(12)
+    if color is not None:
+        date_run.font.color.rgb = rgb(color)
+
+
+def render_slides(prs, slides, theme):
+    """
+    スライドの構成をまとめて描画する
+
+    Args:
+        prs: プレゼンテーションオブジェクト
+        slides (iterable): Slide の並び（リストまたはジェネレーター）
+        theme (Theme): カラーテーマ
+    """
+    linked = []
+    with profiling.phase("render"):
+        for spec in slides:
+            with profiling.slide(spec.title):
+                slide = add_slide(prs, spec, theme)
+                if spec.notes:
+                    add_notes(slide, spec.notes)
+            if spec.links:
+                linked.append((slide, spec.links))
+        # リンク先のスライドがすべてそろってからリンクを付ける
+        for slide, links in linked:
+            add_links(prs, slide, links)
+
+
+def add_notes(slide, notes):
+    """
+    スライドのスピーカーノートに行を書き込む
+
+    python-pptx は slide.notes_slide に最初にアクセスしたときにノートマスターとノートの
+    パーツを作るため、ノートのあるスライドだけで呼び出します。
+
+    Args:
+        slide: スライド
+        notes (list): ノートの行のリスト
+    """
+    slide.notes_slide.notes_text_frame.text = '\n'.join(notes)
+
+
+def add_links(prs, slide, links):
+    """
+    本文の段落に、同じプレゼンテーションのほかのスライドへのリンクを付ける
+
+    Args:
+        prs: プレゼンテーションオブジェクト
+        slide: リンクを付けるスライド
+        links (list): 段落ごとのリンク先のスライド番号（1 から、None の段落はリンクなし）
+    """
+    from lxml import etree
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.oxml.ns import qn
+    paragraphs = slide.placeholders[1].text_frame.paragraphs
+    for paragraph, target in zip(paragraphs, links):
+        if target is None:
+            continue
+        r_id = slide.part.relate_to(prs.slides[target - 1].part, RT.SLIDE)
+        for run in paragraph.runs:
+            # python-pptx のランのハイパーリンクは外部の URL だけのため、スライドへのジャンプは要素を直接追加する
+            etree.SubElement(run._r.get_or_add_rPr(), qn('a:hlinkClick'),
+                             {qn('r:id'): r_id, 'action': 'ppaction://hlinksldjump'})
+
+
+def save_presentation(prs, output_file, workers=None):
+    """
+    プレゼンテーションを保存する。パーツの圧縮は zipwriter で並列に行う
+
+    Args:
+        prs: プレゼンテーションオブジェクト
+        output_file (str): 出力するファイル名、または書き込み可能なファイルオブジェクト
+        workers (int): 圧縮に使うスレッド数（None の場合は CPU 数、1 の場合は並列化しない）
+    """
+    from .zipwriter import save_package
+    profiling.record_presentation(prs)
+    with profiling.phase("save"):
+        save_package(prs, output_file, workers)
+
+
+def slide_bytes(spec):
+    """スライドのテキストの UTF-8 でのバイト数（出力サイズの見積もりに使う）"""
+    size = len(spec.title.encode("utf-8")) + sum(len(line.encode("utf-8")) for line in spec.lines)
+    if spec.table is not None:
+        for row in [spec.table.header] + spec.table.rows:
+            size += sum(len(cell.encode("utf-8")) for cell in row)
+    return size
+
+
+def split_volumes(groups, max_slides=None, max_bytes=None, reserved_slides=0):
+    """
+    スライドのまとまり（セクションなど）を、上限に収まるボリュームに先頭から詰めて分ける
+
+    まとまりの途中では分けません。1 つのまとまりだけで上限を超える場合は、
+    そのまとまりだけで 1 つのボリュームにします。
+
+    Args:
+        groups (list): Slide のリストのリスト
+        max_slides (int): 1 ボリュームあたりの最大スライド数（None の場合は制限しない）
+        max_bytes (int): 1 ボリュームあたりのテキストの最大バイト数（None の場合は制限しない）
+        reserved_slides (int): 各ボリュームに別に追加するスライドの数（タイトルや目次）
+
+    Returns:
+        list: ボリュームごとの groups の番号のリストのリスト
+    """
+    volumes = [[]]
+    slides = total = 0
+    for index, group in enumerate(groups):
+        count = len(group)
+        size = sum(slide_bytes(spec) for spec in group)
+        over = ((max_slides is not None and reserved_slides + slides + count > max_slides)
+                or (max_bytes is not None and total + size > max_bytes))
+        if over and volumes[-1]:
+            volumes.append([])
+            slides = total = 0
+        volumes[-1].append(index)
+        slides += count
+        total += size
+    return volumes
+
+
+def build_presentation(slides, theme, output_file, writer="pptx", workers=None):
+    """
+    スライドの構成からプレゼンテーションを作成して保存する
+
+    writer="fast" の場合はスライドを 1 枚ずつ書き込むため、slides にジェネレーターを
+    渡すと使用メモリがデッキの長さによらずほぼ一定になります。python-pptx は保存するまで
+    すべてのスライドをメモリに持つため、writer="pptx" では一定になりません。
+
+    Args:
+        slides (iterable): Slide の並び（リストまたはジェネレーター）
+        theme (Theme): カラーテーマ
+        output_file (str): 出力するファイル名、または書き込み可能なファイルオブジェクト
+        writer (str): 出力方法（"pptx" または "fast"）
+        workers (int): 保存時の圧縮に使うスレッド数（None の場合は CPU 数）
+    """
+    if writer == "fast":
+        from .fastwriter import write_presentation
+        write_presentation(slides, theme, output_file, workers)
+        return
+    if writer != "pptx":
+        raise ValueError(f"未知の出力方法です: {writer}")
+
+    prs = new_presentation()
+    render_slides(prs, slides, theme)
+    save_presentation(prs, output_file, workers)
+
+
+def build_presentations(slides, themes, output_files, writer="pptx", workers=None, jobs=1):
+    """
+    同じスライドの構成を複数のテーマで描画し、テーマごとに保存する
+
+    解析は 1 回で済ませ、writer="fast" の場合はテーマによらない XML（エスケープした
+    本文や段落）も 1 回だけ組み立てて、テーマごとに色と文字サイズだけを当てます。
+    jobs が 2 以上の場合はテーマごとの描画と保存をプロセスプールで並列に行います。
+
+    Args:
+        slides (iterable): Slide の並び
+        themes (list): Theme のリスト
+        output_files (list): テーマごとの出力するファイル名
+        writer (str): 出力方法（"pptx" または "fast"）
+        workers (int): 保存時の圧縮に使うスレッド数（None の場合は CPU 数）
+        jobs (int): 並列に描画するテーマの数（1 の場合は順番に描画する）
+    """
+    if writer == "fast":
+        from .fastwriter import compile_slides
+        slides = compile_slides(slides)
+    elif writer == "pptx":
+        slides = list(slides)
+    else:
+        raise ValueError(f"未知の出力方法です: {writer}")
+
+    build_batch([(slides, theme, output_file) for theme, output_file in zip(themes, output_files)],
+                writer, workers, jobs)
+
+
+def build_batch(tasks, writer="pptx", workers=None, jobs=1):
+    """
+    複数のプレゼンテーションを作成して保存する
+
+    Args:
+        tasks (list): (Slide のリスト, Theme, 出力するファイル名) のリスト
+        writer (str): 出力方法（"pptx" または "fast"）
+        workers (int): 保存時の圧縮に使うスレッド数（None の場合は CPU 数）
+        jobs (int): 並列に作成するプレゼンテーションの数（1 の場合は順番に作成する）
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        for slides, theme, output_file in tasks:
+            build_presentation(slides, theme, output_file, writer, workers)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    from . import reproducible
+    # 子プロセスでも zip のタイムスタンプに同じ日時を使う
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=reproducible.set_build_time,
+                             initargs=(reproducible.fixed_build_time(),)) as executor:
+        futures = [executor.submit(build_presentation, slides, theme, output_file, writer, workers)
+                   for slides, theme, output_file in tasks]
+        for future in futures:
+            future.result()
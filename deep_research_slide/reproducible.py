@@ -0,0 +1,118 @@
+"""
+再現可能な出力（同じ入力から同じバイト列の .pptx を作る）
+
+通常はタイトルスライドの日付、既定の出力ファイル名、zip の各エントリーの
+タイムスタンプに現在時刻を使うため、同じ入力でも実行のたびに出力が変わります。
+再現可能モードではこれらに固定の日時を使います。日時は次の順に決まります。
+
+1. set_build_time() で指定した日時（コマンドラインの --build-date）
+2. 環境変数 SOURCE_DATE_EPOCH（https://reproducible-builds.org/specs/source-date-epoch/）
+3. enable() で再現可能モードにした場合は DEFAULT_BUILD_TIME
+
+どれにも当てはまらない場合は現在時刻を使います。シェイプの ID や
+リレーションシップの ID、zip のエントリーの順番は、もともと入力だけで決まります。
+"""
+import os
+import re
+import time
+from datetime import datetime, timezone
+
+# 日時を指定せずに再現可能モードにした場合の日時
+DEFAULT_BUILD_TIME = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+# zip のタイムスタンプに書ける最も古い日時
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+# Office 文書のプロパティ（docProps/core.xml）の作成・更新日時
+CORE_DATE_PATTERN = re.compile(r'(<dcterms:(?:created|modified)\b[^>]*>)[^<]*(</dcterms:)')
+
+_build_time = None
+
+
+def enable():
+    """再現可能モードにする（日時が決まっていなければ DEFAULT_BUILD_TIME を使う）"""
+    global _build_time
+    if _build_time is None and source_date_epoch() is None:
+        _build_time = DEFAULT_BUILD_TIME
+
+
+def set_build_time(value):
+    """
+    出力に使う日時を固定する
+
+    Args:
+        value (datetime): 日時（None の場合は固定を解除する）
+    """
+    global _build_time
+    _build_time = value
+
+
+def parse_build_date(text):
+    """
+    "YYYY-MM-DD" の形式の日付を UTC の datetime に変換する（argparse の type に使う）
+
+    Args:
+        text (str): 日付
+
+    Returns:
+        datetime: 日時
+    """
+    return datetime.strptime(text, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+
+def source_date_epoch():
+    """環境変数 SOURCE_DATE_EPOCH の日時（UTC）を返す。未設定の場合は None"""
+    value = os.environ.get("SOURCE_DATE_EPOCH")
+    if not value:
+        return None
+    return datetime.fromtimestamp(int(value), timezone.utc)
+
+
+def fixed_build_time():
+    """固定された日時を返す。再現可能モードでない場合は None"""
+    return _build_time or source_date_epoch()
+
+
+def is_enabled():
+    """再現可能モードかどうか"""
+    return fixed_build_time() is not None
+
+
+def build_time():
+    """出力に使う日時（再現可能モードでなければ現在時刻）"""
+    return fixed_build_time() or datetime.now()
+
+
+def zip_date_time():
+    """zip のエントリーに書くタイムスタンプ（年, 月, 日, 時, 分, 秒）"""
+    fixed = fixed_build_time()
+    if fixed is None:
+        return time.localtime(time.time())[:6]
+    return max(ZIP_EPOCH, fixed.timetuple()[:6])
+
+
+def normalize_xlsx(blob):
+    """
+    グラフに埋め込む Excel ブックの作成日時とタイムスタンプを固定の日時にする
+
+    python-pptx はグラフのデータを XlsxWriter で作ったブックとして埋め込みますが、
+    ブックのプロパティには作成した時刻が入るため、そのままでは出力が毎回変わります。
+
+    Args:
+        blob (bytes): .xlsx の内容
+
+    Returns:
+        bytes: 日時を書き換えた .xlsx の内容
+    """
+    import io
+    import zipfile
+    stamp = fixed_build_time().strftime("%Y-%m-%dT%H:%M:%SZ")
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(blob)) as src, zipfile.ZipFile(output, "w") as dst:
+        for info in src.infolist():
+            data = src.read(info)
+            if info.filename == "docProps/core.xml":
+                data = CORE_DATE_PATTERN.sub(rf"\g<1>{stamp}\g<2>", data.decode("utf-8")).encode("utf-8")
+            info.date_time = zip_date_time()
+            dst.writestr(info, data)
+    return output.getvalue()
@@ -0,0 +1,353 @@
+"""
+OpenAI の DeepResearch の結果をプレゼンテーションにまとめる
+"""
+import os
+
+from . import profiling, reproducible
+from .parsing import (
+    drop_references, extract_title_from_text, parse_sections, split_paragraphs, summarize_intro,
+)
+from .render import (
+    Slide, build_batch, build_presentation, build_presentations, plan_section, plan_toc, section_slide_count,
+    split_volumes, toc_slide_count,
+)
+from .themes import get_theme
+
+__all__ = [
+    "create_deep_research_presentation",
+    "create_deep_research_presentations",
+    "create_research_presentation",
+    "extract_title_from_text",
+    "iter_research_deck",
+    "parse_research",
+    "plan_research_deck",
+    "plan_research_volumes",
+]
+
+
+def parse_research(research_text, dedupe=None, dedupe_mode="drop"):
+    """
+    研究結果のテキストを段落とセクションに分ける
+
+    Args:
+        research_text (str): DeepResearchの結果テキスト
+        dedupe (float): ほぼ同じ内容の行やセクションを取り除くしきい値（0〜1、None の場合は取り除かない）
+        dedupe_mode (str): 重複したセクションの扱い（"drop": 取り除く、"fold": 先のセクションにまとめる）
+
+    Returns:
+        tuple: (段落のリスト, Section のリスト)
+    """
+    with profiling.phase("parse"):
+        # テキストを段落に分割し、参考文献セクションを除外
+        paragraphs = drop_references(split_paragraphs(research_text))
+        sections = parse_sections(paragraphs)
+    if dedupe is not None:
+        from .dedup import dedupe_sections
+        with profiling.phase("dedupe"):
+            sections, _ = dedupe_sections(sections, dedupe, dedupe_mode)
+    return paragraphs, sections
+
+
+def iter_research_deck(research_text, title="研究結果", date_text=None, dedupe=None, dedupe_mode="drop"):
+    """
+    研究結果のテキストを解析し、スライドの構成を 1 枚ずつ返すイテレーターを作る
+
+    解析はこの関数の中で済ませ、スライドは描画するときに 1 枚ずつ組み立てます。
+
+    Args:
+        research_text (str): DeepResearchの結果テキスト
+        title (str): プレゼンテーションのタイトル
+        date_text (str): タイトルスライドに表示する日付（None の場合は表示しない）
+        dedupe (float): ほぼ同じ内容の行やセクションを取り除くしきい値（None の場合は取り除かない）
+        dedupe_mode (str): 重複したセクションの扱い（"drop" または "fold"）
+
+    Returns:
+        iterator: Slide のイテレーター
+    """
+    paragraphs, sections = parse_research(research_text, dedupe, dedupe_mode)
+    return _research_slides(paragraphs, sections, title, date_text)
+
+
+def summary_lines(paragraphs):
+    """
+    まとめのスライドの本文を作る。文書全体から重要な文を選び（summarize.summarize）、
+    候補になる文がない短い文書では最初の段落（前置き）を使う
+
+    Args:
+        paragraphs (list): 段落のリスト
+
+    Returns:
+        list: 本文の行のリスト
+    """
+    from .summarize import summarize
+    with profiling.phase("summarize"):
+        sentences = summarize(paragraphs)
+    if not sentences:
+        return summarize_intro(paragraphs).split('\n')
+    return [f"• {sentence}" for sentence in sentences]
+
+
+def toc_entries(sections, counts, first_page, first_number=1):
+    """
+    セクションのスライドの枚数から、番号とページ番号付きの目次の項目を作る
+
+    Args:
+        sections (list): Section のリスト
+        counts (list): セクションごとのスライドの枚数
+        first_page (int): 最初のセクションのスライド番号
+        first_number (int): 最初のセクションの番号
+
+    Returns:
+        list: (項目のテキスト, セクションの先頭のスライド番号) のリスト
+    """
+    entries = []
+    page = first_page
+    for number, (section, count) in enumerate(zip(sections, counts), first_number):
+        entries.append((f"{number}. {section.title} … {page}", page))
+        page += count
+    return entries
+
+
+def _research_slides(paragraphs, sections, title, date_text):
+    """解析済みのセクションから Slide を順に作る"""
+    title_lines = ["研究結果プレゼンテーション"]
+    if date_text:
+        title_lines.append(date_text)
+
+    yield Slide("title", title, title_lines)
+    # 1 回目: 各セクションの枚数だけを数えて、セクションの先頭のスライド番号を決める
+    counts = [section_slide_count(section.lines) for section in sections]
+    yield from plan_toc(toc_entries(sections, counts, 2 + toc_slide_count(len(sections))))
+    # 2 回目: セクションのスライドを作る（目次の番号と同じ分け方になる）
+    for section in sections:
+        yield from plan_section(section.title, section.lines, citations=section.citations)
+    yield Slide("summary", "まとめ", summary_lines(paragraphs))
+
+
+def plan_research_deck(research_text, title="研究結果", date_text=None, dedupe=None, dedupe_mode="drop"):
+    """
+    研究結果のテキストからスライドの構成を組み立てる
+
+    Args:
+        research_text (str): DeepResearchの結果テキスト
+        title (str): プレゼンテーションのタイトル
+        date_text (str): タイトルスライドに表示する日付（None の場合は表示しない）
+        dedupe (float): ほぼ同じ内容の行やセクションを取り除くしきい値（None の場合は取り除かない）
+        dedupe_mode (str): 重複したセクションの扱い（"drop" または "fold"）
+
+    Returns:
+        list: Slide のリスト
+    """
+    return list(iter_research_deck(research_text, title, date_text, dedupe, dedupe_mode))
+
+
+def volume_output_file(output_file, number):
+    """
+    ボリュームの番号を付けた出力ファイル名を作る（"report.pptx" -> "report_part2.pptx"）
+
+    Args:
+        output_file (str): 出力するパワーポイントファイル名
+        number (int): ボリュームの番号（1 から）
+
+    Returns:
+        str: ボリュームの出力ファイル名
+    """
+    stem, ext = os.path.splitext(output_file)
+    return f"{stem}_part{number}{ext or '.pptx'}"
+
+
+def plan_research_volumes(research_text, output_file, title="研究結果", date_text=None, max_slides=None,
+                          max_bytes=None, dedupe=None, dedupe_mode="drop"):
+    """
+    研究結果のテキストから、上限に収まるボリュームに分けたスライドの構成を組み立てる
+
+    セクションの途中では分けず、各ボリュームにはタイトルスライドと目次を付けます。
+    目次にはそのボリュームのセクション（ページ番号とスライドへのリンク付き）と、ほかのボリュームの
+    ファイル名と収録範囲を載せます。
+    まとめのスライドは最後のボリュームに入ります。
+
+    Args:
+        research_text (str): DeepResearchの結果テキスト
+        output_file (str): 出力するパワーポイントファイル名（分割する場合は "_part1" などを付ける）
+        title (str): プレゼンテーションのタイトル
+        date_text (str): タイトルスライドに表示する日付（None の場合は表示しない）
+        max_slides (int): 1 ファイルあたりの最大スライド数（None の場合は制限しない）
+        max_bytes (int): 1 ファイルあたりの本文の最大バイト数（UTF-8、None の場合は制限しない）
+        dedupe (float): ほぼ同じ内容の行やセクションを取り除くしきい値（None の場合は取り除かない）
+        dedupe_mode (str): 重複したセクションの扱い（"drop" または "fold"）
+
+    Returns:
+        list: (出力ファイル名, Slide のリスト) のリスト。分割しない場合は要素が 1 つ
+    """
+    paragraphs, sections = parse_research(research_text, dedupe, dedupe_mode)
+    with profiling.phase("parse"):
+        groups = [plan_section(section.title, section.lines, citations=section.citations) for section in sections]
+        groups.append([Slide("summary", "まとめ", summary_lines(paragraphs))])
+        # タイトルと目次の枚数を除いて分ける。目次の項目（このボリュームのセクションと、ほかのボリューム）が
+        # 1 枚に収まらない場合は、目次の枚数を増やして分け直す
+        reserved = 2
+        while True:
+            volumes = split_volumes(groups, max_slides, max_bytes, reserved_slides=reserved)
+            needed = 1 + max(toc_slide_count(sum(i < len(sections) for i in indices) + len(volumes) - 1)
+                             for indices in volumes)
+            if needed <= reserved:
+                break
+            reserved = needed
+
+    title_lines = ["研究結果プレゼンテーション"]
+    if len(volumes) == 1:
+        if date_text:
+            title_lines.append(date_text)
+        counts = [len(group) for group in groups[:len(sections)]]
+        toc = plan_toc(toc_entries(sections, counts, 2 + toc_slide_count(len(sections))))
+        slides = [Slide("title", title, title_lines)] + toc
+        return [(output_file, slides + [spec for group in groups for spec in group])]
+
+    if not isinstance(output_file, str):
+        raise ValueError("分割して出力する場合は出力ファイル名を指定してください")
+    names = [volume_output_file(output_file, number) for number in range(1, len(volumes) + 1)]
+    titles = [[sections[i].title for i in indices if i < len(sections)] for indices in volumes]
+
+    planned = []
+    for number, indices in enumerate(volumes, 1):
+        volume_title = [f"{title_lines[0]}（第{number}部 / 全{len(volumes)}部）"]
+        if date_text:
+            volume_title.append(date_text)
+
+        # 目次: このボリュームのセクション（ページ番号とリンク付き）と、ほかのボリュームの収録範囲
+        own = [i for i in indices if i < len(sections)]
+        others = [other for other, other_titles in enumerate(titles, 1) if other != number and other_titles]
+        first_page = 2 + toc_slide_count(len(own) + len(others))
+        own_entries = toc_entries([sections[i] for i in own], [len(groups[i]) for i in own], first_page,
+                                  first_number=own[0] + 1 if own else 1)
+        entries = []
+        for other, other_titles in enumerate(titles, 1):
+            if other == number:
+                entries += own_entries
+            elif other_titles:
+                span = f"「{other_titles[0]}」"
+                if len(other_titles) > 1:
+                    span += f"〜「{other_titles[-1]}」"
+                entries.append((f"→ 第{other}部（{os.path.basename(names[other - 1])}）: {span}", None))
+
+        slides = [Slide("title", title, volume_title)] + plan_toc(entries)
+        planned.append((names[number - 1], slides + [spec for i in indices for spec in groups[i]]))
+    return planned
+
+
+def create_deep_research_presentation(research_text, output_file=None, title="研究結果", theme="blue",
+                                      writer="pptx", workers=None, max_slides=None, max_bytes=None, jobs=1,
+                                      dedupe=None, dedupe_mode="drop"):
+    """
+    OpenAIのDeepResearchの結果をパワーポイントにまとめる関数
+
+    max_slides か max_bytes を指定すると、大きなデッキをセクションの切れ目で
+    "_part1", "_part2" などのファイルに分割します（plan_research_volumes）。
+
+    Args:
+        research_text (str): DeepResearchの結果テキスト
+        output_file (str): 出力するパワーポイントファイル名（Noneの場合は自動生成）。書き込み可能なファイルオブジェクトも指定できる
+        title (str): プレゼンテーションのタイトル
+        theme (str): カラーテーマ（"blue", "dark", "light", "green"）
+        writer (str): 出力方法（"pptx": python-pptx、"fast": XML を直接書き出す高速な出力）
+        workers (int): 保存時の圧縮に使うスレッド数（None の場合は CPU 数）
+        max_slides (int): 1 ファイルあたりの最大スライド数（None の場合は分割しない）
+        max_bytes (int): 1 ファイルあたりの本文の最大バイト数（None の場合は分割しない）
+        jobs (int): 分割したファイルを並列に作成する数（1 の場合は順番に作成する）
+        dedupe (float): ほぼ同じ内容の行やセクションを取り除くしきい値（0〜1、None の場合は取り除かない）
+        dedupe_mode (str): 重複したセクションの扱い（"drop": 取り除く、"fold": 先のセクションにまとめる）
+
+    Returns:
+        str: 出力したファイル名（max_slides か max_bytes を指定した場合はファイル名のリスト）
+    """
+    # 日付と自動生成するファイル名には作成日時を使う（再現可能モードでは固定の日時）
+    now = reproducible.build_time()
+    date_text = now.strftime("%Y年%m月%d日")
+
+    # 出力ファイル名が指定されていない場合は自動生成
+    if output_file is None:
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        output_file = f"deep_research_{timestamp}.pptx"
+
+    if max_slides is None and max_bytes is None:
+        slides = iter_research_deck(research_text, title, date_text, dedupe, dedupe_mode)
+        build_presentation(slides, get_theme(theme), output_file, writer, workers)
+        print(f"研究プレゼンテーションを {output_file} として保存しました。")
+        return output_file
+
+    volumes = plan_research_volumes(research_text, output_file, title, date_text, max_slides, max_bytes,
+                                    dedupe, dedupe_mode)
+    build_batch([(slides, get_theme(theme), name) for name, slides in volumes], writer, workers, jobs)
+    for name, _ in volumes:
+        print(f"研究プレゼンテーションを {name} として保存しました。")
+    return [name for name, _ in volumes]
+
+
+def themed_output_file(output_file, theme):
+    """
+    テーマ名を付けた出力ファイル名を作る（"report.pptx" -> "report_dark.pptx"）
+
+    Args:
+        output_file (str): 出力するパワーポイントファイル名
+        theme (str): カラーテーマの名前
+
+    Returns:
+        str: テーマごとの出力ファイル名
+    """
+    stem, ext = os.path.splitext(output_file)
+    return f"{stem}_{theme}{ext or '.pptx'}"
+
+
+def create_deep_research_presentations(research_text, themes, output_file=None, title="研究結果",
+                                       writer="pptx", workers=None, jobs=1, dedupe=None, dedupe_mode="drop"):
+    """
+    DeepResearchの結果を、複数のカラーテーマのパワーポイントにまとめて出力する関数
+
+    テキストの解析は 1 回だけ行い、同じスライドの構成をテーマごとに描画します。
+    writer="fast" の場合はテーマによらない XML も共有するため、テーマの数だけ
+    create_deep_research_presentation を呼ぶよりも大幅に速くなります。
+
+    Args:
+        research_text (str): DeepResearchの結果テキスト
+        themes (list): カラーテーマの名前のリスト（"blue", "dark", "light", "green"）
+        output_file (str): 出力ファイル名の元（"report.pptx" -> "report_blue.pptx" など）。Noneの場合は自動生成
+        title (str): プレゼンテーションのタイトル
+        writer (str): 出力方法（"pptx": python-pptx、"fast": XML を直接書き出す高速な出力）
+        workers (int): 保存時の圧縮に使うスレッド数（None の場合は CPU 数）
+        jobs (int): 並列に描画するテーマの数（1 の場合は順番に描画する）
+        dedupe (float): ほぼ同じ内容の行やセクションを取り除くしきい値（None の場合は取り除かない）
+        dedupe_mode (str): 重複したセクションの扱い（"drop" または "fold"）
+
+    Returns:
+        list: 出力したファイル名のリスト（themes と同じ順番）
+    """
+    now = reproducible.build_time()
+    if output_file is None:
+        output_file = f"deep_research_{now.strftime('%Y%m%d_%H%M%S')}.pptx"
+    output_files = [themed_output_file(output_file, theme) for theme in themes]
+
+    slides = iter_research_deck(research_text, title, now.strftime("%Y年%m月%d日"), dedupe, dedupe_mode)
+    build_presentations(slides, [get_theme(theme) for theme in themes], output_files, writer, workers, jobs)
+    for output_file in output_files:
+        print(f"研究プレゼンテーションを {output_file} として保存しました。")
+
+    return output_files
+
+
+def create_research_presentation(research_text, output_file="research_presentation.pptx", title="研究結果",
+                                 writer="pptx", workers=None):
+    """
+    OpenAIのDeepResearchの結果を青テーマのパワーポイントにまとめる関数
+
+    Args:
+        research_text (str): DeepResearchの結果テキスト
+        output_file (str): 出力するパワーポイントファイル名
+        title (str): プレゼンテーションのタイトル
+        writer (str): 出力方法（"pptx" または "fast"）
+        workers (int): 保存時の圧縮に使うスレッド数（None の場合は CPU 数）
+
+    Returns:
+        str: 出力したファイル名
+    """
+    return create_deep_research_presentation(research_text, output_file, title, theme="blue",
+                                             writer=writer, workers=workers)
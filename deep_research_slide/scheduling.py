@@ -0,0 +1,173 @@
+"""
+バッチ変換の大きさに応じたスケジューリング
+
+数 KB のメモと数十 MB のダンプが混ざったバッチを登録順に変換すると、最後に大きなファイルが
+1 つだけ残ってほかのワーカーが遊び、大きなファイルが同時に重なるとメモリが足りなくなります。
+このモジュールは、入力の大きさと段落数（分からない場合は大きさから推定）からファイルごとの
+変換時間とメモリ使用量を見積もり、
+
+- 時間のかかるファイルから順に変換する（最長処理時間順。最後に長いファイルが残らない）
+- 同時に変換しているファイルの見積もりメモリの合計が上限を超えないように待たせる
+
+ことで、全体の時間を理想に近づけつつ、ワーカーのメモリを上限内に抑えます。
+
+見積もりの係数は benchmark.py の計測（1 CPU、python-pptx 1.0.2）から求めたもので、
+python-pptx の出力はスライドが増えるほど 1 枚あたりが遅くなる（段落数の 2 乗に比例する項がある）
+のに対し、fastwriter はほぼ段落数に比例します。メモリはどちらも入力のバイト数の 80〜160 倍程度です。
+"""
+import asyncio
+import os
+from collections import deque, namedtuple
+
+# 見積もり
+# seconds: 変換にかかる秒数、memory: 変換中のワーカープロセスのメモリ使用量（バイト）
+Estimate = namedtuple("Estimate", "seconds memory")
+
+# python-pptx を読み込んだワーカープロセス自体のメモリ（バイト）
+WORKER_MEMORY = 48 * 1024 * 1024
+
+# 入力 1 バイトあたりのメモリ（計測値は 80〜160 倍のため、多めに見積もる）
+MEMORY_PER_BYTE = 120
+
+# 出力方法ごとの変換時間の係数（秒）: (1 ファイル, 1 段落, 段落数の 2 乗)
+COST_COEFFICIENTS = {
+    "pptx": (0.01, 2.5e-3, 7.4e-6),
+    "fast": (0.002, 4.4e-4, 6e-8),
+}
+
+# 段落数が分からない場合に使う、1 段落あたりの平均のバイト数
+PARAGRAPH_BYTES = 680
+
+# 使われなくなったメモリを OS に返す、入力の大きさの下限（バイト）
+TRIM_BYTES = 1024 * 1024
+
+
+def estimate(size, paragraphs=None, writer="pptx"):
+    """
+    1 つのファイルの変換時間とメモリ使用量を見積もる
+
+    Args:
+        size (int): 入力のバイト数
+        paragraphs (int): 段落数（None の場合は大きさから推定する）
+        writer (str): 出力方法（"pptx" または "fast"）
+
+    Returns:
+        Estimate: 見積もり
+    """
+    if paragraphs is None:
+        paragraphs = size // PARAGRAPH_BYTES + 1
+    fixed, linear, quadratic = COST_COEFFICIENTS.get(writer, COST_COEFFICIENTS["pptx"])
+    seconds = fixed + linear * paragraphs + quadratic * paragraphs * paragraphs
+    return Estimate(seconds, WORKER_MEMORY + MEMORY_PER_BYTE * size)
+
+
+def order_jobs(jobs, writer="pptx"):
+    """
+    時間のかかりそうなファイルから順に並べ替える（入力ファイルの大きさから見積もる）
+
+    読めないファイルは大きさ 0 とみなし、エラーは変換するときに報告します。
+
+    Args:
+        jobs (list): batch.Job のリスト
+        writer (str): 出力方法
+
+    Returns:
+        list: 並べ替えた batch.Job のリスト（見積もりが同じものは元の順番のまま）
+    """
+    def cost(job):
+        try:
+            size = os.path.getsize(job.input_file)
+        except OSError:
+            size = 0
+        return estimate(size, writer=writer).seconds
+
+    return sorted(jobs, key=cost, reverse=True)
+
+
+def default_memory_budget():
+    """既定のメモリの上限（物理メモリの 3/4、分からない場合は None）"""
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") * 3 // 4
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def release_memory():
+    """
+    解放済みのメモリを OS に返す（ワーカープロセスで大きなファイルを変換した後に呼ぶ）
+
+    glibc の malloc は解放したメモリを手元に残すため、大きなファイルの後はワーカーの RSS が
+    高いままになります。glibc 以外の環境では何もしません。
+    """
+    import ctypes
+    import gc
+    gc.collect()
+    try:
+        ctypes.CDLL(None).malloc_trim(0)
+    except (AttributeError, OSError, TypeError):
+        pass
+
+
+class MemoryBudget:
+    """
+    同時に変換するファイルの見積もりメモリの合計を上限内に抑える（asyncio で使う）
+
+    待っているファイルは到着した順に通します（小さなファイルが大きなファイルを追い越し続けて、
+    大きなファイルがいつまでも始まらないことはありません）。上限より大きなファイルは、
+    ほかに変換しているファイルがなくなってから 1 つだけで変換します。
+
+    Args:
+        limit (int): メモリの上限（バイト）
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_use = 0
+        self.peak = 0
+        self.waiters = deque()
+
+    def _fits(self, amount):
+        return self.in_use == 0 or self.in_use + amount <= self.limit
+
+    def _take(self, amount):
+        self.in_use += amount
+        self.peak = max(self.peak, self.in_use)
+
+    async def acquire(self, amount):
+        """amount バイトを使えるようになるまで待つ"""
+        if not self.waiters and self._fits(amount):
+            self._take(amount)
+            return
+        future = asyncio.get_running_loop().create_future()
+        waiter = (amount, future)
+        self.waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # 通される前に取り消された: 待ち行列から抜け、後ろで待っているファイルを通す
+                if waiter in self.waiters:
+                    self.waiters.remove(waiter)
+                self._grant()
+            else:
+                # 通された直後に取り消された: 受け取った分を返す
+                self.release(amount)
+            raise
+
+    def release(self, amount):
+        """acquire した amount バイトを返し、待っているファイルを通す"""
+        self.in_use -= amount
+        self._grant()
+
+    def _grant(self):
+        """待っているファイルを到着した順に、上限内に収まる間だけ通す"""
+        while self.waiters:
+            amount, future = self.waiters[0]
+            if future.cancelled():
+                self.waiters.popleft()
+                continue
+            if not self._fits(amount):
+                break
+            self.waiters.popleft()
+            self._take(amount)
+            future.set_result(None)
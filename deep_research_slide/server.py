@@ -0,0 +1,346 @@
+"""
+DeepResearch の結果をプレゼンテーションに変換する常駐サーバー
+
+リクエストごとにスクリプトを起動すると、インタープリタの起動と python-pptx の
+読み込みが毎回かかります。このサーバーはあらかじめ読み込みを済ませたワーカー
+プロセスのプールを保持し、HTTP（TCP または Unix ソケット）で変換を受け付けます。
+
+エンドポイント:
+    POST /convert  JSON {"text": ..., "title": ..., "theme": ...} を受け取り .pptx を返す
+    GET  /health   稼働状況
+    GET  /metrics  リクエスト数、待ち行列の長さ、レイテンシのパーセンタイル
+
+使用例:
+    python -m deep_research_slide serve --port 8765 --workers 4
+    python -m deep_research_slide serve --socket /tmp/slide.sock
+    curl -X POST --data-binary @request.json http://127.0.0.1:8765/convert -o out.pptx
+"""
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+
+from . import profiling
+from .themes import THEMES
+
+PPTX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+def _warm_worker():
+    """ワーカープロセスの初期化時に python-pptx を読み込んでおく"""
+    from pptx import Presentation
+    from . import research  # noqa: F401
+    Presentation()
+
+
+def _pool_context():
+    """
+    ワーカープロセスの起動方法
+
+    fork で起動すると、プールを作り直したときに処理中の接続のソケットがワーカーに引き継がれ、
+    クライアントに接続の終わりが届かなくなります。そのため forkserver（使えない環境では spawn）で起動します。
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def convert(research_text, title=None, theme="blue", writer="pptx", workers=None):
+    """
+    ワーカープロセスで実行される変換処理
+
+    Args:
+        research_text (str): DeepResearchの結果テキスト
+        title (str): プレゼンテーションのタイトル（None の場合はテキストから抽出）
+        theme (str): カラーテーマ
+        writer (str): 出力方法（"pptx" または "fast"）
+        workers (int): 保存時の圧縮に使うスレッド数（None の場合は CPU 数）
+
+    Returns:
+        bytes: 作成した .pptx の内容
+    """
+    from .research import create_deep_research_presentation, extract_title_from_text
+    if not title:
+        title = extract_title_from_text(research_text)
+    buffer = io.BytesIO()
+    with redirect_stdout(io.StringIO()):
+        create_deep_research_presentation(research_text, output_file=buffer, title=title, theme=theme,
+                                          writer=writer, workers=workers)
+    return buffer.getvalue()
+
+
+class HttpError(Exception):
+    """HTTP のエラー応答として返す例外"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ConversionServer:
+    """
+    asyncio のフロントエンドとプロセスプールのバックエンドからなる変換サーバー
+
+    Args:
+        workers (int): ワーカープロセス数（同時に実行する変換の数）
+        max_queue (int): 実行待ちにできるリクエストの最大数
+        max_body (int): リクエスト本文の最大バイト数
+        timeout (float): 1 リクエストあたりの変換のタイムアウト（秒）
+    """
+
+    def __init__(self, workers=None, max_queue=32, max_body=50 * 1024 * 1024, timeout=300):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.max_body = max_body
+        self.timeout = timeout
+        self.executor = None
+        self.semaphore = None
+        self.started = time.time()
+        self.in_flight = 0
+        self.queued = 0
+        self.counters = {"requests": 0, "completed": 0, "failed": 0, "rejected": 0, "timeouts": 0, "restarts": 0}
+        self.latencies = deque(maxlen=1000)
+
+    def start(self):
+        """ワーカープロセスを起動する"""
+        self.semaphore = asyncio.Semaphore(self.workers)
+        self._start_pool()
+
+    def _start_pool(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=_pool_context(),
+                                            initializer=_warm_worker)
+        # 最初のリクエストを待たずにワーカーを起動しておく
+        for _ in range(self.workers):
+            self.executor.submit(int)
+
+    def _restart_pool(self, broken):
+        """
+        ワーカープロセスが異常終了して使えなくなったプールを作り直す
+
+        同じプールで失敗したリクエストが続いても、作り直すのは 1 回だけです。
+        """
+        if self.executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.counters["restarts"] += 1
+        self._start_pool()
+
+    def _submit(self, *args):
+        """変換をプールに投入する（プールが使えなくなっていれば作り直してから投入する）"""
+        executor = self.executor
+        try:
+            return executor, executor.submit(convert, *args)
+        except BrokenProcessPool:
+            self._restart_pool(executor)
+            return self.executor, self.executor.submit(convert, *args)
+
+    def _finished(self, future):
+        """プールでの変換が終わったら（タイムアウトした変換も含めて）枠を返す"""
+        if not future.cancelled():
+            future.exception()  # タイムアウトした変換の例外を取り出し済みにする
+        self.in_flight -= 1
+        self.semaphore.release()
+
+    def close(self):
+        """ワーカープロセスを停止する"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        """1 つの接続を処理する"""
+        try:
+            status, headers, body = await self._dispatch(reader)
+        except HttpError as e:
+            status, headers, body = self._json(e.status, {"error": e.message})
+        except Exception as e:
+            status, headers, body = self._json(500, {"error": f"{type(e).__name__}: {e}"})
+        try:
+            head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+            headers["Content-Length"] = str(len(body))
+            headers["Connection"] = "close"
+            head.extend(f"{key}: {value}" for key, value in headers.items())
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            raise HttpError(400, "不正なリクエストです")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "不正なリクエスト行です")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        path = target.split("?", 1)[0]
+
+        if path == "/health":
+            return self._json(200, {"status": "ok", "workers": self.workers})
+        if path == "/metrics":
+            return self._json(200, self.metrics())
+        if path != "/convert":
+            raise HttpError(404, f"{path} は存在しません")
+        if method != "POST":
+            raise HttpError(405, "/convert は POST のみ受け付けます")
+
+        length = headers.get("content-length", "0")
+        if not (length.isascii() and length.isdigit()):
+            raise HttpError(400, "Content-Length には 0 以上の整数を指定してください")
+        length = int(length)
+        if length > self.max_body:
+            raise HttpError(413, f"本文が上限（{self.max_body} バイト）を超えています")
+        try:
+            payload = json.loads(await reader.readexactly(length))
+        except (asyncio.IncompleteReadError, ValueError):
+            raise HttpError(400, "本文は JSON で指定してください")
+        if not isinstance(payload, dict) or not isinstance(payload.get("text"), str):
+            raise HttpError(400, "\"text\" に研究結果のテキストを指定してください")
+        title = payload.get("title")
+        if title is not None and not isinstance(title, str):
+            raise HttpError(400, "\"title\" には文字列を指定してください")
+        theme = payload.get("theme", "blue")
+        if theme not in THEMES:
+            raise HttpError(400, f"theme は {', '.join(THEMES)} のいずれかを指定してください")
+
+        data = await self.submit(payload["text"], title, theme)
+        return 200, {
+            "Content-Type": PPTX_CONTENT_TYPE,
+            "Content-Disposition": 'attachment; filename="presentation.pptx"',
+        }, data
+
+    async def submit(self, research_text, title, theme):
+        """
+        変換をワーカープールに投入する。実行待ちが上限に達している場合は 503 を返す
+
+        Returns:
+            bytes: 作成した .pptx の内容
+        """
+        self.counters["requests"] += 1
+        if self.queued >= self.max_queue and self.semaphore.locked():
+            self.counters["rejected"] += 1
+            raise HttpError(503, "混雑しています。しばらくしてから再試行してください")
+
+        start = time.perf_counter()
+        self.queued += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        try:
+            executor, submitted = self._submit(research_text, title, theme)
+        except BaseException:
+            self.in_flight -= 1
+            self.semaphore.release()
+            raise
+        # タイムアウトしてもワーカーは変換を続けるため、枠（semaphore と in_flight）は
+        # 変換が実際に終わったときに返す
+        future = asyncio.wrap_future(submitted)
+        future.add_done_callback(self._finished)
+        try:
+            data = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise HttpError(504, f"変換が {self.timeout} 秒以内に終わりませんでした")
+        except BrokenProcessPool:
+            self.counters["failed"] += 1
+            self._restart_pool(executor)
+            raise HttpError(500, "ワーカープロセスが異常終了しました（ワーカーを起動し直しました）")
+        except Exception as e:
+            self.counters["failed"] += 1
+            raise HttpError(500, f"変換に失敗しました: {e}")
+        self.counters["completed"] += 1
+        self.latencies.append(time.perf_counter() - start)
+        return data
+
+    def metrics(self):
+        """稼働状況の統計を返す"""
+        return {
+            "uptime": time.time() - self.started,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            **self.counters,
+            "latency": profiling.summarize(list(self.latencies)),
+        }
+
+    @staticmethod
+    def _json(status, obj):
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        return status, {"Content-Type": "application/json; charset=utf-8"}, body
+
+
+async def serve(server, host="127.0.0.1", port=8765, socket_path=None):
+    """
+    変換サーバーを起動し、停止されるまで待ち受ける
+
+    Args:
+        server (ConversionServer): 変換サーバー
+        host (str): 待ち受けるホスト
+        port (int): 待ち受けるポート
+        socket_path (str): Unix ソケットのパス（指定した場合は TCP の代わりに使用）
+    """
+    server.start()
+    try:
+        if socket_path:
+            listener = await asyncio.start_unix_server(server.handle, path=socket_path)
+            print(f"{socket_path} で待ち受けています（ワーカー数: {server.workers}）", file=sys.stderr)
+        else:
+            listener = await asyncio.start_server(server.handle, host, port)
+            print(f"http://{host}:{port} で待ち受けています（ワーカー数: {server.workers}）", file=sys.stderr)
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def run_server(args):
+    """解析済みの引数でサーバーを起動し、終了するまで待つ"""
+    server = ConversionServer(workers=args.workers, max_queue=args.max_queue,
+                              max_body=args.max_body, timeout=args.timeout)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    from .cli import add_server_arguments
+    parser = argparse.ArgumentParser(description='プレゼンテーション変換サーバーを起動します。')
+    add_server_arguments(parser)
+    run_server(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+まとめのスライドに載せる要約を、文書全体から重要な文を選んで作る（抽出型要約）
+
+文書のすべての文を TF-IDF のベクトルにし、文書全体の重心（各語の出現回数 × IDF）との
+コサイン類似度で文に点数を付けます。点数の高い文から、すでに選んだ文と内容が重ならない
+ものを文字数の予算内で選び、文書の順番に並べます。語は英数字の単語と、日本語の文字の
+bigram（2 文字ずつ）で数えるため、形態素解析は使いません。
+
+文どうしの類似度を総当たりで求める TextRank と違い、語の数に比例する時間で済むため、
+数 MB の入力でも速く動きます。numpy がインストールされている場合、語の多い入力では
+文と語の出現回数を配列にまとめて、点数をまとめて計算します（numpy は任意で、無い場合は
+同じ計算を Counter で行います）。
+"""
+import math
+import re
+from collections import Counter, defaultdict
+from itertools import chain, count
+
+# 引用のリンク（"([出典](URL))"、"[出典](URL)"）と URL、Markdown の強調や見出しの記号
+CITATION_PATTERN = re.compile(r'\s*\(\[[^\]]*\]\([^)]*\)\)|\[([^\]]*)\]\([^)]*\)|https?://\S+|www\.\S+')
+MARKUP_PATTERN = re.compile(r'\*\*|__|`|^\s*(?:#+|[-*•]|\d+\.)\s*')
+
+# 文の区切り（句点、感嘆符・疑問符、英文のピリオドと空白）
+SENTENCE_PATTERN = re.compile(r'(?<=[。！？!?])|(?<=\.)\s+')
+
+# 英数字の単語と、日本語の文字の並び
+WORD_PATTERN = re.compile(r'[0-9a-z]{2,}')
+CJK_RUN_PATTERN = re.compile(r'[^\x00-\x7f\W]+')
+
+# 要約に使う文の長さ（これより短い文は見出しや箇条書きの断片、長い文は表などとみなす）
+MIN_SENTENCE_CHARS = 15
+MAX_SENTENCE_CHARS = 200
+
+# 既定の文字数の予算と最大の文数
+DEFAULT_BUDGET = 500
+DEFAULT_SENTENCES = 5
+
+# すでに選んだ文との語の重なり（Jaccard 係数）がこれを超える文は選ばない
+REDUNDANCY = 0.5
+
+# 語の延べ数がこれ以上（入力がおよそ 2MB 以上）の場合は numpy で点数を計算する。
+# numpy の読み込みに約 0.1 秒かかるため、これより小さな入力では Counter のほうが速い
+NUMPY_MIN_TERMS = 500000
+
+
+def clean_line(line):
+    """引用のリンク、URL、Markdown の記号を取り除く"""
+    line = CITATION_PATTERN.sub(lambda m: m.group(1) or '', line)
+    return MARKUP_PATTERN.sub('', line).strip()
+
+
+def split_sentences(paragraphs):
+    """
+    段落のリストから要約の候補になる文を取り出す
+
+    Returns:
+        list: 文のリスト（文書の順番）
+    """
+    sentences = []
+    for para in paragraphs:
+        for line in para.split('\n'):
+            # 表の行（"| セル | セル |"）は文として扱わない
+            if line.lstrip().startswith('|'):
+                continue
+            for sentence in SENTENCE_PATTERN.split(clean_line(line)):
+                sentence = sentence.strip()
+                if MIN_SENTENCE_CHARS <= len(sentence) <= MAX_SENTENCE_CHARS:
+                    sentences.append(sentence)
+    return sentences
+
+
+def terms(sentence):
+    """文を語（英数字の単語と日本語の文字の bigram）のリストにする"""
+    text = sentence.lower()
+    result = WORD_PATTERN.findall(text)
+    for run in CJK_RUN_PATTERN.findall(text):
+        if len(run) == 1:
+            result.append(run)
+        else:
+            result += [run[i:i + 2] for i in range(len(run) - 1)]
+    return result
+
+
+def rank_sentences(sentences):
+    """
+    文に TF-IDF の重心とのコサイン類似度で点数を付ける
+
+    Args:
+        sentences (list): 文のリスト
+
+    Returns:
+        list: (点数, 文の番号) のリスト（点数の高い順、同じ文は最初の 1 つだけ）
+    """
+    term_lists = [terms(sentence) for sentence in sentences]
+    if sum(map(len, term_lists)) >= NUMPY_MIN_TERMS:
+        try:
+            import numpy
+        except ImportError:
+            pass
+        else:
+            return _rank_arrays(numpy, sentences, term_lists)
+
+    counts = [Counter(term_list) for term_list in term_lists]
+    # 文ごとに足し合わせず、全体を 1 回で数える（Counter の数え上げは C で実装されている）
+    document_frequency = Counter(chain.from_iterable(counts))
+
+    total = len(sentences)
+    idf = {term: math.log(total / df) + 1.0 for term, df in document_frequency.items()}
+
+    # 重心: 文書全体での語の出現回数 × IDF
+    centroid = Counter(chain.from_iterable(term_lists))
+    centroid = {term: n * idf[term] for term, n in centroid.items()}
+    centroid_norm = math.sqrt(sum(w * w for w in centroid.values())) or 1.0
+
+    ranked = []
+    seen = set()
+    for index, term_counts in enumerate(counts):
+        if sentences[index] in seen:
+            continue
+        seen.add(sentences[index])
+        dot = 0.0
+        norm = 0.0
+        for term, n in term_counts.items():
+            weight = n * idf[term]
+            dot += weight * centroid[term]
+            norm += weight * weight
+        if norm:
+            ranked.append((dot / (math.sqrt(norm) * centroid_norm), index))
+    ranked.sort(key=lambda item: (-item[0], item[1]))
+    return ranked
+
+
+def _rank_arrays(numpy, sentences, term_lists):
+    """
+    rank_sentences と同じ点数を、文と語の出現回数の配列（疎行列の COO 形式）で計算する
+
+    Args:
+        numpy: numpy モジュール
+        sentences (list): 文のリスト
+        term_lists (list): 文ごとの語のリスト
+
+    Returns:
+        list: (点数, 文の番号) のリスト（点数の高い順、同じ文は最初の 1 つだけ）
+    """
+    total = len(sentences)
+    lengths = numpy.fromiter(map(len, term_lists), dtype=numpy.int64, count=total)
+    # 語に出てきた順の番号を付ける（辞書の参照と番号の発行はどちらも C で実装されている）
+    vocabulary = defaultdict(count().__next__)
+    term_ids = numpy.fromiter(map(vocabulary.__getitem__, chain.from_iterable(term_lists)),
+                              dtype=numpy.int64, count=int(lengths.sum()))
+    size = len(vocabulary)
+    sentence_ids = numpy.repeat(numpy.arange(total, dtype=numpy.int64), lengths)
+
+    # (文, 語) の組ごとの出現回数
+    pairs, pair_counts = numpy.unique(sentence_ids * size + term_ids, return_counts=True)
+    pair_sentences, pair_terms = numpy.divmod(pairs, size)
+
+    document_frequency = numpy.bincount(pair_terms, minlength=size)
+    idf = numpy.log(total / document_frequency) + 1.0
+    centroid = numpy.bincount(term_ids, minlength=size) * idf
+    centroid_norm = float(numpy.sqrt(numpy.dot(centroid, centroid))) or 1.0
+
+    weights = pair_counts * idf[pair_terms]
+    dots = numpy.bincount(pair_sentences, weights=weights * centroid[pair_terms], minlength=total)
+    norms = numpy.bincount(pair_sentences, weights=weights * weights, minlength=total)
+
+    ranked = []
+    seen = set()
+    for index, (dot, norm) in enumerate(zip(dots.tolist(), norms.tolist())):
+        if sentences[index] in seen:
+            continue
+        seen.add(sentences[index])
+        if norm:
+            ranked.append((dot / (math.sqrt(norm) * centroid_norm), index))
+    ranked.sort(key=lambda item: (-item[0], item[1]))
+    return ranked
+
+
+def summarize(paragraphs, budget=DEFAULT_BUDGET, max_sentences=DEFAULT_SENTENCES):
+    """
+    文書全体から重要な文を選んで要約を作る
+
+    Args:
+        paragraphs (list): 段落のリスト
+        budget (int): 要約の最大文字数（箇条書きの記号を除く）
+        max_sentences (int): 選ぶ文の最大数
+
+    Returns:
+        list: 選んだ文のリスト（文書の順番）。候補の文がない場合は空のリスト
+    """
+    sentences = split_sentences(paragraphs)
+    chosen = []
+    used = 0
+    for _, index in rank_sentences(sentences):
+        if len(chosen) >= max_sentences:
+            break
+        length = len(sentences[index])
+        if used + length > budget:
+            continue
+        words = frozenset(terms(sentences[index]))
+        if any(len(words & other) / len(words | other) > REDUNDANCY for _, other in chosen):
+            continue
+        chosen.append((index, words))
+        used += length
+    return [sentences[index] for index, _ in sorted(chosen, key=lambda item: item[0])]
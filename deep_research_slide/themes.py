@@ -0,0 +1,77 @@
+"""
+カラーテーマの定義
+
+色は (R, G, B) のタプルで持ち、描画するときに python-pptx の RGBColor に変換します。
+色が None の場合はテンプレートの既定の色をそのまま使います。
+"""
+from collections import namedtuple
+
+# name: テーマ名、title / subtitle / text / highlight / background: 各要素の色、
+# dark: スライド全面に背景色の矩形を敷くかどうか
+Theme = namedtuple("Theme", "name title subtitle text highlight background dark")
+
+THEMES = {
+    "blue": Theme(
+        "blue",
+        title=(0, 112, 192),         # 青
+        subtitle=(0, 176, 240),      # 明るい青
+        text=(0, 0, 0),              # 黒
+        highlight=(192, 0, 0),       # 赤
+        background=(240, 240, 240),  # 薄いグレー
+        dark=False,
+    ),
+    "dark": Theme(
+        "dark",
+        title=(255, 255, 255),       # 白
+        subtitle=(200, 200, 200),    # 薄いグレー
+        text=(255, 255, 255),        # 白
+        highlight=(255, 128, 0),     # オレンジ
+        background=(44, 44, 44),     # 暗いグレー
+        dark=True,
+    ),
+    "light": Theme(
+        "light",
+        title=(70, 70, 70),          # 暗いグレー
+        subtitle=(100, 100, 100),    # グレー
+        text=(0, 0, 0),              # 黒
+        highlight=(255, 128, 0),     # オレンジ
+        background=(255, 255, 255),  # 白
+        dark=False,
+    ),
+    "green": Theme(
+        "green",
+        title=(0, 128, 0),           # 緑
+        subtitle=(0, 176, 80),       # 明るい緑
+        text=(0, 0, 0),              # 黒
+        highlight=(192, 0, 0),       # 赤
+        background=(240, 240, 240),  # 薄いグレー
+        dark=False,
+    ),
+}
+
+# テンプレートの既定の配色をそのまま使うテーマ（ボードゲーム用）
+PLAIN = Theme("plain", None, None, None, None, None, dark=False)
+
+# アルナックのイメージカラー
+ARNAK = Theme(
+    "arnak",
+    title=(205, 133, 63),            # ペルー（明るいブラウン）
+    subtitle=(255, 215, 0),          # ゴールド
+    text=(255, 248, 220),            # コーンシルク（明るいベージュ）
+    highlight=(178, 34, 34),         # 赤茶色
+    background=(50, 25, 0),          # 暗いブラウン
+    dark=True,
+)
+
+
+def get_theme(name):
+    """
+    テーマ名からテーマを返す。未知の名前の場合は青テーマ
+
+    Args:
+        name (str): テーマ名（"blue", "dark", "light", "green"）
+
+    Returns:
+        Theme: テーマ
+    """
+    return THEMES.get(name, THEMES["blue"])
@@ -0,0 +1,387 @@
+"""
+作成したプレゼンテーションの構造を検証する
+
+.pptx（zip）を開き、スライドの XML を lxml の iterparse でシェイプごとに読みながら、
+PowerPoint で開いたときに問題になる次の点を調べます。python-pptx のオブジェクトは作らず、
+読み終えたシェイプの要素はすぐに捨てるため、大量のデッキを検証しても軽く済みます。
+
+1. 空のプレースホルダー（テキストがなく、スライドショーでは何も表示されない）
+2. テキストのはみ出し（文字数とフォントサイズから行数を見積もる）
+3. 重なり順の問題（スライド全面を覆う不透明なシェイプの下に、テキストが隠れている）
+4. 見つからないリレーションシップ（参照先のパーツがない、XML の rId が定義されていない）
+5. 大きすぎるメディア
+
+使用例:
+    python -m deep_research_slide validate deck.pptx
+    python -m deep_research_slide research research.txt --validate
+"""
+import posixpath
+import zipfile
+from collections import namedtuple
+
+from .compact import CONTENT_TYPES, OFFICE_DOCUMENT_REL_TYPE, MEDIA_DIR, P_NS, R_NS, rels_name, resolve
+from .fastwriter import display_width
+
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+SLIDE_LAYOUT_REL_TYPE = R_NS + "/slideLayout"
+SLIDE_MASTER_REL_TYPE = R_NS + "/slideMaster"
+
+# シェイプの要素（spTree の直下にあるもの）
+SHAPE_TAGS = frozenset(f"{{{P_NS}}}{tag}" for tag in ("sp", "pic", "graphicFrame", "grpSp", "cxnSp"))
+
+# 1 つの問題
+# part: 問題のあるパーツ名、kind: 問題の種類、message: 説明
+Issue = namedtuple("Issue", "part kind message")
+
+# 問題の種類
+EMPTY_PLACEHOLDER = "empty_placeholder"
+OVERFLOW = "overflow"
+HIDDEN_TEXT = "hidden_text"
+MISSING_PART = "missing_part"
+MISSING_RELATIONSHIP = "missing_relationship"
+LARGE_MEDIA = "large_media"
+
+# 既定のメディアの最大バイト数
+DEFAULT_MAX_MEDIA_BYTES = 5 * 1024 * 1024
+
+# はみ出しの見積もり
+# 文字の幅は ASCII を 0.5 em、それ以外を 1 em とし、行の高さはフォントサイズの 1.2 倍とする。
+# 見積もりは大まかなので、テキストの高さが枠の高さのこの倍数を超える場合だけはみ出しとみなす
+LINE_SPACING = 1.2
+OVERFLOW_TOLERANCE = 1.1
+
+# フォントサイズが指定されていない場合の大きさ（ポイント、既定のテンプレートのマスターに合わせる）
+DEFAULT_TITLE_SIZE = 44
+DEFAULT_BODY_SIZE = 18
+
+# テキストの枠の余白（EMU、bodyPr の既定値）と、EMU とポイントの換算
+DEFAULT_INSETS = (91440, 45720, 91440, 45720)
+EMU_PER_POINT = 12700
+
+# 同じ位置にあるとみなすプレースホルダーの種類（レイアウトとマスターでの対応）
+PLACEHOLDER_FAMILIES = {"ctrTitle": "title", "subTitle": "body", "obj": "body"}
+
+# スライドに残っていても表示されない（空でもよい）プレースホルダー
+HIDDEN_PLACEHOLDERS = frozenset(("dt", "ftr", "sldNum", "hdr"))
+
+
+def _tag(ns, name):
+    return f"{{{ns}}}{name}"
+
+
+def _parse(data):
+    from lxml import etree
+    return etree.fromstring(data)
+
+
+def _relationships(zf, names, source):
+    """パーツのリレーションシップを {rId: (種類, 参照先のパーツ名, 外部へのリンクかどうか)} で返す"""
+    name = rels_name(source)
+    if name not in names:
+        return {}
+    result = {}
+    for rel in _parse(zf.read(name)):
+        external = rel.get("TargetMode") == "External"
+        target = rel.get("Target") if external else resolve(source, rel.get("Target"))
+        result[rel.get("Id")] = (rel.get("Type"), target, external)
+    return result
+
+
+def _box(element):
+    """spPr の a:xfrm から (x, y, cx, cy) を返す（ない場合は None）"""
+    xfrm = element.find(f"{_tag(P_NS, 'spPr')}/{_tag(A_NS, 'xfrm')}")
+    if xfrm is None:
+        xfrm = element.find(_tag(P_NS, "xfrm"))
+    if xfrm is None:
+        return None
+    off = xfrm.find(_tag(A_NS, "off"))
+    ext = xfrm.find(_tag(A_NS, "ext"))
+    if off is None or ext is None:
+        return None
+    return (int(off.get("x", 0)), int(off.get("y", 0)), int(ext.get("cx", 0)), int(ext.get("cy", 0)))
+
+
+def _placeholder(element):
+    """シェイプのプレースホルダーの (種類, idx) を返す（プレースホルダーでない場合は None）"""
+    ph = element.find(f"*/{_tag(P_NS, 'nvPr')}/{_tag(P_NS, 'ph')}")
+    if ph is None:
+        return None
+    return ph.get("type", "obj"), ph.get("idx", "0")
+
+
+def _insets(element):
+    """テキストの枠の余白 (左, 上, 右, 下)（EMU）"""
+    body_pr = element.find(f"{_tag(P_NS, 'txBody')}/{_tag(A_NS, 'bodyPr')}")
+    if body_pr is None:
+        return None
+    return tuple(int(body_pr.get(name, default))
+                 for name, default in zip(("lIns", "tIns", "rIns", "bIns"), DEFAULT_INSETS))
+
+
+class _Layouts:
+    """スライドレイアウトとマスターのプレースホルダーの位置（レイアウトごとに 1 回だけ読む）"""
+
+    def __init__(self, zf, names):
+        self.zf = zf
+        self.names = names
+        self.cache = {}
+
+    def _placeholders(self, name):
+        if name not in self.cache:
+            boxes = {}
+            if name in self.names:
+                for shape in _parse(self.zf.read(name)).iter(_tag(P_NS, "sp")):
+                    key = _placeholder(shape)
+                    if key is not None:
+                        boxes[key] = (_box(shape), _insets(shape))
+            self.cache[name] = boxes
+        return self.cache[name]
+
+    def _master(self, layout):
+        for rel_type, target, _ in _relationships(self.zf, self.names, layout).values():
+            if rel_type == SLIDE_MASTER_REL_TYPE:
+                return target
+        return None
+
+    def resolve(self, layout, key):
+        """
+        スライドのプレースホルダーの位置と余白を、レイアウト、マスターの順にたどって求める
+
+        Returns:
+            tuple: ((x, y, cx, cy), 余白)。見つからない場合は (None, None)
+        """
+        ph_type, idx = key
+        family = PLACEHOLDER_FAMILIES.get(ph_type, ph_type)
+        box = insets = None
+        sources = [layout] if layout else []
+        master = self._master(layout) if layout else None
+        if master:
+            sources.append(master)
+        for source in sources:
+            for (other_type, other_idx), (other_box, other_insets) in self._placeholders(source).items():
+                same = (idx != "0" and other_idx == idx and source == layout) or \
+                    PLACEHOLDER_FAMILIES.get(other_type, other_type) == family
+                if same:
+                    box = box or other_box
+                    insets = insets or other_insets
+                    break
+            if box and insets:
+                break
+        return box, insets
+
+
+def _paragraphs(element):
+    """テキストの枠の段落ごとに (テキスト, 最大のフォントサイズ（ポイント）) を返す"""
+    result = []
+    for p in element.iter(_tag(A_NS, "p")):
+        text = ''.join(t.text or '' for t in p.iter(_tag(A_NS, "t")))
+        sizes = [int(r.get("sz")) / 100 for r in p.iter(_tag(A_NS, "rPr")) if r.get("sz")]
+        result.append((text, max(sizes) if sizes else None))
+    return result
+
+
+def estimate_height(paragraphs, width, default_size):
+    """
+    段落を枠の幅で折り返したときのテキストの高さを見積もる
+
+    Args:
+        paragraphs (list): (テキスト, フォントサイズ（ポイント、None の場合は default_size）) のリスト
+        width (float): 枠の幅（ポイント）
+        default_size (float): 既定のフォントサイズ（ポイント）
+
+    Returns:
+        float: テキストの高さ（ポイント）
+    """
+    height = 0.0
+    for text, size in paragraphs:
+        size = size or default_size
+        chars_per_line = max(1, int(width * 2 / size))
+        lines = max(1, -(-display_width(text) // chars_per_line))
+        height += lines * size * LINE_SPACING
+    return height
+
+
+def _is_opaque_cover(element, slide_size):
+    """スライド全面を覆う不透明なシェイプかどうか（画像、または透明度のない塗りつぶし）"""
+    box = _box(element)
+    if box is None or slide_size is None:
+        return False
+    x, y, cx, cy = box
+    if x > 0 or y > 0 or x + cx < slide_size[0] or y + cy < slide_size[1]:
+        return False
+    if element.tag == _tag(P_NS, "pic"):
+        return True
+    fill = element.find(f"{_tag(P_NS, 'spPr')}/{_tag(A_NS, 'solidFill')}")
+    return fill is not None and not any(True for _ in fill.iter(_tag(A_NS, "alpha")))
+
+
+def _grows_to_fit(element):
+    """テキストに合わせてシェイプの大きさが変わる（spAutoFit）かどうか"""
+    return element.find(f"{_tag(P_NS, 'txBody')}/{_tag(A_NS, 'bodyPr')}/{_tag(A_NS, 'spAutoFit')}") is not None
+
+
+def _has_text(element):
+    return any(t.text and t.text.strip() for t in element.iter(_tag(A_NS, "t")))
+
+
+def _referenced_ids(element):
+    """要素の中で使われている rId（r:id, r:embed, r:link など）"""
+    for node in element.iter():
+        for name, value in node.attrib.items():
+            if name.startswith(f"{{{R_NS}}}"):
+                yield value
+
+
+def validate_slide(zf, names, name, layouts, slide_size):
+    """
+    スライドの XML をシェイプごとに読み、問題のリストを返す
+
+    Args:
+        zf (zipfile.ZipFile): .pptx
+        names (set): zip に含まれるパーツ名
+        name (str): スライドのパーツ名
+        layouts (_Layouts): レイアウトのプレースホルダーの位置
+        slide_size (tuple): スライドの (幅, 高さ)（EMU）
+
+    Returns:
+        list: Issue のリスト
+    """
+    from lxml import etree
+
+    issues = []
+    rels = _relationships(zf, names, name)
+    layout = next((target for rel_type, target, _ in rels.values() if rel_type == SLIDE_LAYOUT_REL_TYPE), None)
+    for rel_type, target, external in rels.values():
+        if not external and target not in names:
+            issues.append(Issue(name, MISSING_PART, f"参照先のパーツがありません: {target}"))
+
+    text_shapes = 0
+    with zf.open(name) as f:
+        depth = 0
+        for event, element in etree.iterparse(f, events=("start", "end")):
+            if element.tag not in SHAPE_TAGS:
+                continue
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth:
+                # グループの中のシェイプは、グループごとまとめて調べる
+                continue
+
+            for rel_id in _referenced_ids(element):
+                if rel_id not in rels:
+                    issues.append(Issue(name, MISSING_RELATIONSHIP, f"リレーションシップ {rel_id} が定義されていません"))
+
+            label = element.find(f"*/{_tag(P_NS, 'cNvPr')}")
+            label = label.get("name") if label is not None else element.tag
+            key = _placeholder(element)
+            has_text = _has_text(element)
+
+            if _is_opaque_cover(element, slide_size) and text_shapes:
+                issues.append(Issue(name, HIDDEN_TEXT,
+                                    f"「{label}」がスライド全面を覆い、前にある {text_shapes} 個のテキストを隠しています"))
+            if has_text or element.tag == _tag(P_NS, "graphicFrame"):
+                text_shapes += 1
+
+            if key is not None and not has_text and key[0] not in HIDDEN_PLACEHOLDERS \
+                    and element.tag == _tag(P_NS, "sp"):
+                issues.append(Issue(name, EMPTY_PLACEHOLDER, f"プレースホルダー「{label}」が空です"))
+
+            if has_text and element.tag == _tag(P_NS, "sp") and not _grows_to_fit(element):
+                box, insets = _box(element), _insets(element)
+                if key is not None and (box is None or insets is None):
+                    inherited_box, inherited_insets = layouts.resolve(layout, key)
+                    box, insets = box or inherited_box, insets or inherited_insets
+                if box is not None:
+                    left, top, right, bottom = insets or DEFAULT_INSETS
+                    width = (box[2] - left - right) / EMU_PER_POINT
+                    height = (box[3] - top - bottom) / EMU_PER_POINT
+                    is_title = key is not None and PLACEHOLDER_FAMILIES.get(key[0], key[0]) == "title"
+                    needed = estimate_height(_paragraphs(element), width,
+                                             DEFAULT_TITLE_SIZE if is_title else DEFAULT_BODY_SIZE)
+                    if width > 0 and height > 0 and needed > height * OVERFLOW_TOLERANCE:
+                        issues.append(Issue(name, OVERFLOW,
+                                            f"「{label}」のテキストが枠からはみ出しています"
+                                            f"（推定 {needed / height:.0%}）"))
+
+            element.clear()
+    return issues
+
+
+def validate_parts(zf, max_media_bytes=DEFAULT_MAX_MEDIA_BYTES):
+    """
+    開いた .pptx の構造を検証する
+
+    Args:
+        zf (zipfile.ZipFile): .pptx
+        max_media_bytes (int): メディア 1 つあたりの最大バイト数
+
+    Returns:
+        list: Issue のリスト（スライドの表示順）
+    """
+    infos = zf.infolist()
+    names = {info.filename for info in infos}
+    issues = []
+
+    if CONTENT_TYPES not in names:
+        issues.append(Issue(CONTENT_TYPES, MISSING_PART, "コンテンツの種類の定義がありません"))
+    for info in infos:
+        if info.filename.startswith(MEDIA_DIR) and info.file_size > max_media_bytes:
+            issues.append(Issue(info.filename, LARGE_MEDIA,
+                                f"メディアが大きすぎます（{info.file_size / 1024 / 1024:.1f} MB）"))
+
+    presentation = next((target for rel_type, target, _ in _relationships(zf, names, "").values()
+                         if rel_type == OFFICE_DOCUMENT_REL_TYPE), None)
+    if presentation is None or presentation not in names:
+        issues.append(Issue("", MISSING_PART, "プレゼンテーションのパーツがありません"))
+        return issues
+
+    root = _parse(zf.read(presentation))
+    size = root.find(_tag(P_NS, "sldSz"))
+    slide_size = (int(size.get("cx")), int(size.get("cy"))) if size is not None else None
+    rels = _relationships(zf, names, presentation)
+    for rel_id in set(_referenced_ids(root)) - set(rels):
+        issues.append(Issue(presentation, MISSING_RELATIONSHIP, f"リレーションシップ {rel_id} が定義されていません"))
+    for rel_type, target, external in rels.values():
+        if not external and target not in names:
+            issues.append(Issue(presentation, MISSING_PART, f"参照先のパーツがありません: {target}"))
+
+    layouts = _Layouts(zf, names)
+    for slide_id in root.iter(_tag(P_NS, "sldId")):
+        rel = rels.get(slide_id.get(_tag(R_NS, "id")))
+        if rel is None or rel[1] not in names:
+            continue
+        issues += validate_slide(zf, names, rel[1], layouts, slide_size)
+    return issues
+
+
+def validate_presentation(path, max_media_bytes=DEFAULT_MAX_MEDIA_BYTES):
+    """
+    .pptx ファイルの構造を検証する
+
+    Args:
+        path: .pptx のファイル名またはファイルオブジェクト
+        max_media_bytes (int): メディア 1 つあたりの最大バイト数
+
+    Returns:
+        list: Issue のリスト（問題がなければ空）
+
+    Raises:
+        ValueError: zip として読めない場合
+    """
+    try:
+        with zipfile.ZipFile(path) as zf:
+            return validate_parts(zf, max_media_bytes)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"{path} は .pptx（zip）として読めません: {e}") from None
+
+
+def describe(path, issues):
+    """検証の結果を表示用の行のリストにする"""
+    if not issues:
+        return [f"{path}: 問題は見つかりませんでした"]
+    lines = [f"{path}: {len(issues)} 件の問題が見つかりました"]
+    lines += [f"  {posixpath.basename(issue.part) or '/'}: {issue.message}" for issue in issues]
+    return lines
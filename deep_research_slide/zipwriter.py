@@ -0,0 +1,202 @@
+"""
+パーツを並列に圧縮して .pptx（zip）に書き込む
+
+zipfile はパーツを 1 つずつ同じスレッドで deflate するため、大きなデッキの保存は
+1 コアしか使えません。zlib は圧縮中に GIL を解放するので、このモジュールでは
+パーツの圧縮をスレッドプールで並列に行い、圧縮済みのデータを元の順番どおりに
+書き込みます。ヘッダーと中央ディレクトリの書き込みは zipfile に任せるため、
+出力は zipfile で書いた場合と同じ形式です。
+
+ワーカー数は引数、または環境変数 SLIDE_SAVE_WORKERS で指定します（既定は CPU 数、
+1 の場合は並列化しません）。
+"""
+import os
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future
+
+from . import reproducible
+
+# 圧縮待ちにしておくパーツの数（ワーカー数に対する倍率）。
+# 多すぎると圧縮済みのデータがメモリにたまり、少なすぎるとワーカーが遊ぶ
+PENDING_PER_WORKER = 4
+
+
+def default_workers():
+    """環境変数 SLIDE_SAVE_WORKERS、または CPU 数から圧縮のワーカー数を決める"""
+    value = os.environ.get("SLIDE_SAVE_WORKERS")
+    if value:
+        return max(1, int(value))
+    return os.cpu_count() or 1
+
+
+def compress(data, level=zlib.Z_DEFAULT_COMPRESSION):
+    """
+    zip の deflate 形式（ヘッダーなし）で圧縮する
+
+    Returns:
+        tuple: (圧縮したデータ, CRC-32)
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(), zlib.crc32(data)
+
+
+class ParallelZipWriter:
+    """
+    パーツを並列に圧縮して zip に書き込むライター
+
+    writestr() で渡したパーツはスレッドプールで圧縮され、渡した順番どおりに書き込まれます。
+    圧縮待ちのパーツ数には上限があるため、スライドを作りながら書き込んでも
+    使用メモリは増え続けません。
+
+    使用例:
+        with ParallelZipWriter("out.pptx") as writer:
+            writer.writestr("ppt/slides/slide1.xml", data)
+    """
+
+    def __init__(self, output_file, workers=None, level=zlib.Z_DEFAULT_COMPRESSION, cache=None):
+        """
+        Args:
+            output_file (str): 出力するファイル名、または書き込み可能なファイルオブジェクト
+            workers (int): 圧縮に使うスレッド数（None の場合は default_workers()）
+            level (int): 圧縮レベル
+            cache (dict): writestr(reuse=True) で書き込むパーツの圧縮結果を保存する辞書。
+                同じ圧縮レベルのライターどうしで共有すると、同じ内容のパーツは 1 回だけ圧縮する
+        """
+        self.workers = workers or default_workers()
+        self.level = level
+        self.cache = {} if cache is None else cache
+        self.zf = zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED)
+        self.pending = deque()
+        self.executor = None
+        if self.workers > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="zip")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def writestr(self, name, data, reuse=False):
+        """
+        パーツを書き込む（圧縮はスレッドプールで行い、書き込みは渡した順番どおり）
+
+        Args:
+            name (str): zip 内のパーツ名
+            data (bytes): パーツの内容
+            reuse (bool): 圧縮結果を cache に保存して使い回す（テンプレートのパーツなど、
+                出力のたびに同じ内容になるパーツに使う）
+        """
+        # タイムスタンプは再現可能モードでは固定の日時になる
+        zinfo = zipfile.ZipInfo(name, date_time=reproducible.zip_date_time())
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        zinfo.external_attr = 0o600 << 16
+        zinfo.file_size = len(data)
+
+        compressed = self.cache.get(data) if reuse else None
+        if compressed is None and self.executor is None:
+            compressed = compress(data, self.level)
+            if reuse:
+                self.cache[data] = compressed
+        if compressed is not None and not self.pending:
+            self._write_compressed(zinfo, compressed)
+            return
+
+        if compressed is not None:
+            # 圧縮済みでも、圧縮待ちのパーツより先には書き込まない
+            future = Future()
+            future.set_result(compressed)
+        else:
+            future = self.executor.submit(compress, data, self.level)
+        self.pending.append((zinfo, future, data if reuse else None))
+        if len(self.pending) > self.workers * PENDING_PER_WORKER:
+            self._flush_one()
+
+    def _flush_one(self):
+        """最も古い圧縮待ちのパーツを、圧縮が終わるのを待って書き込む"""
+        zinfo, future, reuse_key = self.pending.popleft()
+        compressed = future.result()
+        if reuse_key is not None:
+            self.cache[reuse_key] = compressed
+        self._write_compressed(zinfo, compressed)
+
+    def _write_compressed(self, zinfo, compressed):
+        """
+        圧縮済みのデータをローカルヘッダーとともに書き込む
+
+        zipfile には圧縮済みのデータを書き込む API がないため、ZipFile.writestr と
+        同じ手順でヘッダーを書き、中央ディレクトリに載るよう filelist に登録する
+        """
+        data, crc = compressed
+        zf = self.zf
+        zinfo.CRC = crc
+        zinfo.compress_size = len(data)
+        zinfo.header_offset = zf.fp.tell()
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zf.fp.write(zinfo.FileHeader())
+        zf.fp.write(data)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf.start_dir = zf.fp.tell()
+
+    def close(self):
+        """残りのパーツを書き込み、中央ディレクトリを書いて閉じる"""
+        try:
+            while self.pending:
+                self._flush_one()
+            self.zf.close()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+
+    def abort(self):
+        """例外が起きた場合に、圧縮待ちのパーツを捨てて閉じる"""
+        for _, future, _ in self.pending:
+            future.cancel()
+        self.pending.clear()
+        if self.executor is not None:
+            self.executor.shutdown()
+        self.zf.close()
+
+
+def save_package(prs, output_file, workers=None):
+    """
+    python-pptx のプレゼンテーションを、パーツを並列に圧縮して保存する（prs.save の代わり）
+
+    パーツの並びとコンテンツタイプは python-pptx の PackageWriter をそのまま使い、
+    書き込み先だけを ParallelZipWriter に差し替えます。
+
+    Args:
+        prs: プレゼンテーションオブジェクト
+        output_file (str): 出力するファイル名、または書き込み可能なファイルオブジェクト
+        workers (int): 圧縮に使うスレッド数（None の場合は default_workers()）
+    """
+    from pptx.opc.serialized import PackageWriter
+
+    class _ParallelPackageWriter(PackageWriter):
+        def _write(self):
+            with ParallelZipWriter(self._pkg_file, workers) as writer:
+                phys_writer = _PhysWriter(writer)
+                self._write_content_types_stream(phys_writer)
+                self._write_pkg_rels(phys_writer)
+                self._write_parts(phys_writer)
+
+    package = prs.part.package
+    _ParallelPackageWriter.write(output_file, package._rels, tuple(package.iter_parts()))
+
+
+class _PhysWriter:
+    """python-pptx の PackageWriter から呼ばれる書き込み先（PackURI をパーツ名に変換する）"""
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def write(self, pack_uri, blob):
+        self.writer.writestr(pack_uri.membername, blob)